@@ -0,0 +1,162 @@
+-- 0006_ai_eval_training_aggregate_template.sql
+-- Purpose:
+--   Aggregate pushdown for eval gate checks: compute the per-metric counts and latency
+--   histogram of ai_training_examples in Postgres, so the offline report can be built
+--   without exporting every row.
+-- Notes:
+--   - Flags and latency follow row_to_eval_record_payload in src/evals/supabase_export.py:
+--     JSON booleans or 'true'/'1'/'yes' / 'false'/'0'/'no' strings, otherwise the
+--     contract default; fallback_used and latency_ms prefer the table columns over
+--     metadata, and lineage ids prefer the 0004 columns over metadata.
+--   - Latency is returned as a (value, count) histogram rather than percentiles, so the
+--     client folds it into the same quantile sketch the local report uses and p50..p99
+--     match exactly.
+--   - p_group_by takes any of requested_provider, selected_provider, route_strategy,
+--     tenant_id, route_id, model_id, model_version_id; fields not requested are NULL.
+--   - Called over PostgREST as POST /rest/v1/rpc/ai_eval_training_aggregate_v1 by
+--     scripts/evals/run_offline_eval.py --pushdown.
+--   - Requires templates 0003 and 0004.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.ai_eval_flag_v1(value JSONB, default_value BOOLEAN)
+RETURNS BOOLEAN
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE
+    WHEN jsonb_typeof(value) = 'boolean' THEN value::boolean
+    WHEN jsonb_typeof(value) = 'string'
+      AND lower(btrim(value #>> '{}', E' \t\n\r\f\v')) IN ('true', '1', 'yes') THEN true
+    WHEN jsonb_typeof(value) = 'string'
+      AND lower(btrim(value #>> '{}', E' \t\n\r\f\v')) IN ('false', '0', 'no') THEN false
+    ELSE default_value
+  END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.ai_eval_latency_ms_v1(value JSONB)
+RETURNS BIGINT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE
+    WHEN jsonb_typeof(value) = 'number' THEN trunc((value #>> '{}')::numeric)::bigint
+    WHEN jsonb_typeof(value) = 'boolean' THEN CASE WHEN value::boolean THEN 1 ELSE 0 END
+    WHEN jsonb_typeof(value) = 'string'
+      AND btrim(value #>> '{}', E' \t\n\r\f\v')
+        ~ '^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?$'
+      THEN trunc(btrim(value #>> '{}', E' \t\n\r\f\v')::numeric)::bigint
+  END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.ai_eval_training_aggregate_v1(
+  p_since TIMESTAMPTZ,
+  p_until TIMESTAMPTZ DEFAULT NULL,
+  p_sources TEXT[] DEFAULT ARRAY['generation', 'generation_cached'],
+  p_group_by TEXT[] DEFAULT ARRAY[]::TEXT[]
+)
+RETURNS TABLE (
+  requested_provider TEXT,
+  selected_provider TEXT,
+  route_strategy TEXT,
+  tenant_id TEXT,
+  route_id TEXT,
+  model_id TEXT,
+  model_version_id TEXT,
+  record_count BIGINT,
+  schema_valid_count BIGINT,
+  patch_apply_success_count BIGINT,
+  edited_after_generate_count BIGINT,
+  published_within_7d_count BIGINT,
+  safety_html_tailwind_compliant_count BIGINT,
+  fallback_used_count BIGINT,
+  latency_values BIGINT[],
+  latency_counts BIGINT[]
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH records AS (
+    SELECT
+      CASE WHEN 'requested_provider' = ANY(p_group_by) THEN t.requested_provider END
+        AS requested_provider,
+      CASE WHEN 'selected_provider' = ANY(p_group_by) THEN t.selected_provider END
+        AS selected_provider,
+      CASE WHEN 'route_strategy' = ANY(p_group_by) THEN t.route_strategy END
+        AS route_strategy,
+      CASE WHEN 'tenant_id' = ANY(p_group_by)
+        THEN COALESCE(t.tenant_id::text, t.metadata->>'tenantId') END AS tenant_id,
+      CASE WHEN 'route_id' = ANY(p_group_by)
+        THEN COALESCE(t.route_id::text, t.metadata->>'routeId') END AS route_id,
+      CASE WHEN 'model_id' = ANY(p_group_by)
+        THEN COALESCE(t.model_id::text, t.metadata->>'modelId') END AS model_id,
+      CASE WHEN 'model_version_id' = ANY(p_group_by)
+        THEN COALESCE(t.model_version_id::text, t.metadata->>'modelVersionId') END
+        AS model_version_id,
+      public.ai_eval_flag_v1(t.metadata->'schemaValid', true) AS schema_valid,
+      public.ai_eval_flag_v1(t.metadata->'patchApplySuccess', true) AS patch_apply_success,
+      public.ai_eval_flag_v1(t.metadata->'editedAfterGenerate', false)
+        AS edited_after_generate,
+      public.ai_eval_flag_v1(t.metadata->'publishedWithin7d', false) AS published_within_7d,
+      public.ai_eval_flag_v1(t.metadata->'safetyHtmlTailwindCompliant', true)
+        AS safety_html_tailwind_compliant,
+      COALESCE(t.fallback_used, public.ai_eval_flag_v1(t.metadata->'fallbackUsed', false))
+        AS fallback_used,
+      COALESCE(t.latency_ms::bigint, public.ai_eval_latency_ms_v1(t.metadata->'latencyMs'))
+        AS latency_ms
+    FROM public.ai_training_examples t
+    WHERE t.created_at >= p_since
+      AND (p_until IS NULL OR t.created_at < p_until)
+      AND t.source = ANY(p_sources)
+  ),
+  -- One row per (group, latency): counts stay exact and the latency histogram falls out of
+  -- the second aggregation.
+  buckets AS (
+    SELECT
+      requested_provider,
+      selected_provider,
+      route_strategy,
+      tenant_id,
+      route_id,
+      model_id,
+      model_version_id,
+      latency_ms,
+      count(*) AS record_count,
+      count(*) FILTER (WHERE schema_valid) AS schema_valid_count,
+      count(*) FILTER (WHERE patch_apply_success) AS patch_apply_success_count,
+      count(*) FILTER (WHERE edited_after_generate) AS edited_after_generate_count,
+      count(*) FILTER (WHERE published_within_7d) AS published_within_7d_count,
+      count(*) FILTER (WHERE safety_html_tailwind_compliant)
+        AS safety_html_tailwind_compliant_count,
+      count(*) FILTER (WHERE fallback_used) AS fallback_used_count
+    FROM records
+    GROUP BY 1, 2, 3, 4, 5, 6, 7, 8
+  )
+  SELECT
+    requested_provider,
+    selected_provider,
+    route_strategy,
+    tenant_id,
+    route_id,
+    model_id,
+    model_version_id,
+    sum(record_count)::bigint,
+    sum(schema_valid_count)::bigint,
+    sum(patch_apply_success_count)::bigint,
+    sum(edited_after_generate_count)::bigint,
+    sum(published_within_7d_count)::bigint,
+    sum(safety_html_tailwind_compliant_count)::bigint,
+    sum(fallback_used_count)::bigint,
+    COALESCE(
+      array_agg(latency_ms ORDER BY latency_ms) FILTER (WHERE latency_ms >= 0),
+      ARRAY[]::BIGINT[]
+    ),
+    COALESCE(
+      array_agg(record_count ORDER BY latency_ms) FILTER (WHERE latency_ms >= 0),
+      ARRAY[]::BIGINT[]
+    )
+  FROM buckets
+  GROUP BY 1, 2, 3, 4, 5, 6, 7;
+$$;
+
+COMMIT;
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.contracts import EvalRecord  # noqa: E402
+from evals.ingest_sql import _SAMPLE_ENCODERS, _normalize_uuid  # noqa: E402
+from evals.synthetic import iter_synthetic_eval_payloads  # noqa: E402
+
+_RUN_ID = '00000000-0000-4000-8000-000000000000'
+
+# The original per-sample renderers, kept verbatim as the benchmark baseline.
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _sql_text(value: str | None) -> str:
+    if value is None:
+        return 'NULL'
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _sql_bool(value: bool) -> str:
+    return 'true' if value else 'false'
+
+
+def _sql_int(value: int | None) -> str:
+    return 'NULL' if value is None else str(value)
+
+
+def _json_text(value: dict[str, Any]) -> str:
+    return json.dumps(value, separators=(',', ':'), sort_keys=True)
+
+
+def _sql_jsonb(value: dict[str, Any]) -> str:
+    return f'{_sql_text(_json_text(value))}::jsonb'
+
+
+def _copy_text(value: str | None) -> str:
+    if value is None:
+        return '\\N'
+    return value.translate(_COPY_ESCAPES)
+
+
+def _copy_bool(value: bool) -> str:
+    return 't' if value else 'f'
+
+
+def _copy_int(value: int | None) -> str:
+    return '\\N' if value is None else str(value)
+
+
+def _uuid_or_none(value: str | None) -> str | None:
+    if value is None:
+        return None
+    try:
+        return str(UUID(value))
+    except (ValueError, TypeError):
+        return None
+
+
+def _base_sample_metadata(record: EvalRecord, valid_request_id: str | None) -> dict[str, Any]:
+    sample_metadata: dict[str, Any] = {'recordId': record.record_id}
+    if record.request_id and valid_request_id is None:
+        sample_metadata['invalidRequestId'] = record.request_id
+    return sample_metadata
+
+
+def _sitecraft_sample_metadata(record: EvalRecord, valid_request_id: str | None) -> dict[str, Any]:
+    return {
+        **_base_sample_metadata(record, valid_request_id),
+        'requestId': valid_request_id,
+        'requestedProvider': record.requested_provider,
+        'selectedProvider': record.selected_provider,
+        'routeStrategy': record.route_strategy,
+        'fallbackUsed': record.fallback_used,
+    }
+
+
+def _render_sitecraft_sample(record: EvalRecord, index: int, run_id_sql: str) -> str:
+    valid_request_id = _uuid_or_none(record.request_id)
+    sample_metadata = _sitecraft_sample_metadata(record, valid_request_id)
+    return (
+        '('
+        f'{run_id_sql}, '
+        f'{_sql_text(f"{record.record_id}-{index}")}, '
+        'NULL, '
+        f'{_sql_text(record.selected_provider)}, '
+        'NULL, '
+        f'{_sql_bool(record.schema_valid)}, '
+        f'{_sql_bool(record.patch_apply_success)}, '
+        f'{_sql_bool(record.safety_html_tailwind_compliant)}, '
+        f'{_sql_bool(record.edited_after_generate)}, '
+        f'{_sql_bool(record.published_within_7d)}, '
+        f'{_sql_int(record.latency_ms)}, '
+        f'{_sql_jsonb(sample_metadata)}'
+        ')'
+    )
+
+
+def _render_v2_sample(record: EvalRecord, index: int, run_id_sql: str) -> str:
+    valid_request_id = _uuid_or_none(record.request_id)
+    return (
+        '('
+        f'{run_id_sql}, '
+        f'{_sql_text(valid_request_id)}::uuid, '
+        f'{_sql_text(record.requested_provider)}, '
+        f'{_sql_text(record.selected_provider)}, '
+        f'{_sql_text(record.route_strategy)}, '
+        f'{_sql_bool(record.fallback_used)}, '
+        f'{_sql_int(record.latency_ms)}, '
+        f'{_sql_bool(record.schema_valid)}, '
+        f'{_sql_bool(record.patch_apply_success)}, '
+        f'{_sql_bool(record.edited_after_generate)}, '
+        f'{_sql_bool(record.published_within_7d)}, '
+        f'{_sql_bool(record.safety_html_tailwind_compliant)}, '
+        f'{_sql_jsonb(_base_sample_metadata(record, valid_request_id))}'
+        ')'
+    )
+
+
+def _copy_sitecraft_sample(record: EvalRecord, index: int, run_id: str) -> str:
+    valid_request_id = _uuid_or_none(record.request_id)
+    return '\t'.join(
+        (
+            run_id,
+            _copy_text(f'{record.record_id}-{index}'),
+            '\\N',
+            _copy_text(record.selected_provider),
+            '\\N',
+            _copy_bool(record.schema_valid),
+            _copy_bool(record.patch_apply_success),
+            _copy_bool(record.safety_html_tailwind_compliant),
+            _copy_bool(record.edited_after_generate),
+            _copy_bool(record.published_within_7d),
+            _copy_int(record.latency_ms),
+            _copy_text(_json_text(_sitecraft_sample_metadata(record, valid_request_id))),
+        )
+    )
+
+
+def _copy_v2_sample(record: EvalRecord, index: int, run_id: str) -> str:
+    valid_request_id = _uuid_or_none(record.request_id)
+    return '\t'.join(
+        (
+            run_id,
+            _copy_text(valid_request_id),
+            _copy_text(record.requested_provider),
+            _copy_text(record.selected_provider),
+            _copy_text(record.route_strategy),
+            _copy_bool(record.fallback_used),
+            _copy_int(record.latency_ms),
+            _copy_bool(record.schema_valid),
+            _copy_bool(record.patch_apply_success),
+            _copy_bool(record.edited_after_generate),
+            _copy_bool(record.published_within_7d),
+            _copy_bool(record.safety_html_tailwind_compliant),
+            _copy_text(_json_text(_base_sample_metadata(record, valid_request_id))),
+        )
+    )
+
+
+_REFERENCE_RENDERERS: dict[tuple[str, str], Callable[[EvalRecord, int, str], str]] = {
+    ('sitecraft', 'insert'): _render_sitecraft_sample,
+    ('v2', 'insert'): _render_v2_sample,
+    ('sitecraft', 'copy'): _copy_sitecraft_sample,
+    ('v2', 'copy'): _copy_v2_sample,
+}
+
+
+def _render_all(
+    encode: Callable[[EvalRecord, int, str], str], records: list[EvalRecord], run_id: str
+) -> list[str]:
+    return [encode(record, index, run_id) for index, record in enumerate(records, start=1)]
+
+
+def _best_seconds(
+    encode: Callable[[EvalRecord, int, str], str],
+    records: list[EvalRecord],
+    run_id: str,
+    repeat: int,
+) -> float:
+    def run() -> None:
+        # Start every run cold so the UUID cache only helps with ids repeated in the data.
+        _normalize_uuid.cache_clear()
+        _render_all(encode, records, run_id)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Micro-benchmark the per-variant ai_eval_samples encoders against the original '
+        'per-sample renderers.'
+    )
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    records = EvalRecord.from_dicts(list(iter_synthetic_eval_payloads(args.rows)))
+
+    print(f'rows={args.rows}')
+    print(f'{"variant":<10} {"format":<7} {"reference rows/s":>17} {"encoder rows/s":>16} speedup')
+    for (schema_variant, output_format), reference in _REFERENCE_RENDERERS.items():
+        run_id = _RUN_ID if output_format == 'copy' else f'{_sql_text(_RUN_ID)}::uuid'
+        encoder = _SAMPLE_ENCODERS[schema_variant, output_format]
+        if _render_all(reference, records, run_id) != _render_all(encoder, records, run_id):
+            print(
+                f'{schema_variant}/{output_format}: encoder output differs from the reference.',
+                file=sys.stderr,
+            )
+            return 1
+        reference_seconds = _best_seconds(reference, records, run_id, args.repeat)
+        encoder_seconds = _best_seconds(encoder, records, run_id, args.repeat)
+        print(
+            f'{schema_variant:<10} {output_format:<7} '
+            f'{args.rows / reference_seconds:>17,.0f} {args.rows / encoder_seconds:>16,.0f} '
+            f'{reference_seconds / encoder_seconds:>6.2f}x'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
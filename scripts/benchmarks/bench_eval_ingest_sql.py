@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.contracts import EvalRecord, EvalThresholds  # noqa: E402
+from evals.ingest_sql import EvalIngestContext, build_eval_ingest_sql  # noqa: E402
+from evals.runner import build_eval_report  # noqa: E402
+from evals.synthetic import iter_synthetic_eval_payloads  # noqa: E402
+
+_RUN_ID = '00000000-0000-4000-8000-000000000000'
+# SQLite stands in for the server-side cost of parsing and executing the script: it has
+# no uuid/jsonb types, so casts are dropped and every column is untyped.
+_CAST = re.compile(r'::(?:uuid|jsonb)\b')
+_SQLITE_SCHEMA = {
+    'sitecraft': (
+        'CREATE TABLE ai_eval_runs (id, run_type, status, dataset_ref, provider, model, '
+        'prompt_set_version, metrics, metadata, started_at, completed_at);'
+        'CREATE TABLE ai_eval_samples (run_id, sample_key, prompt_hash, provider, model, '
+        'schema_valid, patch_apply_success, safety_html_tailwind_compliant, '
+        'edited_after_generate, published_within_7d, latency_ms, metadata);'
+    ),
+    'v2': (
+        'CREATE TABLE ai_eval_runs (run_id, run_type, triggered_by, commit_sha, dataset_ref, '
+        'thresholds, status, started_at, finished_at, metadata);'
+        'CREATE TABLE ai_eval_samples (run_id, request_id, requested_provider, '
+        'selected_provider, route_strategy, fallback_used, latency_ms, schema_valid, '
+        'patch_apply_success, edited_after_generate, published_within_7d, '
+        'safety_html_tailwind_compliant, metadata);'
+    ),
+}
+
+
+def _execute_in_sqlite(sql_text: str, schema_variant: str) -> float:
+    connection = sqlite3.connect(':memory:', isolation_level=None)
+    try:
+        connection.create_function('timezone', 2, lambda zone, value: value)
+        connection.create_function('now', 0, lambda: '1970-01-01T00:00:00Z')
+        connection.executescript(_SQLITE_SCHEMA[schema_variant])
+        script = _CAST.sub('', sql_text.replace('public.', ''))
+        started = time.perf_counter()
+        connection.executescript(script)
+        return time.perf_counter() - started
+    finally:
+        connection.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Compare ai_eval_samples INSERT batch sizes for build_eval_ingest_sql.'
+    )
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument(
+        '--rows-per-statement',
+        type=int,
+        action='append',
+        default=None,
+        help='Batch size to measure; repeatable (default: 1, 10, 100, 500, 1000, 5000).',
+    )
+    parser.add_argument('--schema-variant', choices=['sitecraft', 'v2'], default='sitecraft')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    records = EvalRecord.from_dicts(list(iter_synthetic_eval_payloads(args.rows)))
+    thresholds = EvalThresholds()
+    report = build_eval_report(records, thresholds=thresholds)
+    context = EvalIngestContext(schema_variant=args.schema_variant)
+
+    print(f'rows={args.rows} schema_variant={args.schema_variant}')
+    print(f'{"batch":>6} {"statements":>10} {"MiB":>8} {"render_s":>9} {"sqlite_exec_s":>13}')
+    for rows_per_statement in args.rows_per_statement or [1, 10, 100, 500, 1000, 5000]:
+        started = time.perf_counter()
+        sql_text, _, _ = build_eval_ingest_sql(
+            records,
+            thresholds,
+            context,
+            report=report,
+            run_id=_RUN_ID,
+            rows_per_statement=rows_per_statement,
+        )
+        render_seconds = time.perf_counter() - started
+        statements = sql_text.count('INSERT INTO public.ai_eval_samples')
+        execute_seconds = _execute_in_sqlite(sql_text, args.schema_variant)
+        print(
+            f'{rows_per_statement:>6} {statements:>10} {len(sql_text) / 2**20:>8.1f} '
+            f'{render_seconds:>9.2f} {execute_seconds:>13.2f}'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.contracts import EvalRecord  # noqa: E402
+
+
+def _reference_from_dict(payload: dict[str, Any]) -> EvalRecord:
+    """The original EvalRecord.from_dict, kept verbatim as the benchmark baseline."""
+    return EvalRecord(
+        record_id=str(payload.get('record_id') or payload.get('id') or 'unknown'),
+        schema_valid=bool(payload.get('schema_valid')),
+        patch_apply_success=bool(payload.get('patch_apply_success')),
+        edited_after_generate=bool(payload.get('edited_after_generate')),
+        published_within_7d=bool(payload.get('published_within_7d')),
+        safety_html_tailwind_compliant=bool(payload.get('safety_html_tailwind_compliant')),
+        fallback_used=bool(payload.get('fallback_used', False)),
+        latency_ms=(int(payload['latency_ms']) if payload.get('latency_ms') is not None else None),
+        requested_provider=(
+            str(payload.get('requested_provider'))
+            if payload.get('requested_provider') is not None
+            else None
+        ),
+        selected_provider=(
+            str(payload.get('selected_provider'))
+            if payload.get('selected_provider') is not None
+            else None
+        ),
+        route_strategy=(
+            str(payload.get('route_strategy'))
+            if payload.get('route_strategy') is not None
+            else None
+        ),
+        request_id=(
+            str(payload.get('request_id')) if payload.get('request_id') is not None else None
+        ),
+        tenant_id=(str(payload.get('tenant_id')) if payload.get('tenant_id') is not None else None),
+        route_id=(str(payload.get('route_id')) if payload.get('route_id') is not None else None),
+        model_id=(str(payload.get('model_id')) if payload.get('model_id') is not None else None),
+        model_version_id=(
+            str(payload.get('model_version_id'))
+            if payload.get('model_version_id') is not None
+            else None
+        ),
+    )
+
+
+def _payloads(count: int) -> list[dict[str, Any]]:
+    payloads: list[dict[str, Any]] = []
+    for index in range(count):
+        payloads.append(
+            {
+                'record_id': f'rec-{index}',
+                'request_id': f'00000000-0000-4000-8000-{index:012d}',
+                'schema_valid': True,
+                'patch_apply_success': index % 10 != 0,
+                'edited_after_generate': index % 3 == 0,
+                'published_within_7d': index % 5 == 0,
+                'safety_html_tailwind_compliant': True,
+                'fallback_used': index % 8 == 0,
+                'latency_ms': 800 + index % 5000 if index % 20 else None,
+                'requested_provider': 'openai',
+                'selected_provider': 'custom' if index % 8 == 0 else 'openai',
+                'route_strategy': 'fallback' if index % 8 == 0 else 'single_provider',
+                'tenant_id': None,
+                'route_id': None,
+                'model_id': None,
+                'model_version_id': None,
+            }
+        )
+    return payloads
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Micro-benchmark EvalRecord.from_dict against the original implementation.'
+    )
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    payloads = _payloads(args.rows)
+    if [_reference_from_dict(payload) for payload in payloads] != EvalRecord.from_dicts(payloads):
+        print('Decoded records differ from the reference implementation.', file=sys.stderr)
+        return 1
+
+    reference_seconds = min(
+        timeit.repeat(
+            lambda: [_reference_from_dict(payload) for payload in payloads],
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    fast_seconds = min(
+        timeit.repeat(lambda: EvalRecord.from_dicts(payloads), number=1, repeat=args.repeat)
+    )
+
+    print(f'rows={args.rows}')
+    print(f'reference_from_dict: {args.rows / reference_seconds:,.0f} rows/s')
+    print(f'from_dicts:          {args.rows / fast_seconds:,.0f} rows/s')
+    print(f'speedup={reference_seconds / fast_seconds:.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import sys
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.supabase_export import iter_training_example_pages  # noqa: E402
+
+_WINDOW_END = datetime(2026, 2, 15, tzinfo=UTC)
+
+
+class _LatencyServer(ThreadingHTTPServer):
+    """Minimal ai_training_examples stand-in: keyset filters plus a fixed per-request delay."""
+
+    daemon_threads = True
+
+    def __init__(self, rows: int, days: int, latency_seconds: float) -> None:
+        super().__init__(('127.0.0.1', 0), _LatencyHandler)
+        self.latency_seconds = latency_seconds
+        step = timedelta(days=days) / rows
+        # Ascending (created_at, id) keys; the row at key position i is served as JSON.
+        self.keys = [(_WINDOW_END - step * (rows - index), f'{index:09d}') for index in range(rows)]
+        self.bodies = [
+            json.dumps(
+                {
+                    'id': row_id,
+                    'request_id': None,
+                    'latency_ms': 1000 + index % 5000,
+                    'metadata': {'schemaValid': True},
+                    'created_at': created_at.isoformat(),
+                    'source': 'generation',
+                },
+                separators=(',', ':'),
+            )
+            for index, (created_at, row_id) in enumerate(self.keys)
+        ]
+
+
+class _LatencyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: _LatencyServer
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlsplit(self.path).query)
+        time.sleep(self.server.latency_seconds)
+        keys = self.server.keys
+        low, high = 0, len(keys)
+        for condition in query['created_at']:
+            operator, value = condition.split('.', 1)
+            bound = datetime.fromisoformat(value)
+            if operator == 'gte':
+                low = max(low, bisect.bisect_left(keys, (bound, '')))
+            else:
+                high = min(high, bisect.bisect_left(keys, (bound, '')))
+        if 'or' in query:
+            # (created_at.lt."X",and(created_at.eq."X",id.lt."Y")) -> keys < (X, Y)
+            created_at, row_id = query['or'][0].split('"')[1], query['or'][0].split('"')[5]
+            high = min(high, bisect.bisect_left(keys, (datetime.fromisoformat(created_at), row_id)))
+        limit = int(query['limit'][0])
+        page = self.server.bodies[max(low, high - limit) : high][::-1] if high > low else []
+        body = ('[' + ','.join(page) + ']').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Compare serial and time-sharded Supabase exports against a local stand-in '
+        'with injected per-request latency.'
+    )
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=150.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--shards', type=int, default=32)
+    return parser.parse_args()
+
+
+def _export(base_url: str, args: argparse.Namespace, shards: int, workers: int) -> list[str]:
+    since = (_WINDOW_END - timedelta(days=args.days)).isoformat()
+    return [
+        row['id']
+        for page in iter_training_example_pages(
+            base_url,
+            'benchmark-key',
+            since,
+            page_size=args.page_size,
+            until_iso=_WINDOW_END.isoformat(),
+            shards=shards,
+            workers=workers,
+        )
+        for row in page
+    ]
+
+
+def main() -> int:
+    args = parse_args()
+    server = _LatencyServer(args.rows, args.days, args.latency_ms / 1000)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        print(f'rows={args.rows} days={args.days} latency_ms={args.latency_ms}')
+        results = {}
+        for label, shards, workers in (
+            ('serial', 1, 1),
+            ('sharded', args.shards, args.workers),
+        ):
+            started = time.perf_counter()
+            results[label] = _export(base_url, args, shards, workers)
+            seconds = time.perf_counter() - started
+            print(
+                f'{label:<8} shards={shards:<3} workers={workers:<3} {seconds:8.2f}s '
+                f'{len(results[label]) / seconds:>12,.0f} rows/s'
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+    if results['serial'] != results['sharded'] or len(results['serial']) != args.rows:
+        print('Sharded export differs from the serial export.', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.synthetic import (  # noqa: E402
+    SyntheticEvalConfig,
+    write_synthetic_eval_jsonl,
+    write_synthetic_training_rows,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Generate seeded synthetic Supabase rows or eval JSONL for benchmarks.'
+    )
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument(
+        '--format',
+        choices=['eval-jsonl', 'supabase-rows'],
+        default='eval-jsonl',
+        help='eval-jsonl: exporter output; supabase-rows: ai_training_examples JSON array.',
+    )
+    parser.add_argument('--output', type=Path, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tenants', type=int, default=1_000)
+    parser.add_argument('--zipf-exponent', type=float, default=1.1)
+    parser.add_argument('--latency-median-ms', type=float, default=2_500.0)
+    parser.add_argument('--latency-sigma', type=float, default=0.6)
+    parser.add_argument('--fallback-share', type=float, default=0.08)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = SyntheticEvalConfig(
+        seed=args.seed,
+        tenant_count=args.tenants,
+        zipf_exponent=args.zipf_exponent,
+        latency_median_ms=args.latency_median_ms,
+        latency_sigma=args.latency_sigma,
+        fallback_share=args.fallback_share,
+    )
+    if args.format == 'eval-jsonl':
+        write_synthetic_eval_jsonl(args.output, args.rows, config)
+    else:
+        write_synthetic_training_rows(args.output, args.rows, config)
+    print(f'Wrote {args.rows} synthetic rows ({args.format}): {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
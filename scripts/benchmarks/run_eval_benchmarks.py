@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.benchmark import (  # noqa: E402
+    BENCHMARK_STAGES,
+    DEFAULT_REGRESSION_TOLERANCE,
+    build_benchmark_baseline,
+    compare_to_baseline,
+    load_benchmark_baseline,
+    run_eval_benchmarks,
+)
+from evals.synthetic import SyntheticEvalConfig  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            'Benchmark eval pipeline stages on seeded synthetic data and gate on regressions '
+            'against a stored baseline.'
+        )
+    )
+    parser.add_argument(
+        '--rows',
+        type=int,
+        action='append',
+        default=None,
+        help='Row count tier to benchmark; repeatable (default: 10000). Suggested: 10000, '
+        '1000000, 10000000.',
+    )
+    parser.add_argument(
+        '--stage',
+        action='append',
+        choices=BENCHMARK_STAGES,
+        default=None,
+        help='Stage to benchmark; repeatable (default: all stages).',
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per stage (best-of).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tenants', type=int, default=1_000)
+    parser.add_argument('--zipf-exponent', type=float, default=1.1)
+    parser.add_argument('--fallback-share', type=float, default=0.08)
+    parser.add_argument(
+        '--workdir',
+        type=Path,
+        default=REPO_ROOT / 'artifacts/benchmarks',
+        help='Directory for generated datasets (reused across runs).',
+    )
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        default=REPO_ROOT / 'scripts/benchmarks/eval_pipeline_baseline.json',
+        help='Baseline JSON to compare against.',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=None,
+        help='Allowed fractional regression (default: the baseline file value, else '
+        f'{DEFAULT_REGRESSION_TOLERANCE}).',
+    )
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help='Record these results as the new baseline instead of comparing.',
+    )
+    parser.add_argument('--output', type=Path, default=None, help='Write results JSON here.')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = SyntheticEvalConfig(
+        seed=args.seed,
+        tenant_count=args.tenants,
+        zipf_exponent=args.zipf_exponent,
+        fallback_share=args.fallback_share,
+    )
+    results = []
+    for rows in args.rows or [10_000]:
+        for result in run_eval_benchmarks(
+            rows,
+            args.workdir,
+            config=config,
+            repeat=args.repeat,
+            stages=args.stage or BENCHMARK_STAGES,
+        ):
+            results.append(result)
+            print(
+                f'{result.stage:<28} rows={result.rows:<10} '
+                f'{result.rows_per_second:>14,.0f} rows/s '
+                f'peak={result.peak_memory_bytes / (1024 * 1024):>10,.1f} MiB'
+            )
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open('w', encoding='utf-8') as handle:
+            json.dump([result.as_dict() for result in results], handle, indent=2)
+            handle.write('\n')
+
+    if args.update_baseline:
+        previous = load_benchmark_baseline(args.baseline) if args.baseline.exists() else None
+        tolerance = args.tolerance
+        if tolerance is None:
+            tolerance = float((previous or {}).get('tolerance', DEFAULT_REGRESSION_TOLERANCE))
+        baseline = build_benchmark_baseline(results, tolerance=tolerance, previous=previous)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.baseline.open('w', encoding='utf-8') as handle:
+            json.dump(baseline, handle, indent=2)
+            handle.write('\n')
+        print(f'Updated benchmark baseline: {args.baseline}')
+        return 0
+
+    if not args.baseline.exists():
+        print(f'No baseline at {args.baseline}; skipping regression gate.')
+        return 0
+    regressions = compare_to_baseline(
+        results, load_benchmark_baseline(args.baseline), tolerance=args.tolerance
+    )
+    for message in regressions:
+        print(f'REGRESSION {message}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = REPO_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from evals.ingest_chunks import (  # noqa: E402
+    PENDING_KEYS_NAME,
+    IngestManifestError,
+    apply_ingest_chunks,
+    load_ingest_manifest,
+)
+from evals.sample_keys import SeenKeysError, commit_pending_keys  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            'Apply a chunked eval ingest (generate_eval_ingest_sql.py --chunks) with psql, '
+            'loading chunks in parallel sessions and resuming after partial failures.'
+        )
+    )
+    parser.add_argument(
+        'chunk_dir', type=Path, help='Directory containing manifest.json and chunk files.'
+    )
+    parser.add_argument(
+        '--database-url',
+        default=os.getenv('DATABASE_URL'),
+        help='Postgres connection string passed to psql (default: $DATABASE_URL).',
+    )
+    parser.add_argument('--parallel', type=int, default=4, help='Concurrent psql sessions.')
+    parser.add_argument('--psql', default='psql', help='psql executable.')
+    parser.add_argument(
+        '--seen-keys',
+        type=Path,
+        default=None,
+        help=(
+            'Seen-keys file given to generate_eval_ingest_sql.py: once the finalize file has '
+            "been applied, the chunk directory's pending sample keys are merged into it."
+        ),
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.database_url:
+        print('DATABASE_URL (or --database-url) is required.', file=sys.stderr)
+        return 1
+
+    def apply_file(path: Path) -> None:
+        subprocess.run(
+            [args.psql, args.database_url, '-X', '-q', '-v', 'ON_ERROR_STOP=1', '-f', str(path)],
+            check=True,
+        )
+
+    try:
+        manifest = load_ingest_manifest(args.chunk_dir)
+        applied = apply_ingest_chunks(args.chunk_dir, apply_file, parallel=args.parallel)
+    except IngestManifestError as error:
+        print(str(error), file=sys.stderr)
+        return 1
+    except subprocess.CalledProcessError as error:
+        print(
+            f'psql failed on {error.cmd[-1]}; re-run to resume from the remaining chunks.',
+            file=sys.stderr,
+        )
+        return 1
+
+    print(f'Applied {len(applied)} files for run_id={manifest.run_id} ({manifest.rows} samples)')
+    if args.seen_keys is not None:
+        # apply_ingest_chunks only returns once the finalize file has been applied.
+        try:
+            merged = commit_pending_keys(args.chunk_dir / PENDING_KEYS_NAME, args.seen_keys)
+        except SeenKeysError as error:
+            print(str(error), file=sys.stderr)
+            return 1
+        print(f'Recorded {merged} loaded sample keys in {args.seen_keys}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -5,19 +5,35 @@ import argparse
 import json
 import os
 import sys
+import time
 from pathlib import Path
+from typing import Any
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 SRC_PATH = REPO_ROOT / 'src'
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
+from evals.compressed_io import open_text  # noqa: E402
+from evals.instrumentation import profiling, record_stage, span  # noqa: E402
+from evals.rolling_export import RollingDataset  # noqa: E402
+from evals.runner import (  # noqa: E402
+    EVAL_GROUP_BY_FIELDS,
+    EvalMetricsAccumulator,
+    GroupedEvalAccumulator,
+)
 from evals.supabase_export import (  # noqa: E402
+    DEFAULT_PAGE_SIZE,
+    ExportStats,
     compute_since_iso,
-    fetch_training_example_rows,
+    iter_training_example_rows,
     row_to_eval_record_payload,
+    rows_to_eval_batch,
 )
 
+# Rows folded into the in-process report per columnar batch.
+REPORT_BATCH_ROWS = 10_000
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -26,7 +42,37 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--supabase-url', default=os.getenv('SUPABASE_URL'))
     parser.add_argument('--service-role-key', default=os.getenv('SUPABASE_SERVICE_ROLE_KEY'))
     parser.add_argument('--days', type=int, default=1)
-    parser.add_argument('--limit', type=int, default=2000)
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=0,
+        help='Maximum rows to export, newest first (default: 0, the whole --days window).',
+    )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help='Rows per keyset-paginated REST request.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help=(
+            'Upper bound on concurrent REST requests / pooled keep-alive connections; the '
+            'exporter backs off below it while the API throttles (429/5xx).'
+        ),
+    )
+    parser.add_argument(
+        '--shards',
+        type=int,
+        default=0,
+        help=(
+            'Split the created_at window into this many time ranges fetched concurrently by '
+            '--workers and merged newest-first (default: 0, four per worker; 1 = serial). '
+            'Ignored with --limit, which pages serially and stops at the limit.'
+        ),
+    )
     parser.add_argument(
         '--source',
         action='append',
@@ -38,6 +84,66 @@ def parse_args() -> argparse.Namespace:
         '--output',
         type=Path,
         default=REPO_ROOT / 'artifacts/evals/recent_eval_records.jsonl',
+        help='JSONL output; a .gz or .zst suffix compresses it while streaming.',
+    )
+    parser.add_argument(
+        '--state-dir',
+        type=Path,
+        default=None,
+        help=(
+            'Export incrementally: fetch only rows newer than the watermark stored here, append '
+            'them as a new segment, and write every retained segment to --output.'
+        ),
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='With --state-dir, drop segments older than --retention-days and merge the rest.',
+    )
+    parser.add_argument(
+        '--retention-days',
+        type=int,
+        default=None,
+        help='Rolling window kept by --compact (default: --days).',
+    )
+    parser.add_argument(
+        '--report-output',
+        type=Path,
+        default=None,
+        help=(
+            'Also build the offline eval report (default gates) from the exported rows in '
+            'process, as columnar batches, and write it to this JSON path.'
+        ),
+    )
+    parser.add_argument(
+        '--group-by',
+        action='append',
+        default=[],
+        choices=EVAL_GROUP_BY_FIELDS,
+        help='With --report-output, repeat to add per-group metrics for these key fields.',
+    )
+    parser.add_argument(
+        '--export-stats-output',
+        type=Path,
+        default=None,
+        help='Write rows/s, request, retry, throttling and concurrency stats to this JSON path.',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Write per-stage timings, row counts and peak allocations to --profile-output.',
+    )
+    parser.add_argument(
+        '--profile-output',
+        type=Path,
+        default=None,
+        help='Profile JSON path (default: <output>.profile.json).',
+    )
+    parser.add_argument(
+        '--profile-pstats',
+        type=Path,
+        default=None,
+        help='Also run under cProfile and dump pstats to this path (implies --profile).',
     )
     parser.add_argument(
         '--fail-on-empty',
@@ -53,25 +159,109 @@ def main() -> int:
         print('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required.', file=sys.stderr)
         return 1
 
+    if args.state_dir is not None and args.limit:
+        print('--limit cannot be combined with --state-dir.', file=sys.stderr)
+        return 1
+    if args.state_dir is not None and args.report_output is not None:
+        print('--report-output cannot be combined with --state-dir.', file=sys.stderr)
+        return 1
+
     sources = args.sources if args.sources else ['generation', 'generation_cached']
-    since_iso = compute_since_iso(args.days)
-    rows = fetch_training_example_rows(
-        supabase_url=args.supabase_url,
-        service_role_key=args.service_role_key,
-        since_iso=since_iso,
-        limit=args.limit,
-        sources=sources,
-    )
+    dataset = RollingDataset(args.state_dir) if args.state_dir is not None else None
+    watermark = dataset.watermark(sources) if dataset is not None else None
+    # An incremental run resumes at the watermark; rows stamped exactly at it are re-fetched
+    # and filtered by id, so none sharing that timestamp are lost.
+    since_iso = watermark.created_at if watermark is not None else compute_since_iso(args.days)
+    profile_enabled = args.profile or args.profile_pstats is not None
+    export_stats = ExportStats()
+    accumulator: EvalMetricsAccumulator | GroupedEvalAccumulator | None = None
+    if args.report_output is not None:
+        group_by = tuple(args.group_by)
+        accumulator = GroupedEvalAccumulator(group_by) if group_by else EvalMetricsAccumulator()
+    with profiling(enabled=profile_enabled, pstats_path=args.profile_pstats) as profiler:
+        rows = iter_training_example_rows(
+            supabase_url=args.supabase_url,
+            service_role_key=args.service_role_key,
+            since_iso=since_iso,
+            page_size=args.page_size,
+            sources=sources,
+            limit=args.limit or None,
+            shards=args.shards or 4 * args.workers,
+            workers=args.workers,
+            stats=export_stats,
+        )
+        with span('supabase_export.stream') as stage:
+            stream_started = time.perf_counter()
+            if dataset is not None:
+                segment = dataset.append(sources, rows, row_to_eval_record_payload)
+                exported = segment.rows if segment else 0
+                written = dataset.segment_path(segment).stat().st_size if segment else 0
+            else:
+                exported = written = 0
+                args.output.parent.mkdir(parents=True, exist_ok=True)
+                with open_text(args.output, 'w') as handle:
+                    # Rows are transformed and written as they are parsed off the wire, so
+                    # memory stays bounded by one row however large the window is.
+                    write = handle.write
+                    pending: list[dict[str, Any]] = []
+                    for row in rows:
+                        line = json.dumps(row_to_eval_record_payload(row), separators=(',', ':'))
+                        written += write(line + '\n')
+                        exported += 1
+                        if accumulator is not None:
+                            # The report reads raw rows straight into typed columns, so it
+                            # never re-parses the JSONL just written.
+                            pending.append(row)
+                            if len(pending) == REPORT_BATCH_ROWS:
+                                accumulator.update(rows_to_eval_batch(pending))
+                                pending.clear()
+                    if accumulator is not None and pending:
+                        accumulator.update(rows_to_eval_batch(pending))
+            stage.add_rows(exported)
+            # The fetch stage is recorded by the exporter; the rest of the stream is the
+            # transform and JSONL write (uncompressed bytes).
+            record_stage(
+                'supabase_export.transform',
+                time.perf_counter() - stream_started - export_stats.fetch_seconds,
+                rows=exported,
+                byte_count=written,
+            )
+        if dataset is not None:
+            print(f'Appended {exported} new eval records to: {args.state_dir}')
+            if args.compact:
+                retention_days = args.retention_days or args.days
+                removed = dataset.compact(sources, compute_since_iso(retention_days))
+                print(f'Compacted {removed} dataset segments.')
+            exported = dataset.write_combined(sources, args.output)
 
-    payloads = [row_to_eval_record_payload(row) for row in rows]
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    with args.output.open('w', encoding='utf-8') as handle:
-        for payload in payloads:
-            handle.write(json.dumps(payload, separators=(',', ':')))
+    if profiler is not None:
+        profile_output = args.profile_output or args.output.with_suffix('.profile.json')
+        with profile_output.open('w', encoding='utf-8') as handle:
+            json.dump(profiler.as_dict(), handle, indent=2)
             handle.write('\n')
+        print(f'Wrote export profile to: {profile_output}')
 
-    print(f'Exported {len(payloads)} eval records to: {args.output}')
-    return 2 if args.fail_on_empty and not payloads else 0
+    stats = export_stats.as_dict()
+    print(
+        f'Fetched {stats["rows"]} rows in {stats["requests"]} requests '
+        f'({stats["rows_per_second"]:,.0f} rows/s, {stats["throttled"]} throttled, '
+        f'concurrency limit {stats["final_concurrency_limit"]}/{stats["max_concurrency"]})'
+    )
+    if args.export_stats_output is not None:
+        args.export_stats_output.parent.mkdir(parents=True, exist_ok=True)
+        with args.export_stats_output.open('w', encoding='utf-8') as handle:
+            json.dump(stats, handle, indent=2)
+            handle.write('\n')
+        print(f'Wrote export stats: {args.export_stats_output}')
+    print(f'Exported {exported} eval records to: {args.output}')
+    if accumulator is not None:
+        report = accumulator.build_report()
+        args.report_output.parent.mkdir(parents=True, exist_ok=True)
+        with args.report_output.open('w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+        print(f'Wrote offline eval report to: {args.report_output}')
+    return 2 if args.fail_on_empty and not exported else 0
 
 
 if __name__ == '__main__':
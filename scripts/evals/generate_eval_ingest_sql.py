@@ -12,20 +12,87 @@ SRC_PATH = REPO_ROOT / 'src'
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from evals.contracts import EvalThresholds  # noqa: E402
-from evals.ingest_sql import EvalIngestContext, build_eval_ingest_sql  # noqa: E402
+from evals.contracts import EvalRecord, EvalRecordBatch, EvalThresholds  # noqa: E402
+from evals.dataset_cache import UncacheableInputError, load_eval_batch_cached  # noqa: E402
+from evals.ingest_chunks import PENDING_KEYS_NAME, write_eval_ingest_chunks  # noqa: E402
+from evals.ingest_sql import (  # noqa: E402
+    DEFAULT_DEDUPE_SCOPE,
+    DEFAULT_ROWS_PER_STATEMENT,
+    EvalIngestContext,
+    SampleDedupePlan,
+    plan_sample_dedupe,
+    scoped_run_id,
+    write_eval_ingest_sql,
+)
+from evals.instrumentation import profiling, span  # noqa: E402
+from evals.parallel_load import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    load_eval_batch_parallel,
+    load_eval_records_parallel,
+)
+from evals.rest_ingest import (  # noqa: E402
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    BatchResult,
+    ingest_eval_run_rest,
+)
 from evals.runner import build_eval_report, load_eval_records  # noqa: E402
+from evals.sample_keys import (  # noqa: E402
+    SeenKeysError,
+    SeenSampleKeys,
+    commit_pending_keys,
+    write_pending_keys,
+)
+
+_SQL_WRITE_BUFFER = 1024 * 1024
+
+
+def _print_batch(batch: BatchResult) -> None:
+    # One write per line so lines from concurrent batches do not interleave.
+    sys.stdout.write(
+        f'batch {batch.index}: rows={batch.rows} seconds={batch.seconds:.3f} '
+        f'rows/s={batch.rows_per_second:,.0f} attempts={batch.attempts}\n'
+    )
+
+
+def _chunk_dir(args: argparse.Namespace) -> Path:
+    return args.chunk_dir or args.sql_output.with_suffix('.chunks')
+
+
+def _pending_keys_path(args: argparse.Namespace) -> Path:
+    if args.chunks > 0:
+        return _chunk_dir(args) / PENDING_KEYS_NAME
+    return args.sql_output.with_name(args.sql_output.name + '.pending-keys')
+
+
+def _commit_seen_keys(args: argparse.Namespace) -> int:
+    if args.seen_keys is None:
+        print('--commit-seen-keys needs --seen-keys.', file=sys.stderr)
+        return 1
+    pending = _pending_keys_path(args)
+    if not pending.exists():
+        print(f'No pending sample keys at {pending}.', file=sys.stderr)
+        return 1
+    try:
+        merged = commit_pending_keys(pending, args.seen_keys)
+    except SeenKeysError as error:
+        print(str(error), file=sys.stderr)
+        return 1
+    print(f'Recorded {merged} loaded sample keys in {args.seen_keys}')
+    return 0
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description='Generate SQL to ingest an eval run into ai_eval_runs/ai_eval_samples.'
+        description='Generate SQL to ingest an eval run into ai_eval_runs/ai_eval_samples, or '
+        'insert it directly over the Supabase REST API (--mode rest).'
     )
     parser.add_argument(
         '--input',
         type=Path,
         default=REPO_ROOT / 'tests/fixtures/eval_records_sample.jsonl',
-        help='Path to JSONL eval records.',
+        help='Path to JSONL eval records (.jsonl.gz / .jsonl.zst are decompressed on the fly).',
     )
     parser.add_argument(
         '--sql-output',
@@ -39,6 +106,42 @@ def parse_args() -> argparse.Namespace:
         default=REPO_ROOT / 'artifacts/evals/eval_run_report.json',
         help='Path to write eval report JSON.',
     )
+    parser.add_argument(
+        '--mode',
+        choices=['sql', 'rest'],
+        default='sql',
+        help=(
+            'sql: write an ingestion script to --sql-output; rest: insert the run and samples '
+            'directly through the Supabase REST API (needs SUPABASE_URL and '
+            'SUPABASE_SERVICE_ROLE_KEY).'
+        ),
+    )
+    parser.add_argument('--supabase-url', default=os.getenv('SUPABASE_URL'))
+    parser.add_argument('--service-role-key', default=os.getenv('SUPABASE_SERVICE_ROLE_KEY'))
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help='Samples per REST insert request (--mode rest).',
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help='Concurrent REST insert requests / pooled connections (--mode rest).',
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help='Retries per REST request on connection errors and 408/429/5xx (--mode rest).',
+    )
+    parser.add_argument(
+        '--ingest-stats-output',
+        type=Path,
+        default=REPO_ROOT / 'artifacts/evals/eval_run_rest_ingest.json',
+        help='Per-batch throughput/latency JSON for --mode rest.',
+    )
     parser.add_argument('--run-type', choices=['offline', 'shadow', 'canary'], default='offline')
     parser.add_argument(
         '--schema-variant',
@@ -46,9 +149,125 @@ def parse_args() -> argparse.Namespace:
         default='sitecraft',
         help='Target SQL schema variant for ai_eval_runs/ai_eval_samples.',
     )
+    parser.add_argument(
+        '--output-format',
+        choices=['insert', 'copy'],
+        default='insert',
+        help=(
+            'insert: multi-row INSERTs (runs in the Supabase SQL Editor); copy: run row INSERT '
+            'plus a COPY ... FROM STDIN block for samples (run with psql -f).'
+        ),
+    )
+    parser.add_argument(
+        '--rows-per-statement',
+        type=int,
+        default=DEFAULT_ROWS_PER_STATEMENT,
+        help='Samples per multi-row INSERT statement (1 = one statement per sample).',
+    )
+    parser.add_argument(
+        '--chunks',
+        type=int,
+        default=0,
+        help=(
+            'Split samples into this many chunk files (one transaction each, loadable in '
+            'parallel) under --chunk-dir with a manifest, rendered across --workers '
+            'processes; 0 writes the single --sql-output script.'
+        ),
+    )
+    parser.add_argument(
+        '--chunk-dir',
+        type=Path,
+        default=None,
+        help='Directory for --chunks output (default: <sql-output without suffix>.chunks).',
+    )
+    parser.add_argument(
+        '--run-id',
+        default=None,
+        help=(
+            'Run id to write (default: derived from --scope and --run-type with --dedupe, '
+            'otherwise a new UUID).'
+        ),
+    )
+    parser.add_argument(
+        '--scope',
+        default=DEFAULT_DEDUPE_SCOPE,
+        help=(
+            'Stable id of the dataset being ingested (--dedupe). Ingests of the same scope and '
+            'run type share one run, so overlapping export windows merge into it.'
+        ),
+    )
+    parser.add_argument(
+        '--dedupe',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            'Key samples by a hash of run id, request_id and record_id, drop repeats, skip '
+            'keys already stored and recompute the run from its stored samples (default; '
+            'needs migration template 0005). --no-dedupe writes a new run with plain inserts.'
+        ),
+    )
+    parser.add_argument(
+        '--seen-keys',
+        type=Path,
+        default=None,
+        help=(
+            'Sorted key file of already-ingested samples (needs --dedupe): matching samples '
+            'are skipped before rendering. --mode rest adds the sent keys once the ingest '
+            'succeeds; SQL output leaves them in a pending file until the load is confirmed '
+            '(apply_eval_ingest_chunks.py --seen-keys, or --commit-seen-keys).'
+        ),
+    )
+    parser.add_argument(
+        '--commit-seen-keys',
+        action='store_true',
+        help=(
+            'After the generated SQL (or chunks) has been loaded, merge its pending sample '
+            'keys into --seen-keys and exit. Pass the same --sql-output/--chunks/--chunk-dir.'
+        ),
+    )
     parser.add_argument('--triggered-by', default='local-cli')
     parser.add_argument('--commit-sha', default=os.getenv('GITHUB_SHA'))
     parser.add_argument('--dataset-ref', default=None)
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=(
+            'Load the input through a binary columnar cache in --cache-dir. Repeat runs skip '
+            'the JSON parse, but the whole input is held in memory instead of streamed.'
+        ),
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=REPO_ROOT / 'artifacts/evals/.cache',
+        help='Directory for --cache entries.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help=(
+            'Parse the input (and render --chunks) across this many processes '
+            '(default: 1, single-process streaming).'
+        ),
+    )
+    parser.add_argument(
+        '--chunk-size-mb',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE // (1024 * 1024),
+        help='Byte-range size per parallel parse task, in MiB.',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record per-stage timings, row counts and peak allocations in the report JSON.',
+    )
+    parser.add_argument(
+        '--profile-pstats',
+        type=Path,
+        default=None,
+        help='Also run under cProfile and dump pstats to this path (implies --profile).',
+    )
     parser.add_argument('--schema-valid-rate', type=float, default=0.99)
     parser.add_argument('--patch-apply-success', type=float, default=0.95)
     parser.add_argument('--edit-after-generate-rate', type=float, default=0.30)
@@ -66,6 +285,8 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
+    if args.commit_seen_keys:
+        return _commit_seen_keys(args)
     thresholds = EvalThresholds(
         schema_valid_rate=args.schema_valid_rate,
         patch_apply_success=args.patch_apply_success,
@@ -76,31 +297,157 @@ def main() -> int:
         p95_latency_ms_max=args.p95_latency_ms_max,
     )
 
-    records = load_eval_records(args.input)
-    report = build_eval_report(records, thresholds=thresholds)
-    context = EvalIngestContext(
-        run_type=args.run_type,
-        triggered_by=args.triggered_by,
-        commit_sha=args.commit_sha,
-        dataset_ref=args.dataset_ref or str(args.input),
-        schema_variant=args.schema_variant,
-    )
-    sql_text, run_id, status = build_eval_ingest_sql(
-        records=records,
-        thresholds=thresholds,
-        context=context,
-        report=report,
-    )
+    if args.seen_keys is not None and not args.dedupe:
+        print('--seen-keys needs --dedupe.', file=sys.stderr)
+        return 1
+    if args.mode == 'rest' and (not args.supabase_url or not args.service_role_key):
+        print('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required.', file=sys.stderr)
+        return 1
 
-    args.sql_output.parent.mkdir(parents=True, exist_ok=True)
-    args.sql_output.write_text(sql_text, encoding='utf-8')
+    chunk_size = args.chunk_size_mb * 1024 * 1024
+    profile_enabled = args.profile or args.profile_pstats is not None
+    with profiling(enabled=profile_enabled, pstats_path=args.profile_pstats) as profiler:
+        records: EvalRecordBatch | list[EvalRecord]
+        if args.cache:
+            try:
+                with span('dataset_cache.load') as stage:
+                    records = load_eval_batch_cached(
+                        args.input,
+                        args.cache_dir,
+                        loader=lambda path: load_eval_batch_parallel(
+                            path, workers=args.workers, chunk_size=chunk_size
+                        ),
+                    )
+                    stage.add_rows(len(records))
+            except UncacheableInputError as error:
+                # The parallel loader builds the same fixed-width columns as the cache, so
+                # fall back to the plain loader.
+                print(f'{error}; reading it without the cache.', file=sys.stderr)
+                records = load_eval_records(args.input)
+        elif args.workers > 1:
+            with span('parallel_load.load_eval_records') as stage:
+                records = load_eval_records_parallel(
+                    args.input, workers=args.workers, chunk_size=chunk_size
+                )
+                stage.add_rows(len(records))
+        else:
+            records = load_eval_records(args.input)
+        report = build_eval_report(records, thresholds=thresholds)
+        context = EvalIngestContext(
+            run_type=args.run_type,
+            triggered_by=args.triggered_by,
+            commit_sha=args.commit_sha,
+            dataset_ref=args.dataset_ref or str(args.input),
+            schema_variant=args.schema_variant,
+        )
+        run_id = args.run_id
+        seen_keys = SeenSampleKeys(args.seen_keys) if args.seen_keys else None
+        dedupe: SampleDedupePlan | None = None
+        if args.dedupe:
+            run_id = run_id or scoped_run_id(args.scope, args.run_type)
+            dedupe = plan_sample_dedupe(records, run_id, seen_keys)
+        if args.mode == 'rest':
+            with span('rest_ingest.ingest_eval_run_rest', rows=len(records)):
+                ingest_result = ingest_eval_run_rest(
+                    args.supabase_url,
+                    args.service_role_key,
+                    records=records,
+                    thresholds=thresholds,
+                    context=context,
+                    report=report,
+                    run_id=run_id,
+                    batch_size=args.batch_size,
+                    concurrency=args.concurrency,
+                    max_retries=args.max_retries,
+                    on_batch=_print_batch,
+                    dedupe=dedupe,
+                )
+            run_id, status = ingest_result.run_id, ingest_result.status
+        elif args.chunks > 0:
+            chunk_dir = _chunk_dir(args)
+            with span('ingest_chunks.write_eval_ingest_chunks', rows=len(records)):
+                manifest = write_eval_ingest_chunks(
+                    chunk_dir,
+                    records=records,
+                    thresholds=thresholds,
+                    context=context,
+                    chunks=args.chunks,
+                    report=report,
+                    run_id=run_id,
+                    rows_per_statement=args.rows_per_statement,
+                    output_format=args.output_format,
+                    workers=args.workers,
+                    dedupe=dedupe,
+                )
+            run_id, status = manifest.run_id, manifest.status
+        else:
+            args.sql_output.parent.mkdir(parents=True, exist_ok=True)
+            with (
+                span('ingest_sql.write_eval_ingest_sql', rows=len(records)),
+                args.sql_output.open('w', encoding='utf-8', buffering=_SQL_WRITE_BUFFER) as handle,
+            ):
+                run_id, status = write_eval_ingest_sql(
+                    handle,
+                    records=records,
+                    thresholds=thresholds,
+                    context=context,
+                    report=report,
+                    run_id=run_id,
+                    rows_per_statement=args.rows_per_statement,
+                    output_format=args.output_format,
+                    dedupe=dedupe,
+                )
+        pending_keys = _pending_keys_path(args)
+        if args.mode == 'sql' and args.chunks <= 0:
+            # Keys left by an earlier render describe SQL that this file replaces.
+            pending_keys.unlink(missing_ok=True)
+        if seen_keys is not None and dedupe is not None:
+            if args.mode == 'rest':
+                with span('sample_keys.save', rows=dedupe.rows):
+                    seen_keys.update(dedupe.new_keys())
+                    seen_keys.save()
+            else:
+                with span('sample_keys.write_pending', rows=dedupe.rows):
+                    write_pending_keys(pending_keys, dedupe.new_keys())
+    if dedupe is not None:
+        report['dedupe'] = dedupe.as_dict()
+    if profiler is not None:
+        report['profile'] = profiler.as_dict()
 
     args.report_output.parent.mkdir(parents=True, exist_ok=True)
     with args.report_output.open('w', encoding='utf-8') as handle:
         json.dump(report, handle, indent=2)
         handle.write('\n')
 
-    print(f'Generated eval ingest SQL: {args.sql_output}')
+    if args.mode == 'rest':
+        stats = ingest_result.as_dict()
+        args.ingest_stats_output.parent.mkdir(parents=True, exist_ok=True)
+        with args.ingest_stats_output.open('w', encoding='utf-8') as handle:
+            json.dump(stats, handle, indent=2)
+            handle.write('\n')
+        print(
+            f'Ingested {stats["rows"]} samples in {len(ingest_result.batches)} batches '
+            f'({stats["rows_per_second"]:,.0f} rows/s, p95 batch {stats["batch_seconds_p95"]}s)'
+        )
+        print(f'Wrote REST ingest stats: {args.ingest_stats_output}')
+    elif args.chunks > 0:
+        print(f'Generated {len(manifest.chunks)} eval ingest chunks: {chunk_dir}')
+    else:
+        print(f'Generated eval ingest SQL: {args.sql_output}')
+    if dedupe is not None:
+        print(
+            f'Deduplicated samples: {dedupe.rows} rendered, {dedupe.already_ingested} already '
+            f'ingested, {len(dedupe) - dedupe.distinct} repeated in input'
+        )
+    if seen_keys is not None and args.mode == 'sql':
+        print(
+            f'Sample keys pending in {pending_keys}; they are added to {args.seen_keys} by '
+            + (
+                f'apply_eval_ingest_chunks.py {chunk_dir} --seen-keys {args.seen_keys}'
+                if args.chunks > 0
+                else 're-running this command with --commit-seen-keys after the load'
+            )
+        )
     print(f'Generated eval report JSON: {args.report_output}')
     print(f'run_id={run_id}')
     print(f'status={status}')
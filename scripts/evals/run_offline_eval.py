@@ -3,16 +3,38 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
+from typing import Any
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 SRC_PATH = REPO_ROOT / 'src'
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from evals.contracts import EvalRecord, EvalThresholds  # noqa: E402
-from evals.runner import build_eval_report, load_eval_records  # noqa: E402
+from evals.aggregate_pushdown import fetch_eval_aggregate  # noqa: E402
+from evals.checkpoint import (  # noqa: E402
+    checkpoint_path_for,
+    run_incremental_eval,
+    run_incremental_segment_eval,
+)
+from evals.contracts import EvalRecord, EvalRecordBatch, EvalThresholds  # noqa: E402
+from evals.dataset_cache import UncacheableInputError, load_eval_batch_cached  # noqa: E402
+from evals.instrumentation import profiling, span  # noqa: E402
+from evals.parallel_load import (  # noqa: E402
+    DEFAULT_CHUNK_SIZE,
+    accumulate_eval_groups_parallel,
+    accumulate_eval_records_parallel,
+    load_eval_batch_parallel,
+)
+from evals.runner import (  # noqa: E402
+    EVAL_GROUP_BY_FIELDS,
+    EvalMetricsAccumulator,
+    GroupedEvalAccumulator,
+    iter_eval_records,
+)
+from evals.supabase_export import compute_since_iso  # noqa: E402
 
 
 def _fallback_records() -> list[EvalRecord]:
@@ -36,6 +58,28 @@ def _fallback_records() -> list[EvalRecord]:
     ]
 
 
+def _new_accumulator(group_by: tuple[str, ...]) -> EvalMetricsAccumulator | GroupedEvalAccumulator:
+    return GroupedEvalAccumulator(group_by) if group_by else EvalMetricsAccumulator()
+
+
+def _load_cached_batch(args: argparse.Namespace, chunk_size: int) -> EvalRecordBatch | None:
+    """The input via its columnar cache, or None (with a warning) if it cannot be cached."""
+    try:
+        with span('dataset_cache.load') as stage:
+            batch = load_eval_batch_cached(
+                args.input,
+                args.cache_dir,
+                loader=lambda path: load_eval_batch_parallel(
+                    path, workers=args.workers, chunk_size=chunk_size
+                ),
+            )
+            stage.add_rows(len(batch))
+    except UncacheableInputError as error:
+        print(f'{error}; reading it without the cache.', file=sys.stderr)
+        return None
+    return batch
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description='Run offline evaluation metrics over JSONL records.'
@@ -44,7 +88,7 @@ def parse_args() -> argparse.Namespace:
         '--input',
         type=Path,
         default=REPO_ROOT / 'tests/fixtures/eval_records_sample.jsonl',
-        help='Path to JSONL eval records.',
+        help='Path to JSONL eval records (.jsonl.gz / .jsonl.zst are decompressed on the fly).',
     )
     parser.add_argument(
         '--output',
@@ -52,6 +96,106 @@ def parse_args() -> argparse.Namespace:
         default=REPO_ROOT / 'artifacts/evals/offline_eval_report.json',
         help='Path to write report JSON.',
     )
+    parser.add_argument(
+        '--group-by',
+        action='append',
+        default=[],
+        choices=EVAL_GROUP_BY_FIELDS,
+        help='Repeat to add per-group metrics and gates for these key fields to the report.',
+    )
+    parser.add_argument(
+        '--pushdown',
+        action='store_true',
+        help=(
+            'Ignore --input and compute the metrics for the last --days of ai_training_examples '
+            'in Postgres (ai_eval_training_aggregate_v1, migration template 0006).'
+        ),
+    )
+    parser.add_argument('--supabase-url', default=os.getenv('SUPABASE_URL'))
+    parser.add_argument('--service-role-key', default=os.getenv('SUPABASE_SERVICE_ROLE_KEY'))
+    parser.add_argument('--days', type=int, default=1, help='Window for --pushdown.')
+    parser.add_argument(
+        '--source',
+        action='append',
+        dest='sources',
+        default=[],
+        help=(
+            'Repeat to set the --pushdown or --state-dir source filters '
+            '(default: generation,generation_cached).'
+        ),
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help=(
+            'Fold only records appended to --input since the last run, using the aggregate '
+            'checkpoint persisted next to the report. Only saves work for append-only files: '
+            'a rewritten input is recomputed in full (use --state-dir for nightly exports).'
+        ),
+    )
+    parser.add_argument(
+        '--state-dir',
+        type=Path,
+        default=None,
+        help=(
+            'Ignore --input and report over the rolling dataset of '
+            'export_eval_records_from_supabase.py --state-dir, parsing only segments added '
+            'since the last run (checkpointed like --incremental).'
+        ),
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=Path,
+        default=None,
+        help=(
+            'Checkpoint path for --incremental / --state-dir (default: <output>.checkpoint.json).'
+        ),
+    )
+    parser.add_argument(
+        '--full-rebuild',
+        action='store_true',
+        help=(
+            'With --incremental or --state-dir, ignore any existing checkpoint and recompute '
+            'from scratch.'
+        ),
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=(
+            'Load the input through a binary columnar cache in --cache-dir. Repeat runs skip '
+            'the JSON parse, but the whole input is held in memory instead of streamed.'
+        ),
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=REPO_ROOT / 'artifacts/evals/.cache',
+        help='Directory for --cache entries.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parse the input across this many processes (default: 1, single-process streaming).',
+    )
+    parser.add_argument(
+        '--chunk-size-mb',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE // (1024 * 1024),
+        help='Byte-range size per parallel parse task, in MiB.',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record per-stage timings, row counts and peak allocations under "profile".',
+    )
+    parser.add_argument(
+        '--profile-pstats',
+        type=Path,
+        default=None,
+        help='Also run under cProfile and dump pstats to this path (implies --profile).',
+    )
     parser.add_argument('--schema-valid-rate', type=float, default=0.99)
     parser.add_argument('--patch-apply-success', type=float, default=0.95)
     parser.add_argument('--edit-after-generate-rate', type=float, default=0.30)
@@ -62,6 +206,67 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _build_report(
+    args: argparse.Namespace,
+    thresholds: EvalThresholds,
+    group_by: tuple[str, ...],
+    chunk_size: int,
+) -> dict[str, Any]:
+    accumulator: EvalMetricsAccumulator | GroupedEvalAccumulator
+    incremental: dict[str, object] | None = None
+    if args.pushdown:
+        accumulator = fetch_eval_aggregate(
+            args.supabase_url,
+            args.service_role_key,
+            compute_since_iso(args.days),
+            sources=args.sources or None,
+            group_by=group_by,
+        )
+    elif args.state_dir is not None:
+        with span('checkpoint.run_incremental_segment_eval') as stage:
+            result = run_incremental_segment_eval(
+                args.state_dir,
+                args.checkpoint or checkpoint_path_for(args.output),
+                sources=args.sources or ['generation', 'generation_cached'],
+                group_by=group_by,
+                full_rebuild=args.full_rebuild,
+            )
+            stage.add_rows(result.new_record_count)
+        accumulator = result.accumulator
+        incremental = result.as_dict()
+    elif not args.input.exists():
+        accumulator = _new_accumulator(group_by).update(_fallback_records())
+    elif args.incremental:
+        with span('checkpoint.run_incremental_eval') as stage:
+            result = run_incremental_eval(
+                args.input,
+                args.checkpoint or checkpoint_path_for(args.output),
+                group_by=group_by,
+                full_rebuild=args.full_rebuild,
+            )
+            stage.add_rows(result.new_record_count)
+        accumulator = result.accumulator
+        incremental = result.as_dict()
+    elif args.cache and (batch := _load_cached_batch(args, chunk_size)) is not None:
+        accumulator = _new_accumulator(group_by).update(batch)
+    elif args.workers > 1:
+        with span('parallel_load.accumulate'):
+            if group_by:
+                accumulator = accumulate_eval_groups_parallel(
+                    args.input, group_by, workers=args.workers, chunk_size=chunk_size
+                )
+            else:
+                accumulator = accumulate_eval_records_parallel(
+                    args.input, workers=args.workers, chunk_size=chunk_size
+                )
+    else:
+        accumulator = _new_accumulator(group_by).update(iter_eval_records(args.input))
+    report = accumulator.build_report(thresholds)
+    if incremental is not None:
+        report['incremental'] = incremental
+    return report
+
+
 def main() -> int:
     args = parse_args()
     thresholds = EvalThresholds(
@@ -74,11 +279,17 @@ def main() -> int:
         p95_latency_ms_max=args.p95_latency_ms_max,
     )
 
-    records = _fallback_records()
-    if args.input.exists():
-        records = load_eval_records(args.input)
+    if args.pushdown and (not args.supabase_url or not args.service_role_key):
+        print('SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required.', file=sys.stderr)
+        return 1
 
-    report = build_eval_report(records, thresholds=thresholds)
+    group_by = tuple(args.group_by)
+    chunk_size = args.chunk_size_mb * 1024 * 1024
+    profile_enabled = args.profile or args.profile_pstats is not None
+    with profiling(enabled=profile_enabled, pstats_path=args.profile_pstats) as profiler:
+        report = _build_report(args, thresholds, group_by, chunk_size)
+    if profiler is not None:
+        report['profile'] = profiler.as_dict()
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
     with args.output.open('w', encoding='utf-8') as handle:
@@ -1,12 +1,28 @@
 """Evaluation package for offline/online quality checks."""
 
-from .contracts import EvalRecord, EvalThresholds
-from .runner import build_eval_report, compute_metric_rates, load_eval_records
+from .contracts import DictionaryColumn, EvalRecord, EvalRecordBatch, EvalThresholds
+from .runner import (
+    EvalMetricsAccumulator,
+    GroupedEvalAccumulator,
+    build_eval_report,
+    build_grouped_eval_report,
+    compute_metric_rates,
+    iter_eval_records,
+    load_eval_batch,
+    load_eval_records,
+)
 
 __all__ = [
+    'DictionaryColumn',
+    'EvalMetricsAccumulator',
     'EvalRecord',
+    'EvalRecordBatch',
     'EvalThresholds',
+    'GroupedEvalAccumulator',
     'build_eval_report',
+    'build_grouped_eval_report',
     'compute_metric_rates',
+    'iter_eval_records',
+    'load_eval_batch',
     'load_eval_records',
 ]
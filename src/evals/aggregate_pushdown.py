@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from .http_pool import HttpConnectionPool
+from .instrumentation import span
+from .rest_ingest import (
+    DEFAULT_BACKOFF_SECONDS,
+    DEFAULT_MAX_RETRIES,
+    rest_headers,
+    send_with_retry,
+)
+from .runner import EVAL_GROUP_BY_FIELDS, EvalMetricsAccumulator, GroupedEvalAccumulator
+
+AGGREGATE_RPC_PATH = '/rest/v1/rpc/ai_eval_training_aggregate_v1'
+DEFAULT_SOURCES = ('generation', 'generation_cached')
+_COUNT_COLUMNS = (
+    'record_count',
+    'schema_valid_count',
+    'patch_apply_success_count',
+    'edited_after_generate_count',
+    'published_within_7d_count',
+    'safety_html_tailwind_compliant_count',
+    'fallback_used_count',
+)
+
+
+def aggregate_rpc_body(
+    since_iso: str,
+    until_iso: str | None = None,
+    sources: Sequence[str] | None = None,
+    group_by: Sequence[str] = (),
+) -> bytes:
+    unknown = [name for name in group_by if name not in EVAL_GROUP_BY_FIELDS]
+    if unknown:
+        raise ValueError(
+            f'Unsupported group_by fields: {unknown}. Must be from {EVAL_GROUP_BY_FIELDS}'
+        )
+    payload = {
+        'p_since': since_iso,
+        'p_until': until_iso,
+        'p_sources': list(sources or DEFAULT_SOURCES),
+        'p_group_by': list(group_by),
+    }
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+def accumulator_from_aggregate_row(row: dict[str, Any]) -> EvalMetricsAccumulator:
+    """Rebuild the local accumulator from one ``ai_eval_training_aggregate_v1`` row."""
+    accumulator = EvalMetricsAccumulator(**{name: int(row[name]) for name in _COUNT_COLUMNS})
+    values, counts = row['latency_values'] or [], row['latency_counts'] or []
+    accumulator.latency.update_counts(
+        (int(value), int(count)) for value, count in zip(values, counts, strict=True)
+    )
+    return accumulator
+
+
+def accumulate_aggregate_rows(
+    rows: Sequence[dict[str, Any]], group_by: Sequence[str] = ()
+) -> EvalMetricsAccumulator | GroupedEvalAccumulator:
+    """Fold aggregate rows into the accumulator ``build_eval_report`` would have built."""
+    if not group_by:
+        total = EvalMetricsAccumulator()
+        for row in rows:
+            total.merge(accumulator_from_aggregate_row(row))
+        return total
+    grouped = GroupedEvalAccumulator(tuple(group_by))
+    for row in rows:
+        key = tuple(row[name] for name in grouped.group_by)
+        partial = grouped.groups.get(key)
+        accumulator = accumulator_from_aggregate_row(row)
+        grouped.groups[key] = partial.merge(accumulator) if partial else accumulator
+    return grouped
+
+
+def fetch_eval_aggregate(
+    supabase_url: str,
+    service_role_key: str,
+    since_iso: str,
+    until_iso: str | None = None,
+    sources: Sequence[str] | None = None,
+    group_by: Sequence[str] = (),
+    timeout: float = 30.0,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+) -> EvalMetricsAccumulator | GroupedEvalAccumulator:
+    """Compute the eval accumulator for an export window server-side.
+
+    Calls the ``ai_eval_training_aggregate_v1`` RPC (migration template 0006), which applies
+    the same flag and latency fallbacks as ``row_to_eval_record_payload`` and returns counts
+    plus a latency histogram per group, so ``build_report`` on the result equals the
+    report over the exported rows without transferring them.
+    """
+    body = aggregate_rpc_body(since_iso, until_iso, sources, group_by)
+    headers = {
+        name: value for name, value in rest_headers(service_role_key).items() if name != 'Prefer'
+    }
+    with (
+        span('aggregate_pushdown.fetch') as stage,
+        HttpConnectionPool(supabase_url, max_connections=1, timeout=timeout) as pool,
+    ):
+        response, _ = send_with_retry(
+            pool, 'POST', AGGREGATE_RPC_PATH, body, headers, max_retries, backoff_seconds
+        )
+        rows = json.loads(response.body)
+        if not isinstance(rows, list):
+            raise ValueError('Aggregate RPC must return a JSON array of rows')
+        accumulator = accumulate_aggregate_rows(rows, group_by)
+        stage.add_rows(len(rows))
+    return accumulator
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .contracts import EvalThresholds
+from .ingest_sql import EvalIngestContext, build_eval_ingest_sql
+from .runner import build_eval_report, load_eval_records
+from .supabase_export import row_to_eval_record_payload, rows_to_eval_batch
+from .synthetic import SyntheticEvalConfig, iter_synthetic_training_rows, write_synthetic_eval_jsonl
+
+BASELINE_VERSION = 1
+DEFAULT_REGRESSION_TOLERANCE = 0.25
+BENCHMARK_STAGES = (
+    'row_to_eval_record_payload',
+    'rows_to_eval_batch',
+    'load_eval_records',
+    'build_eval_report',
+    'build_eval_ingest_sql',
+)
+_BENCHMARK_RUN_ID = '00000000-0000-4000-8000-000000000000'
+
+# Supabase rows are held in memory for the row-transform stage; larger tiers cycle this
+# many resident rows instead of materialising all of them.
+_RESIDENT_ROW_LIMIT = 500_000
+
+
+@dataclass(frozen=True, slots=True)
+class StageResult:
+    stage: str
+    rows: int
+    seconds: float
+    peak_memory_bytes: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'stage': self.stage,
+            'rows': self.rows,
+            'seconds': round(self.seconds, 6),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'peak_memory_bytes': self.peak_memory_bytes,
+        }
+
+
+def measure_stage(stage: str, rows: int, run: Callable[[], object], repeat: int = 3) -> StageResult:
+    """Best-of-``repeat`` wall time, then one extra run under tracemalloc for peak memory.
+
+    Timing runs disable the cyclic GC, as ``timeit`` does, so collection pauses triggered
+    by earlier stages do not leak into a stage's number. They are kept separate from the
+    memory run because tracemalloc slows allocation-heavy code several fold. Peak memory
+    counts only allocations made while ``run`` executes.
+    """
+    if repeat <= 0:
+        raise ValueError('repeat must be > 0')
+    best = float('inf')
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+            gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return StageResult(stage=stage, rows=rows, seconds=best, peak_memory_bytes=peak)
+
+
+def _config_digest(config: SyntheticEvalConfig) -> str:
+    return hashlib.sha256(repr(config).encode('utf-8')).hexdigest()[:12]
+
+
+def synthetic_dataset_path(workdir: Path, rows: int, config: SyntheticEvalConfig) -> Path:
+    return workdir / f'synthetic-eval-{rows}-{_config_digest(config)}.jsonl'
+
+
+def run_eval_benchmarks(
+    rows: int,
+    workdir: Path,
+    config: SyntheticEvalConfig | None = None,
+    repeat: int = 3,
+    stages: Iterable[str] = BENCHMARK_STAGES,
+) -> list[StageResult]:
+    """Benchmark each pipeline stage over ``rows`` synthetic records.
+
+    The eval JSONL is generated once per (rows, config) under ``workdir`` and reused by
+    later runs.
+    """
+    config = config or SyntheticEvalConfig()
+    selected = set(stages)
+    unknown = selected - set(BENCHMARK_STAGES)
+    if unknown:
+        raise ValueError(f'Unknown benchmark stages: {sorted(unknown)}')
+    results: list[StageResult] = []
+
+    if selected & {'row_to_eval_record_payload', 'rows_to_eval_batch'}:
+        resident_rows = list(iter_synthetic_training_rows(min(rows, _RESIDENT_ROW_LIMIT), config))
+
+        def transform_rows() -> None:
+            remaining = rows
+            while remaining > 0:
+                for row in resident_rows[:remaining]:
+                    row_to_eval_record_payload(row)
+                remaining -= len(resident_rows)
+
+        def batch_rows() -> None:
+            remaining = rows
+            while remaining > 0:
+                rows_to_eval_batch(resident_rows[:remaining])
+                remaining -= len(resident_rows)
+
+        if 'row_to_eval_record_payload' in selected:
+            results.append(
+                measure_stage('row_to_eval_record_payload', rows, transform_rows, repeat)
+            )
+        if 'rows_to_eval_batch' in selected:
+            results.append(measure_stage('rows_to_eval_batch', rows, batch_rows, repeat))
+        del resident_rows
+
+    if not selected & {'load_eval_records', 'build_eval_report', 'build_eval_ingest_sql'}:
+        return results
+
+    dataset_path = synthetic_dataset_path(workdir, rows, config)
+    if not dataset_path.exists():
+        partial_path = dataset_path.with_suffix('.partial')
+        write_synthetic_eval_jsonl(partial_path, rows, config)
+        partial_path.replace(dataset_path)
+
+    if 'load_eval_records' in selected:
+        results.append(
+            measure_stage(
+                'load_eval_records', rows, lambda: load_eval_records(dataset_path), repeat
+            )
+        )
+    records = load_eval_records(dataset_path)
+    thresholds = EvalThresholds()
+    if 'build_eval_report' in selected:
+        results.append(
+            measure_stage(
+                'build_eval_report',
+                rows,
+                lambda: build_eval_report(records, thresholds=thresholds),
+                repeat,
+            )
+        )
+    if 'build_eval_ingest_sql' in selected:
+        report = build_eval_report(records, thresholds=thresholds)
+        context = EvalIngestContext(dataset_ref=str(dataset_path))
+        results.append(
+            measure_stage(
+                'build_eval_ingest_sql',
+                rows,
+                lambda: build_eval_ingest_sql(
+                    records, thresholds, context, report=report, run_id=_BENCHMARK_RUN_ID
+                ),
+                repeat,
+            )
+        )
+    return results
+
+
+def build_benchmark_baseline(
+    results: Iterable[StageResult],
+    tolerance: float = DEFAULT_REGRESSION_TOLERANCE,
+    previous: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Baseline payload keyed by row count, merged over ``previous`` tiers."""
+    tiers: dict[str, dict[str, Any]] = {
+        tier: dict(stages) for tier, stages in (previous or {}).get('results', {}).items()
+    }
+    for result in results:
+        tiers.setdefault(str(result.rows), {})[result.stage] = {
+            'rows_per_second': round(result.rows_per_second, 1),
+            'peak_memory_bytes': result.peak_memory_bytes,
+        }
+    return {
+        'version': BASELINE_VERSION,
+        'tolerance': tolerance,
+        'results': {tier: tiers[tier] for tier in sorted(tiers, key=int)},
+    }
+
+
+def load_benchmark_baseline(path: Path) -> dict[str, Any]:
+    with path.open('r', encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    if not isinstance(baseline, dict) or baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f'Unsupported benchmark baseline: {path}')
+    return baseline
+
+
+def compare_to_baseline(
+    results: Iterable[StageResult],
+    baseline: dict[str, Any],
+    tolerance: float | None = None,
+) -> list[str]:
+    """Return one message per stage whose throughput dropped or peak memory grew by more
+    than ``tolerance`` (a fraction of the baseline), or that is missing from a row tier the
+    baseline records. Row tiers the baseline has no entry for are skipped.
+    """
+    allowed = float(baseline.get('tolerance', DEFAULT_REGRESSION_TOLERANCE))
+    if tolerance is not None:
+        allowed = tolerance
+    regressions: list[str] = []
+    for result in results:
+        tier = baseline.get('results', {}).get(str(result.rows))
+        if tier is None:
+            continue
+        expected = tier.get(result.stage)
+        if not expected:
+            regressions.append(
+                f'{result.stage}@{result.rows}: no baseline entry; re-record the baseline with '
+                '--update-baseline'
+            )
+            continue
+        baseline_throughput = float(expected['rows_per_second'])
+        if result.rows_per_second < baseline_throughput * (1 - allowed):
+            regressions.append(
+                f'{result.stage}@{result.rows}: throughput {result.rows_per_second:,.0f} rows/s '
+                f'is below baseline {baseline_throughput:,.0f} rows/s by more than {allowed:.0%}'
+            )
+        baseline_memory = int(expected['peak_memory_bytes'])
+        if result.peak_memory_bytes > baseline_memory * (1 + allowed):
+            regressions.append(
+                f'{result.stage}@{result.rows}: peak memory {result.peak_memory_bytes:,} B '
+                f'exceeds baseline {baseline_memory:,} B by more than {allowed:.0%}'
+            )
+    return regressions
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .compressed_io import compression_for, open_binary
+from .contracts import EvalRecord
+from .rolling_export import RollingDataset, source_filter_key
+from .runner import EvalMetricsAccumulator, GroupedEvalAccumulator
+
+CHECKPOINT_VERSION = 2
+SEGMENT_CHECKPOINT_VERSION = 1
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+class CheckpointError(ValueError):
+    """Raised when a persisted eval checkpoint is unreadable or fails its checksum."""
+
+
+@dataclass(frozen=True, slots=True)
+class EvalCheckpoint:
+    """Aggregate state of every input byte before ``input_offset``.
+
+    ``prefix_digest`` hashes the whole consumed prefix, so any rewrite of it is detected.
+    Checking it re-reads the prefix but does not parse it.
+    """
+
+    input_path: str
+    input_offset: int
+    input_line_count: int
+    prefix_digest: str
+    state: dict[str, Any]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'version': CHECKPOINT_VERSION,
+            'input_path': self.input_path,
+            'input_offset': self.input_offset,
+            'input_line_count': self.input_line_count,
+            'prefix_digest': self.prefix_digest,
+            'state': self.state,
+        }
+
+    def accumulator(self) -> EvalMetricsAccumulator | GroupedEvalAccumulator:
+        return _accumulator_from_state(self.state)
+
+
+def _accumulator_from_state(
+    state: dict[str, Any],
+) -> EvalMetricsAccumulator | GroupedEvalAccumulator:
+    if 'group_by' in state:
+        return GroupedEvalAccumulator.from_dict(state)
+    return EvalMetricsAccumulator.from_dict(state)
+
+
+def _new_accumulator(group_by: tuple[str, ...]) -> EvalMetricsAccumulator | GroupedEvalAccumulator:
+    return GroupedEvalAccumulator(group_by) if group_by else EvalMetricsAccumulator()
+
+
+@dataclass(frozen=True, slots=True)
+class IncrementalEvalResult:
+    accumulator: EvalMetricsAccumulator | GroupedEvalAccumulator
+    mode: str
+    new_record_count: int
+    rebuild_reason: str | None = None
+    input_offset: int | None = None
+    reused_segments: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            'mode': self.mode,
+            'new_record_count': self.new_record_count,
+            'rebuild_reason': self.rebuild_reason,
+        }
+        if self.input_offset is not None:
+            payload['input_offset'] = self.input_offset
+        if self.reused_segments is not None:
+            payload['reused_segments'] = self.reused_segments
+        return payload
+
+
+def checkpoint_path_for(report_path: Path) -> Path:
+    return report_path.with_suffix('.checkpoint.json')
+
+
+def _canonical_json(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True)
+
+
+def save_eval_checkpoint(path: Path, checkpoint: EvalCheckpoint) -> None:
+    _save_checked(path, checkpoint.as_dict())
+
+
+def _save_checked(path: Path, body: dict[str, Any]) -> None:
+    document = {
+        'checksum': hashlib.sha256(_canonical_json(body).encode('utf-8')).hexdigest(),
+        'checkpoint': body,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as handle:
+            json.dump(document, handle, separators=(',', ':'))
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _load_checked(path: Path, version: int) -> dict[str, Any]:
+    try:
+        document = json.loads(path.read_text(encoding='utf-8'))
+        body = document['checkpoint']
+        checksum = document['checksum']
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        raise CheckpointError(f'Unreadable eval checkpoint: {path}') from error
+    if hashlib.sha256(_canonical_json(body).encode('utf-8')).hexdigest() != checksum:
+        raise CheckpointError(f'Eval checkpoint checksum mismatch: {path}')
+    if body.get('version') != version:
+        raise CheckpointError(f'Unsupported eval checkpoint version in {path}')
+    return body
+
+
+def load_eval_checkpoint(path: Path) -> EvalCheckpoint:
+    body = _load_checked(path, CHECKPOINT_VERSION)
+    try:
+        return EvalCheckpoint(
+            input_path=str(body['input_path']),
+            input_offset=int(body['input_offset']),
+            input_line_count=int(body['input_line_count']),
+            prefix_digest=str(body['prefix_digest']),
+            state=dict(body['state']),
+        )
+    except (KeyError, TypeError, ValueError) as error:
+        raise CheckpointError(f'Malformed eval checkpoint: {path}') from error
+
+
+def _fold_records_from(
+    path: Path,
+    accumulator: EvalMetricsAccumulator | GroupedEvalAccumulator,
+    offset: int = 0,
+    line_count: int = 0,
+    prefix_digest: str | None = None,
+) -> tuple[int, int, int, str] | None:
+    """Add records after ``offset`` if the bytes before it hash to ``prefix_digest``.
+
+    Returns the new offset, line count, record count and prefix digest, or ``None`` when
+    the prefix changed. The prefix is hashed in the same pass that reads the new lines.
+    """
+    digest = hashlib.sha256()
+    record_count = 0
+    add = accumulator.add
+    with open_binary(path) as handle:
+        # Offsets count decompressed bytes, so compressed input is hashed as it decompresses.
+        remaining = offset
+        while remaining:
+            block = handle.read(min(remaining, _HASH_BLOCK_BYTES))
+            if not block:
+                return None
+            digest.update(block)
+            remaining -= len(block)
+        if prefix_digest is not None and digest.hexdigest() != prefix_digest:
+            return None
+        for raw_line in handle:
+            digest.update(raw_line)
+            line_count += 1
+            offset += len(raw_line)
+            line = raw_line.decode('utf-8').strip()
+            if not line:
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f'Invalid JSONL at line {line_count} in {path}') from error
+            if not isinstance(payload, dict):
+                raise ValueError(f'Each JSONL line must be an object (line {line_count} in {path})')
+            add(EvalRecord.from_dict(payload))
+            record_count += 1
+    return offset, line_count, record_count, digest.hexdigest()
+
+
+def _validate_checkpoint(
+    checkpoint: EvalCheckpoint, input_path: Path, group_by: tuple[str, ...]
+) -> str | None:
+    if checkpoint.input_path != str(input_path.resolve()):
+        return 'input path changed'
+    if compression_for(input_path) is None and input_path.stat().st_size < checkpoint.input_offset:
+        return 'input shrank below checkpoint offset'
+    checkpoint_group_by = tuple(checkpoint.state.get('group_by', ()))
+    if checkpoint_group_by != group_by:
+        return 'group_by changed'
+    return None
+
+
+def run_incremental_eval(
+    input_path: Path,
+    checkpoint_path: Path,
+    group_by: Sequence[str] = (),
+    full_rebuild: bool = False,
+) -> IncrementalEvalResult:
+    """Fold only records appended since the last checkpoint, then persist a new one.
+
+    Only saves work on append-only JSONL: the consumed prefix is re-hashed every run, and
+    any checkpoint problem (missing, corrupt, different input, changed prefix, different
+    ``group_by``) falls back to a full recompute, so the result equals a fresh
+    ``build_eval_report`` over the file. For an export rewritten every night, use
+    ``run_incremental_segment_eval`` on its ``RollingDataset`` instead.
+    """
+    if not input_path.exists():
+        raise FileNotFoundError(f'Input file not found: {input_path}')
+    group_by = tuple(group_by)
+
+    rebuild_reason: str | None = 'forced full rebuild' if full_rebuild else None
+    checkpoint: EvalCheckpoint | None = None
+    if rebuild_reason is None:
+        if not checkpoint_path.exists():
+            rebuild_reason = 'no checkpoint'
+        else:
+            try:
+                checkpoint = load_eval_checkpoint(checkpoint_path)
+                rebuild_reason = _validate_checkpoint(checkpoint, input_path, group_by)
+            except CheckpointError as error:
+                rebuild_reason = str(error)
+
+    folded: tuple[int, int, int, str] | None = None
+    if checkpoint is not None and rebuild_reason is None:
+        try:
+            accumulator = checkpoint.accumulator()
+        except (KeyError, TypeError, ValueError):
+            rebuild_reason = 'checkpoint state is malformed'
+        else:
+            folded = _fold_records_from(
+                input_path,
+                accumulator,
+                checkpoint.input_offset,
+                checkpoint.input_line_count,
+                checkpoint.prefix_digest,
+            )
+            if folded is None:
+                rebuild_reason = 'input prefix changed'
+    if folded is None:
+        accumulator = _new_accumulator(group_by)
+        folded = _fold_records_from(input_path, accumulator)
+        if folded is None:
+            raise AssertionError('an empty prefix always matches')
+
+    offset, line_count, new_record_count, prefix_digest = folded
+    save_eval_checkpoint(
+        checkpoint_path,
+        EvalCheckpoint(
+            input_path=str(input_path.resolve()),
+            input_offset=offset,
+            input_line_count=line_count,
+            prefix_digest=prefix_digest,
+            state=accumulator.as_dict(),
+        ),
+    )
+    return IncrementalEvalResult(
+        accumulator=accumulator,
+        mode='full' if rebuild_reason is not None else 'incremental',
+        new_record_count=new_record_count,
+        rebuild_reason=rebuild_reason,
+        input_offset=offset,
+    )
+
+
+def _load_segment_states(
+    checkpoint_path: Path, dataset_dir: Path, source_key: str, group_by: tuple[str, ...]
+) -> tuple[dict[str, dict[str, Any]], str | None]:
+    """Per-segment accumulator states from a segment checkpoint, or a rebuild reason."""
+    if not checkpoint_path.exists():
+        return {}, 'no checkpoint'
+    try:
+        body = _load_checked(checkpoint_path, SEGMENT_CHECKPOINT_VERSION)
+    except CheckpointError as error:
+        return {}, str(error)
+    try:
+        if body['dataset'] != str(dataset_dir.resolve()) or body['source_key'] != source_key:
+            return {}, 'input dataset changed'
+        if tuple(body['group_by']) != group_by:
+            return {}, 'group_by changed'
+        return {str(name): dict(state) for name, state in body['segments'].items()}, None
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return {}, 'checkpoint state is malformed'
+
+
+def run_incremental_segment_eval(
+    dataset_dir: Path,
+    checkpoint_path: Path,
+    sources: Sequence[str],
+    group_by: Sequence[str] = (),
+    full_rebuild: bool = False,
+) -> IncrementalEvalResult:
+    """Report over a ``RollingDataset`` (``export_eval_records_from_supabase.py --state-dir``),
+    parsing only segments not seen by the last run.
+
+    Segments are immutable once committed, so the checkpoint keeps one accumulator state
+    per segment name. Partials of segments since dropped or merged by ``compact`` are
+    discarded, so the report always covers exactly the retained segments, i.e. the rows
+    ``write_combined`` would write, however the export window slides.
+    """
+    if not dataset_dir.is_dir():
+        raise FileNotFoundError(f'Dataset directory not found: {dataset_dir}')
+    group_by = tuple(group_by)
+    dataset = RollingDataset(dataset_dir)
+    source_key = source_filter_key(sources)
+
+    states: dict[str, dict[str, Any]] = {}
+    rebuild_reason: str | None = 'forced full rebuild' if full_rebuild else None
+    if rebuild_reason is None:
+        states, rebuild_reason = _load_segment_states(
+            checkpoint_path, dataset_dir, source_key, group_by
+        )
+
+    total = _new_accumulator(group_by)
+    retained: dict[str, dict[str, Any]] = {}
+    new_record_count = reused = 0
+    for segment in dataset.segments_for(sources):
+        state = states.get(segment.name)
+        partial: EvalMetricsAccumulator | GroupedEvalAccumulator | None = None
+        if state is not None:
+            try:
+                partial = _accumulator_from_state(state)
+            except (KeyError, TypeError, ValueError):
+                rebuild_reason = rebuild_reason or 'checkpoint state is malformed'
+        if partial is None:
+            partial = _new_accumulator(group_by)
+            folded = _fold_records_from(dataset.segment_path(segment), partial)
+            if folded is None:
+                raise AssertionError('an empty prefix always matches')
+            new_record_count += folded[2]
+            state = partial.as_dict()
+        else:
+            reused += 1
+        retained[segment.name] = state
+        total.merge(partial)  # type: ignore[arg-type]
+
+    _save_checked(
+        checkpoint_path,
+        {
+            'version': SEGMENT_CHECKPOINT_VERSION,
+            'dataset': str(dataset_dir.resolve()),
+            'source_key': source_key,
+            'group_by': list(group_by),
+            'segments': retained,
+        },
+    )
+    return IncrementalEvalResult(
+        accumulator=total,
+        mode='full' if rebuild_reason is not None else 'incremental',
+        new_record_count=new_record_count,
+        rebuild_reason=rebuild_reason,
+        reused_segments=reused,
+    )
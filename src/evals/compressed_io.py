@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import gzip
+import io
+import os
+from pathlib import Path
+from typing import IO, Any
+
+# Compression is picked by the final suffix, so ``records.jsonl.gz`` is gzip-compressed JSONL.
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def compression_for(path: Path) -> str | None:
+    return COMPRESSION_SUFFIXES.get(path.suffix.lower())
+
+
+def _zstd_module() -> Any:
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as error:
+        raise RuntimeError(
+            'Reading or writing .zst files requires Python 3.14+ or the zstandard package'
+        ) from error
+    return zstandard
+
+
+def zstd_available() -> bool:
+    try:
+        _zstd_module()
+    except RuntimeError:
+        return False
+    return True
+
+
+def open_binary(path: Path, mode: str = 'rb') -> IO[bytes]:
+    """Open ``path`` for streaming binary I/O, (de)compressing by its suffix.
+
+    ``mode`` is ``'rb'`` or ``'wb'``. Data is (de)compressed incrementally as it is read or
+    written, so nothing is held in memory beyond the caller's buffers.
+    """
+    compression = compression_for(path)
+    if compression == 'gzip':
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL)  # type: ignore[return-value]
+    if compression == 'zstd':
+        zstd = _zstd_module()
+        if zstd.__name__ != 'zstandard':
+            return zstd.open(path, mode, level=None if mode == 'rb' else ZSTD_LEVEL)
+        if mode == 'rb':
+            # Read every concatenated frame, like the zstd CLI; buffering adds readline and
+            # iteration, which zstandard's reader lacks.
+            reader = zstd.ZstdDecompressor().stream_reader(
+                path.open('rb'), read_across_frames=True, closefd=True
+            )
+            return io.BufferedReader(reader)
+        return zstd.open(path, mode, cctx=zstd.ZstdCompressor(level=ZSTD_LEVEL))
+    return path.open(mode)
+
+
+def skip_bytes(handle: IO[bytes], count: int) -> None:
+    """Advance a reader by ``count`` bytes, reading and discarding them if it cannot seek."""
+    if handle.seekable():
+        handle.seek(count, os.SEEK_CUR)
+        return
+    while count > 0:
+        skipped = len(handle.read(min(count, 1024 * 1024)))
+        if not skipped:
+            return
+        count -= skipped
+
+
+def open_text(path: Path, mode: str = 'r') -> IO[str]:
+    """UTF-8 text counterpart of ``open_binary``; ``mode`` is ``'r'`` or ``'w'``."""
+    if compression_for(path) is None:
+        return path.open(mode, encoding='utf-8')
+    return io.TextIOWrapper(open_binary(path, mode + 'b'), encoding='utf-8')
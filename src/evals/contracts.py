@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import compress
 from typing import Any
 
 
@@ -27,51 +31,282 @@ class EvalRecord:
 
     @staticmethod
     def from_dict(payload: dict[str, Any]) -> EvalRecord:
+        return _decode_eval_record(payload)
+
+    @staticmethod
+    def from_dicts(payloads: Iterable[dict[str, Any]]) -> list[EvalRecord]:
+        decode = _decode_eval_record
+        return [decode(payload) for payload in payloads]
+
+
+def _optional_str(value: Any) -> str | None:
+    return value if value is None or type(value) is str else str(value)
+
+
+# ``latency_ms`` is a signed 64-bit column in batches, the cache and Postgres.
+_LATENCY_MIN = -(1 << 63)
+_LATENCY_MAX = (1 << 63) - 1
+
+
+def coerce_latency_ms(value: Any) -> int | None:
+    """``value`` as whole milliseconds, truncating fractions like ``int()``; ``None`` when it
+    is missing, non-numeric, non-finite or outside the signed 64-bit range."""
+    if type(value) is int:
+        return value if _LATENCY_MIN <= value <= _LATENCY_MAX else None
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            value = int(text)
+        except ValueError:
+            try:
+                value = float(text)
+            except ValueError:
+                return None
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        value = int(value)
+    if isinstance(value, int):
+        return int(value) if _LATENCY_MIN <= value <= _LATENCY_MAX else None
+    return None
+
+
+def _decode_eval_record(payload: dict[str, Any]) -> EvalRecord:
+    """``EvalRecord.from_dict``: one ``payload.get`` per key, and ``str()`` only when the
+    JSON value is not already a string. ``record_id`` falls back to ``id`` then
+    ``'unknown'``, flags are ``bool()``-coerced, ``latency_ms`` goes through
+    ``coerce_latency_ms`` and missing optional fields stay ``None``."""
+    get = payload.get
+    record_id = get('record_id') or get('id') or 'unknown'
+    latency_ms = get('latency_ms')
+    return EvalRecord(
+        record_id=record_id if type(record_id) is str else str(record_id),
+        schema_valid=bool(get('schema_valid')),
+        patch_apply_success=bool(get('patch_apply_success')),
+        edited_after_generate=bool(get('edited_after_generate')),
+        published_within_7d=bool(get('published_within_7d')),
+        safety_html_tailwind_compliant=bool(get('safety_html_tailwind_compliant')),
+        fallback_used=bool(get('fallback_used')),
+        latency_ms=latency_ms if latency_ms is None else coerce_latency_ms(latency_ms),
+        requested_provider=_optional_str(get('requested_provider')),
+        selected_provider=_optional_str(get('selected_provider')),
+        route_strategy=_optional_str(get('route_strategy')),
+        request_id=_optional_str(get('request_id')),
+        tenant_id=_optional_str(get('tenant_id')),
+        route_id=_optional_str(get('route_id')),
+        model_id=_optional_str(get('model_id')),
+        model_version_id=_optional_str(get('model_version_id')),
+    )
+
+
+_COUNT_CHUNK_BYTES = 1 << 20
+
+
+def count_true(column: bytes | bytearray | memoryview) -> int:
+    """Count set rows in a 0/1 flag column, including read-only mapped columns."""
+    if not isinstance(column, memoryview):
+        return column.count(1)
+    # memoryview has no count(); copy bounded slices so mapped columns stay mapped.
+    return sum(
+        column[start : start + _COUNT_CHUNK_BYTES].tobytes().count(1)
+        for start in range(0, len(column), _COUNT_CHUNK_BYTES)
+    )
+
+
+@dataclass(slots=True)
+class DictionaryColumn:
+    """Dictionary-encoded string column: one ``codes`` entry per row indexing ``values``."""
+
+    codes: array = field(default_factory=lambda: array('I'))
+    values: list[str | None] = field(default_factory=list)
+    _index: dict[str | None, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self._index:
+            self._index = {value: code for code, value in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> str | None:
+        return self.values[self.codes[row]]
+
+    def __iter__(self) -> Iterator[str | None]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def slice(self, start: int, stop: int) -> DictionaryColumn:
+        return DictionaryColumn(codes=self.codes[start:stop], values=list(self.values))
+
+    def append(self, value: str | None) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def extend_column(self, other: DictionaryColumn) -> None:
+        """Append ``other``'s rows, re-coding its values into this column's dictionary."""
+        remap = array('I')
+        for value in other.values:
+            code = self._index.get(value)
+            if code is None:
+                code = len(self.values)
+                self._index[value] = code
+                self.values.append(value)
+            remap.append(code)
+        if remap == array('I', range(len(remap))):
+            self.codes.extend(other.codes)
+        else:
+            self.codes.extend(remap[code] for code in other.codes)
+
+
+@dataclass(slots=True)
+class EvalRecordBatch:
+    """Columnar view of eval records for vectorized metric computation.
+
+    Flags are stored as one byte per row (0/1), ``latency_ms`` as a signed 64-bit array
+    with a parallel ``latency_mask`` marking rows that carry a latency, and the low
+    cardinality provider/route/tenant/model columns are dictionary-encoded. Every
+    column supports the buffer protocol, so ``numpy.frombuffer`` can wrap it without
+    copying when NumPy is available.
+    """
+
+    record_ids: list[str] = field(default_factory=list)
+    request_ids: list[str | None] = field(default_factory=list)
+    schema_valid: bytearray = field(default_factory=bytearray)
+    patch_apply_success: bytearray = field(default_factory=bytearray)
+    edited_after_generate: bytearray = field(default_factory=bytearray)
+    published_within_7d: bytearray = field(default_factory=bytearray)
+    safety_html_tailwind_compliant: bytearray = field(default_factory=bytearray)
+    fallback_used: bytearray = field(default_factory=bytearray)
+    latency_ms: array = field(default_factory=lambda: array('q'))
+    latency_mask: bytearray = field(default_factory=bytearray)
+    requested_provider: DictionaryColumn = field(default_factory=DictionaryColumn)
+    selected_provider: DictionaryColumn = field(default_factory=DictionaryColumn)
+    route_strategy: DictionaryColumn = field(default_factory=DictionaryColumn)
+    tenant_id: DictionaryColumn = field(default_factory=DictionaryColumn)
+    route_id: DictionaryColumn = field(default_factory=DictionaryColumn)
+    model_id: DictionaryColumn = field(default_factory=DictionaryColumn)
+    model_version_id: DictionaryColumn = field(default_factory=DictionaryColumn)
+
+    @staticmethod
+    def from_records(records: Iterable[EvalRecord]) -> EvalRecordBatch:
+        batch = EvalRecordBatch()
+        batch.extend(records)
+        return batch
+
+    @staticmethod
+    def concat(batches: Iterable[EvalRecordBatch]) -> EvalRecordBatch:
+        batch = EvalRecordBatch()
+        for other in batches:
+            batch.extend_batch(other)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.record_ids)
+
+    def __iter__(self) -> Iterator[EvalRecord]:
+        return (self.record_at(row) for row in range(len(self)))
+
+    def append(self, record: EvalRecord) -> None:
+        self.record_ids.append(record.record_id)
+        self.request_ids.append(record.request_id)
+        self.schema_valid.append(record.schema_valid)
+        self.patch_apply_success.append(record.patch_apply_success)
+        self.edited_after_generate.append(record.edited_after_generate)
+        self.published_within_7d.append(record.published_within_7d)
+        self.safety_html_tailwind_compliant.append(record.safety_html_tailwind_compliant)
+        self.fallback_used.append(record.fallback_used)
+        # A latency the int64 column cannot hold is stored as missing rather than raising.
+        latency = record.latency_ms
+        if latency is not None:
+            latency = coerce_latency_ms(latency)
+        if latency is None:
+            self.latency_ms.append(0)
+            self.latency_mask.append(0)
+        else:
+            self.latency_ms.append(latency)
+            self.latency_mask.append(1)
+        self.requested_provider.append(record.requested_provider)
+        self.selected_provider.append(record.selected_provider)
+        self.route_strategy.append(record.route_strategy)
+        self.tenant_id.append(record.tenant_id)
+        self.route_id.append(record.route_id)
+        self.model_id.append(record.model_id)
+        self.model_version_id.append(record.model_version_id)
+
+    def extend(self, records: Iterable[EvalRecord]) -> None:
+        append = self.append
+        for record in records:
+            append(record)
+
+    def extend_batch(self, other: EvalRecordBatch) -> None:
+        """Append ``other``'s rows column by column, without materializing records."""
+        self.record_ids.extend(other.record_ids)
+        self.request_ids.extend(other.request_ids)
+        self.schema_valid.extend(other.schema_valid)
+        self.patch_apply_success.extend(other.patch_apply_success)
+        self.edited_after_generate.extend(other.edited_after_generate)
+        self.published_within_7d.extend(other.published_within_7d)
+        self.safety_html_tailwind_compliant.extend(other.safety_html_tailwind_compliant)
+        self.fallback_used.extend(other.fallback_used)
+        self.latency_ms.extend(other.latency_ms)
+        self.latency_mask.extend(other.latency_mask)
+        self.requested_provider.extend_column(other.requested_provider)
+        self.selected_provider.extend_column(other.selected_provider)
+        self.route_strategy.extend_column(other.route_strategy)
+        self.tenant_id.extend_column(other.tenant_id)
+        self.route_id.extend_column(other.route_id)
+        self.model_id.extend_column(other.model_id)
+        self.model_version_id.extend_column(other.model_version_id)
+
+    def slice(self, start: int, stop: int) -> EvalRecordBatch:
+        """Rows ``[start, stop)`` as a new batch (e.g. to ship one shard to a worker)."""
+        return EvalRecordBatch(
+            record_ids=self.record_ids[start:stop],
+            request_ids=self.request_ids[start:stop],
+            schema_valid=self.schema_valid[start:stop],
+            patch_apply_success=self.patch_apply_success[start:stop],
+            edited_after_generate=self.edited_after_generate[start:stop],
+            published_within_7d=self.published_within_7d[start:stop],
+            safety_html_tailwind_compliant=self.safety_html_tailwind_compliant[start:stop],
+            fallback_used=self.fallback_used[start:stop],
+            latency_ms=self.latency_ms[start:stop],
+            latency_mask=self.latency_mask[start:stop],
+            requested_provider=self.requested_provider.slice(start, stop),
+            selected_provider=self.selected_provider.slice(start, stop),
+            route_strategy=self.route_strategy.slice(start, stop),
+            tenant_id=self.tenant_id.slice(start, stop),
+            route_id=self.route_id.slice(start, stop),
+            model_id=self.model_id.slice(start, stop),
+            model_version_id=self.model_version_id.slice(start, stop),
+        )
+
+    def record_at(self, row: int) -> EvalRecord:
         return EvalRecord(
-            record_id=str(payload.get('record_id') or payload.get('id') or 'unknown'),
-            schema_valid=bool(payload.get('schema_valid')),
-            patch_apply_success=bool(payload.get('patch_apply_success')),
-            edited_after_generate=bool(payload.get('edited_after_generate')),
-            published_within_7d=bool(payload.get('published_within_7d')),
-            safety_html_tailwind_compliant=bool(payload.get('safety_html_tailwind_compliant')),
-            fallback_used=bool(payload.get('fallback_used', False)),
-            latency_ms=(
-                int(payload['latency_ms']) if payload.get('latency_ms') is not None else None
-            ),
-            requested_provider=(
-                str(payload.get('requested_provider'))
-                if payload.get('requested_provider') is not None
-                else None
-            ),
-            selected_provider=(
-                str(payload.get('selected_provider'))
-                if payload.get('selected_provider') is not None
-                else None
-            ),
-            route_strategy=(
-                str(payload.get('route_strategy'))
-                if payload.get('route_strategy') is not None
-                else None
-            ),
-            request_id=(
-                str(payload.get('request_id')) if payload.get('request_id') is not None else None
-            ),
-            tenant_id=(
-                str(payload.get('tenant_id')) if payload.get('tenant_id') is not None else None
-            ),
-            route_id=(
-                str(payload.get('route_id')) if payload.get('route_id') is not None else None
-            ),
-            model_id=(
-                str(payload.get('model_id')) if payload.get('model_id') is not None else None
-            ),
-            model_version_id=(
-                str(payload.get('model_version_id'))
-                if payload.get('model_version_id') is not None
-                else None
-            ),
+            record_id=self.record_ids[row],
+            schema_valid=bool(self.schema_valid[row]),
+            patch_apply_success=bool(self.patch_apply_success[row]),
+            edited_after_generate=bool(self.edited_after_generate[row]),
+            published_within_7d=bool(self.published_within_7d[row]),
+            safety_html_tailwind_compliant=bool(self.safety_html_tailwind_compliant[row]),
+            fallback_used=bool(self.fallback_used[row]),
+            latency_ms=self.latency_ms[row] if self.latency_mask[row] else None,
+            requested_provider=self.requested_provider[row],
+            selected_provider=self.selected_provider[row],
+            route_strategy=self.route_strategy[row],
+            request_id=self.request_ids[row],
+            tenant_id=self.tenant_id[row],
+            route_id=self.route_id[row],
+            model_id=self.model_id[row],
+            model_version_id=self.model_version_id[row],
         )
 
+    def valid_latencies(self) -> list[int]:
+        return [value for value in compress(self.latency_ms, self.latency_mask) if value >= 0]
+
 
 @dataclass(frozen=True, slots=True)
 class EvalThresholds:
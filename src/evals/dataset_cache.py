@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, overload
+
+from .contracts import DictionaryColumn, EvalRecordBatch
+from .runner import load_eval_batch
+
+CACHE_FORMAT_VERSION = 1
+CACHE_SUFFIX = '.evalcache'
+DEFAULT_CACHE_MAX_ENTRIES = 8
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+_MAGIC = b'SCEVALC1'
+_PREAMBLE = struct.Struct('<8sQ')
+_ALIGNMENT = 8
+_FLAG_COLUMNS = (
+    'schema_valid',
+    'patch_apply_success',
+    'edited_after_generate',
+    'published_within_7d',
+    'safety_html_tailwind_compliant',
+    'fallback_used',
+    'latency_mask',
+)
+_DICTIONARY_COLUMNS = (
+    'requested_provider',
+    'selected_provider',
+    'route_strategy',
+    'tenant_id',
+    'route_id',
+    'model_id',
+    'model_version_id',
+)
+
+
+class UncacheableInputError(ValueError):
+    """Raised when an input holds values the columnar cache cannot encode, such as more
+    distinct strings in a column than its 32-bit dictionary codes can index."""
+
+
+class _MappedStringColumn(Sequence[str | None]):
+    """Read-only string column over a memory-mapped offsets array and UTF-8 blob."""
+
+    __slots__ = ('_offsets', '_data', '_mask')
+
+    def __init__(self, offsets: memoryview, data: memoryview, mask: memoryview | None) -> None:
+        self._offsets = offsets
+        self._data = data
+        self._mask = mask
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, row: int) -> str | None: ...
+
+    @overload
+    def __getitem__(self, row: slice) -> list[str | None]: ...
+
+    def __getitem__(self, row: int | slice) -> str | None | list[str | None]:
+        if isinstance(row, slice):
+            return [self[index] for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError('string column index out of range')
+        if self._mask is not None and not self._mask[row]:
+            return None
+        return str(self._data[self._offsets[row] : self._offsets[row + 1]], 'utf-8')
+
+
+def cache_path_for(path: Path, cache_dir: Path) -> Path:
+    """Cache entries are keyed by the input's resolved path, size and mtime."""
+    stat = path.stat()
+    key = f'{path.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}'
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]
+    return cache_dir / f'{path.name}-{digest}{CACHE_SUFFIX}'
+
+
+def _source_fingerprint(path: Path) -> dict[str, Any]:
+    stat = path.stat()
+    return {'path': str(path.resolve()), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _encode_strings(values: Sequence[str | None]) -> tuple[array, bytes, bytearray]:
+    offsets = array('Q', [0])
+    mask = bytearray()
+    chunks: list[bytes] = []
+    position = 0
+    for value in values:
+        if value is None:
+            mask.append(0)
+        else:
+            encoded = value.encode('utf-8')
+            chunks.append(encoded)
+            position += len(encoded)
+            mask.append(1)
+        offsets.append(position)
+    return offsets, b''.join(chunks), mask
+
+
+def write_batch_cache(batch: EvalRecordBatch, cache_path: Path, source: dict[str, Any]) -> Path:
+    segments: list[tuple[str, str, bytes | bytearray | array | memoryview]] = []
+    for name in _FLAG_COLUMNS:
+        segments.append((name, 'B', getattr(batch, name)))
+    segments.append(('latency_ms', 'q', batch.latency_ms))
+    dictionaries: dict[str, list[str | None]] = {}
+    for name in _DICTIONARY_COLUMNS:
+        column: DictionaryColumn = getattr(batch, name)
+        segments.append((f'{name}.codes', 'I', column.codes))
+        dictionaries[name] = list(column.values)
+    for name, values in (('record_ids', batch.record_ids), ('request_ids', batch.request_ids)):
+        offsets, data, mask = _encode_strings(values)
+        segments.append((f'{name}.offsets', 'Q', offsets))
+        segments.append((f'{name}.data', 'B', data))
+        segments.append((f'{name}.mask', 'B', mask))
+
+    columns: dict[str, dict[str, Any]] = {}
+    position = 0
+    for name, item_format, buffer in segments:
+        length = memoryview(buffer).nbytes
+        columns[name] = {'offset': position, 'length': length, 'format': item_format}
+        position += length + (-length % _ALIGNMENT)
+
+    header = json.dumps(
+        {
+            'version': CACHE_FORMAT_VERSION,
+            'source': source,
+            'row_count': len(batch),
+            'columns': columns,
+            'dictionaries': dictionaries,
+        },
+        separators=(',', ':'),
+    ).encode('utf-8')
+    header += b' ' * (-(len(header) + _PREAMBLE.size) % _ALIGNMENT)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(_PREAMBLE.pack(_MAGIC, len(header)))
+            handle.write(header)
+            for _, _, buffer in segments:
+                view = memoryview(buffer)
+                handle.write(view)
+                handle.write(b'\0' * (-view.nbytes % _ALIGNMENT))
+        os.replace(temp_name, cache_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return cache_path
+
+
+def read_batch_cache(
+    cache_path: Path, expected_source: dict[str, Any] | None = None
+) -> EvalRecordBatch | None:
+    """Map a cache file and return a read-only batch viewing it, or None if unusable.
+
+    Numeric and flag columns are memoryviews over the mapping, so loading copies no
+    column data; string columns decode lazily per row.
+    """
+    try:
+        with cache_path.open('rb') as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    try:
+        magic, header_length = _PREAMBLE.unpack_from(view)
+        if magic != _MAGIC:
+            return None
+        data_start = _PREAMBLE.size + header_length
+        header = json.loads(bytes(view[_PREAMBLE.size : data_start]))
+        if header.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        if expected_source is not None and header.get('source') != expected_source:
+            return None
+
+        def column(name: str) -> memoryview:
+            spec = header['columns'][name]
+            start = data_start + spec['offset']
+            segment = view[start : start + spec['length']]
+            if len(segment) != spec['length']:
+                raise ValueError(f'Truncated cache column: {name}')
+            return segment if spec['format'] == 'B' else segment.cast(spec['format'])
+
+        batch = EvalRecordBatch(
+            record_ids=_MappedStringColumn(
+                column('record_ids.offsets'), column('record_ids.data'), column('record_ids.mask')
+            ),
+            request_ids=_MappedStringColumn(
+                column('request_ids.offsets'),
+                column('request_ids.data'),
+                column('request_ids.mask'),
+            ),
+            latency_ms=column('latency_ms'),
+        )
+        for name in _FLAG_COLUMNS:
+            setattr(batch, name, column(name))
+        for name in _DICTIONARY_COLUMNS:
+            setattr(
+                batch,
+                name,
+                DictionaryColumn(
+                    codes=column(f'{name}.codes'), values=header['dictionaries'][name]
+                ),
+            )
+    except (KeyError, TypeError, ValueError, struct.error):
+        return None
+    column_lengths = {len(batch.record_ids), len(batch.request_ids), len(batch.latency_ms)}
+    column_lengths.update(len(getattr(batch, name)) for name in _FLAG_COLUMNS)
+    column_lengths.update(len(getattr(batch, name)) for name in _DICTIONARY_COLUMNS)
+    if column_lengths != {header['row_count']}:
+        return None
+    return batch
+
+
+def evict_cache_entries(
+    cache_dir: Path,
+    max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+) -> list[Path]:
+    """Delete least recently used cache entries beyond the entry and size budgets."""
+    if not cache_dir.exists():
+        return []
+    entries = sorted(
+        ((entry.stat(), entry) for entry in cache_dir.glob(f'*{CACHE_SUFFIX}')),
+        key=lambda item: item[0].st_mtime_ns,
+        reverse=True,
+    )
+    evicted: list[Path] = []
+    retained_bytes = 0
+    for index, (stat, entry) in enumerate(entries):
+        retained_bytes += stat.st_size
+        if index >= max_entries or retained_bytes > max_bytes:
+            entry.unlink(missing_ok=True)
+            evicted.append(entry)
+            retained_bytes -= stat.st_size
+    return evicted
+
+
+def load_eval_batch_cached(
+    path: Path,
+    cache_dir: Path,
+    loader: Callable[[Path], EvalRecordBatch] = load_eval_batch,
+    max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+) -> EvalRecordBatch:
+    """Load ``path`` as a batch, reusing or refreshing its binary columnar cache entry.
+
+    The whole batch is materialized on a miss; raises ``UncacheableInputError`` when the
+    input does not fit the fixed-width columns, so callers can fall back to streaming.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f'Input file not found: {path}')
+    cache_path = cache_path_for(path, cache_dir)
+    source = _source_fingerprint(path)
+
+    cached = read_batch_cache(cache_path, expected_source=source)
+    if cached is not None:
+        os.utime(cache_path)
+        return cached
+
+    try:
+        batch = loader(path)
+    except OverflowError as error:
+        raise UncacheableInputError(
+            f'{path} holds values outside the cache column types'
+        ) from error
+    write_batch_cache(batch, cache_path, source)
+    evict_cache_entries(cache_dir, max_entries=max_entries, max_bytes=max_bytes)
+    return batch
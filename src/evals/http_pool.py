@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import http.client
+import math
+import queue
+import random
+import threading
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Failures worth retrying: throttling, gateway/upstream hiccups and request timeouts.
+TRANSIENT_HTTP_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+DEFAULT_MAX_BACKOFF_SECONDS = 30.0
+# Upper bound on a server-requested pause, so a bogus Retry-After cannot stall a client.
+_MAX_RETRY_AFTER_SECONDS = 300.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header: delta-seconds or an HTTP-date."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=UTC)
+        seconds = (when - datetime.now(UTC)).total_seconds()
+    if math.isnan(seconds):
+        return None
+    return min(max(seconds, 0.0), _MAX_RETRY_AFTER_SECONDS)
+
+
+def backoff_delay(
+    attempt: int,
+    backoff_seconds: float,
+    max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+) -> float:
+    """Full-jitter exponential backoff before retry ``attempt`` (1-based).
+
+    Uniform in ``[0, min(max, base * 2**(attempt - 1))]``, so workers throttled together
+    do not all retry in the same instant.
+    """
+    return random.uniform(0.0, min(max_backoff_seconds, backoff_seconds * 2 ** (attempt - 1)))
+
+
+@dataclass(frozen=True, slots=True)
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def transient(self) -> bool:
+        return self.status in TRANSIENT_HTTP_STATUSES
+
+
+class StreamedResponse:
+    """Response whose body is read incrementally; see ``HttpConnectionPool.stream``.
+
+    A ``Content-Encoding: gzip`` body is decompressed as it is read; ``bytes_received``
+    counts the body bytes as they came off the wire.
+    """
+
+    __slots__ = ('_response', '_decoder', 'status', 'headers', 'bytes_received')
+
+    def __init__(self, response: http.client.HTTPResponse) -> None:
+        self._response = response
+        self.bytes_received = 0
+        self.status = response.status
+        self.headers = {name.lower(): value for name, value in response.getheaders()}
+        self._decoder = (
+            zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+            if self.headers.get('content-encoding', '').strip().lower() == 'gzip'
+            else None
+        )
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def transient(self) -> bool:
+        return self.status in TRANSIENT_HTTP_STATUSES
+
+    def _read_raw(self, size: int) -> bytes:
+        chunk = self._response.read(None if size < 0 else size)
+        if not chunk and size != 0 and self._response.length:
+            raise http.client.IncompleteRead(b'', self._response.length)
+        self.bytes_received += len(chunk)
+        return chunk
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes (all if negative); ``b''`` only at the end of the body.
+
+        A body cut short by the server raises ``http.client.IncompleteRead`` instead of
+        looking like a clean end.
+        """
+        decoder = self._decoder
+        if decoder is None:
+            return self._read_raw(size)
+        limit = max(size, 0)
+        while size:
+            data = decoder.unconsumed_tail or self._read_raw(size)
+            if not data:
+                if not decoder.eof:
+                    raise http.client.IncompleteRead(decoder.flush())
+                return decoder.flush()
+            chunk = decoder.decompress(data, limit)
+            if chunk:
+                return chunk
+        return b''
+
+
+class HttpConnectionPool:
+    """Thread-safe pool of persistent (keep-alive) connections to one origin.
+
+    At most ``max_connections`` requests are in flight at once; further callers block
+    until a connection is returned. Connections that fail mid-request are discarded
+    rather than reused, so a server-side close only costs the request that hit it.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 4, timeout: float = 30.0) -> None:
+        if max_connections <= 0:
+            raise ValueError('max_connections must be > 0')
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'Unsupported base URL: {base_url}')
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.connections_opened = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> HttpResponse:
+        """Send one request on a pooled connection; ``path`` is relative to the base URL.
+
+        Raises ``OSError``/``http.client.HTTPException`` on connection failures; HTTP error
+        statuses are returned, not raised.
+        """
+        if self._closed:
+            raise RuntimeError('HttpConnectionPool is closed')
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._new_connection()
+            try:
+                connection.request(method, self.base_path + path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                payload = response.read()
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close or self._closed:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return HttpResponse(
+                status=response.status,
+                headers={name.lower(): value for name, value in response.getheaders()},
+                body=payload,
+            )
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[StreamedResponse]:
+        """Like ``request`` but yields the unread response, for reading the body incrementally.
+
+        The connection returns to the pool only if the body was read to the end; otherwise
+        (early exit or an error while reading) it is closed.
+        """
+        if self._closed:
+            raise RuntimeError('HttpConnectionPool is closed')
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._new_connection()
+            try:
+                connection.request(method, self.base_path + path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                yield StreamedResponse(response)
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close or not response.isclosed() or self._closed:
+                connection.close()
+            else:
+                self._idle.put(connection)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> HttpConnectionPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
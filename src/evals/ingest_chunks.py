@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .contracts import EvalRecord, EvalRecordBatch, EvalThresholds
+from .ingest_sql import (
+    DEFAULT_ROWS_PER_STATEMENT,
+    RUN_COMPLETION_COLUMNS,
+    EvalIngestContext,
+    SampleDedupePlan,
+    build_eval_run_row,
+    render_eval_run_completion,
+    render_eval_run_insert,
+    render_eval_run_refresh,
+    write_eval_sample_statements,
+)
+from .instrumentation import span
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+PROGRESS_NAME = 'applied.txt'
+START_FILE_NAME = '000-start-run.sql'
+FINALIZE_FILE_NAME = '999-finalize-run.sql'
+# Sample keys to merge into a seen-keys file once the finalize file has been applied.
+PENDING_KEYS_NAME = 'pending-sample-keys.bin'
+
+
+class IngestManifestError(ValueError):
+    """Raised when a chunk manifest is unreadable or a chunk file fails its checksum."""
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkFile:
+    name: str
+    rows: int
+    bytes: int
+    sha256: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'name': self.name, 'rows': self.rows, 'bytes': self.bytes, 'sha256': self.sha256}
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> ChunkFile:
+        return ChunkFile(
+            name=str(payload['name']),
+            rows=int(payload['rows']),
+            bytes=int(payload['bytes']),
+            sha256=str(payload['sha256']),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class IngestManifest:
+    """Files of a chunked ingest, applied as ``start``, then ``chunks`` (any order), then
+    ``finalize``. Each file is one transaction."""
+
+    run_id: str
+    status: str
+    schema_variant: str
+    output_format: str
+    rows: int
+    start: ChunkFile
+    chunks: tuple[ChunkFile, ...]
+    finalize: ChunkFile
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'version': MANIFEST_VERSION,
+            'run_id': self.run_id,
+            'status': self.status,
+            'schema_variant': self.schema_variant,
+            'output_format': self.output_format,
+            'rows': self.rows,
+            'start': self.start.as_dict(),
+            'chunks': [chunk.as_dict() for chunk in self.chunks],
+            'finalize': self.finalize.as_dict(),
+        }
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> IngestManifest:
+        return IngestManifest(
+            run_id=str(payload['run_id']),
+            status=str(payload['status']),
+            schema_variant=str(payload['schema_variant']),
+            output_format=str(payload['output_format']),
+            rows=int(payload['rows']),
+            start=ChunkFile.from_dict(payload['start']),
+            chunks=tuple(ChunkFile.from_dict(chunk) for chunk in payload['chunks']),
+            finalize=ChunkFile.from_dict(payload['finalize']),
+        )
+
+
+class _HashingWriter:
+    """Text sink that encodes to a binary file while hashing and counting the bytes."""
+
+    __slots__ = ('_handle', 'digest', 'size')
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        data = text.encode('utf-8')
+        self.digest.update(data)
+        self.size += len(data)
+        self._handle.write(data)
+        return len(text)
+
+
+def _write_sql_file(path: Path, rows: int, render: Callable[[_HashingWriter], None]) -> ChunkFile:
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb', buffering=1024 * 1024) as handle:
+            writer = _HashingWriter(handle)
+            render(writer)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return ChunkFile(name=path.name, rows=rows, bytes=writer.size, sha256=writer.digest.hexdigest())
+
+
+def _render_chunk(
+    task: tuple[
+        str, list[EvalRecord] | EvalRecordBatch, str, str, int, str, int, SampleDedupePlan | None
+    ],
+) -> ChunkFile:
+    (
+        path,
+        records,
+        run_id,
+        schema_variant,
+        rows_per_statement,
+        output_format,
+        first_index,
+        dedupe,
+    ) = task
+
+    def render(writer: _HashingWriter) -> None:
+        writer.write('BEGIN;\n')
+        write_eval_sample_statements(
+            writer,  # type: ignore[arg-type]
+            records,
+            run_id,
+            schema_variant,
+            rows_per_statement=rows_per_statement,
+            output_format=output_format,
+            first_index=first_index,
+            dedupe=dedupe,
+        )
+        writer.write('COMMIT;\n')
+
+    rows = len(records) if dedupe is None else dedupe.rows
+    return _write_sql_file(Path(path), rows, render)
+
+
+def write_eval_ingest_chunks(
+    output_dir: Path,
+    records: list[EvalRecord] | EvalRecordBatch,
+    thresholds: EvalThresholds,
+    context: EvalIngestContext,
+    chunks: int,
+    report: dict[str, Any] | None = None,
+    run_id: str | None = None,
+    rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT,
+    output_format: str = 'insert',
+    workers: int = 1,
+    dedupe: SampleDedupePlan | None = None,
+) -> IngestManifest:
+    """Split an ingest into independently applicable SQL files plus ``manifest.json``.
+
+    ``000-start-run.sql`` inserts the run row as ``running`` (samples reference it, so it
+    must land first; re-applying it is a no-op). Samples are split into up to ``chunks``
+    files of contiguous rows, rendered across ``workers`` processes; each is one
+    transaction and they may be applied concurrently. ``999-finalize-run.sql`` checks
+    the sample count and sets the gate status. Sample keys match the single-file output.
+    With a ``dedupe`` plan the start file upserts the run, so re-rendering and re-applying
+    the input, or loading an overlapping one into the same run, is safe. The finalize file
+    then expects at least the plan's distinct sample count and recomputes the run's
+    record count, metrics and status from every sample stored for it.
+    """
+    if chunks <= 0:
+        raise ValueError('chunks must be > 0')
+    run_row, active_run_id, status = build_eval_run_row(
+        records, thresholds, context, report=report, run_id=run_id, dedupe=dedupe
+    )
+    variant = context.schema_variant
+    final_status = run_row['status']
+    run_row['status'] = 'running'
+    run_row[RUN_COMPLETION_COLUMNS[variant]] = None
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if dedupe is None:
+        start_sql = f'BEGIN;\n{render_eval_run_insert(run_row, variant)} ON CONFLICT DO NOTHING;\n'
+    else:
+        start_sql = f'BEGIN;\n{render_eval_run_insert(run_row, variant, upsert=True)};\n'
+    start = _write_sql_file(
+        output_dir / START_FILE_NAME, 0, lambda writer: writer.write(start_sql + 'COMMIT;\n')
+    )
+
+    total = len(records)
+    rows_per_chunk = max(1, math.ceil(total / chunks))
+    tasks = []
+    for number, offset in enumerate(range(0, total, rows_per_chunk)):
+        stop = min(offset + rows_per_chunk, total)
+        shard = (
+            records.slice(offset, stop)
+            if isinstance(records, EvalRecordBatch)
+            else records[offset:stop]
+        )
+        tasks.append(
+            (
+                str(output_dir / f'chunk-{number:05d}.sql'),
+                shard,
+                active_run_id,
+                variant,
+                rows_per_statement,
+                output_format,
+                offset + 1,
+                dedupe.slice(offset, stop) if dedupe is not None else None,
+            )
+        )
+
+    with span('ingest_chunks.render', rows=total):
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                chunk_files = tuple(executor.map(_render_chunk, tasks))
+        else:
+            chunk_files = tuple(_render_chunk(task) for task in tasks)
+
+    if dedupe is None:
+        completion = render_eval_run_completion(active_run_id, variant, final_status, total)
+    else:
+        completion = render_eval_run_refresh(
+            active_run_id, variant, thresholds, min_samples=dedupe.distinct
+        )
+    finalize_sql = f'BEGIN;\n{completion}COMMIT;\n'
+    finalize = _write_sql_file(
+        output_dir / FINALIZE_FILE_NAME, 0, lambda writer: writer.write(finalize_sql)
+    )
+    manifest = IngestManifest(
+        run_id=active_run_id,
+        status=status,
+        schema_variant=variant,
+        output_format=output_format,
+        rows=sum(chunk.rows for chunk in chunk_files),
+        start=start,
+        chunks=chunk_files,
+        finalize=finalize,
+    )
+    with (output_dir / MANIFEST_NAME).open('w', encoding='utf-8') as handle:
+        json.dump(manifest.as_dict(), handle, indent=2)
+        handle.write('\n')
+    # A fresh render invalidates any progress and pending keys recorded for older files.
+    (output_dir / PROGRESS_NAME).unlink(missing_ok=True)
+    (output_dir / PENDING_KEYS_NAME).unlink(missing_ok=True)
+    return manifest
+
+
+def load_ingest_manifest(directory: Path) -> IngestManifest:
+    path = directory / MANIFEST_NAME
+    try:
+        payload = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as error:
+        raise IngestManifestError(f'Unreadable ingest manifest: {path}') from error
+    if not isinstance(payload, dict) or payload.get('version') != MANIFEST_VERSION:
+        raise IngestManifestError(f'Unsupported ingest manifest version in {path}')
+    try:
+        return IngestManifest.from_dict(payload)
+    except (KeyError, TypeError, ValueError) as error:
+        raise IngestManifestError(f'Malformed ingest manifest: {path}') from error
+
+
+def verify_chunk_file(directory: Path, chunk: ChunkFile) -> None:
+    digest = hashlib.sha256()
+    try:
+        with (directory / chunk.name).open('rb') as handle:
+            while block := handle.read(1024 * 1024):
+                digest.update(block)
+    except OSError as error:
+        raise IngestManifestError(f'Missing ingest chunk: {directory / chunk.name}') from error
+    if digest.hexdigest() != chunk.sha256:
+        raise IngestManifestError(f'Ingest chunk checksum mismatch: {directory / chunk.name}')
+
+
+def read_applied_chunks(directory: Path) -> set[str]:
+    path = directory / PROGRESS_NAME
+    if not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text(encoding='utf-8').splitlines() if line.strip()}
+
+
+def apply_ingest_chunks(
+    directory: Path,
+    apply_file: Callable[[Path], None],
+    parallel: int = 4,
+) -> list[str]:
+    """Apply a chunked ingest with ``apply_file`` (e.g. ``psql -f``), resuming if interrupted.
+
+    Files recorded in ``applied.txt`` are skipped; every other file is checksum-verified
+    before it is applied and recorded once ``apply_file`` returns. Chunks run ``parallel``
+    at a time; the finalize file only runs once every chunk is recorded. Returns the names
+    applied by this call. The first failure is re-raised after in-flight chunks finish.
+    """
+    if parallel <= 0:
+        raise ValueError('parallel must be > 0')
+    manifest = load_ingest_manifest(directory)
+    applied = read_applied_chunks(directory)
+    pending = [chunk for chunk in manifest.chunks if chunk.name not in applied]
+    for chunk in (manifest.start, *pending, manifest.finalize):
+        if chunk.name not in applied:
+            verify_chunk_file(directory, chunk)
+
+    applied_now: list[str] = []
+    lock = threading.Lock()
+
+    def apply(chunk: ChunkFile) -> None:
+        apply_file(directory / chunk.name)
+        with lock, (directory / PROGRESS_NAME).open('a', encoding='utf-8') as progress:
+            progress.write(chunk.name + '\n')
+            applied_now.append(chunk.name)
+
+    if manifest.start.name not in applied:
+        apply(manifest.start)
+    if pending:
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            futures = [executor.submit(apply, chunk) for chunk in pending]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+        for future in done:
+            future.result()
+    if manifest.finalize.name not in applied:
+        apply(manifest.finalize)
+    return applied_now
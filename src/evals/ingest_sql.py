@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import io
 import json
+import re
+from collections.abc import Callable, Container, Iterable, Iterator
 from dataclasses import dataclass
-from typing import Any
-from uuid import UUID, uuid4
+from functools import lru_cache
+from hashlib import blake2b
+from json.encoder import encode_basestring_ascii as _json_string
+from typing import Any, TextIO
+from uuid import UUID, uuid4, uuid5
 
-from .contracts import EvalRecord, EvalThresholds
+from .contracts import EvalRecord, EvalRecordBatch, EvalThresholds
+from .instrumentation import span
 from .runner import build_eval_report
 
 _VALID_RUN_TYPES = {'offline', 'shadow', 'canary'}
 _VALID_SCHEMA_VARIANTS = {'sitecraft', 'v2'}
+_VALID_OUTPUT_FORMATS = {'insert', 'copy'}
+DEFAULT_ROWS_PER_STATEMENT = 500
+# Primary key column of ai_eval_runs per schema variant.
+RUN_KEY_COLUMNS = {'sitecraft': 'id', 'v2': 'run_id'}
+# Column set when a run reaches its final status.
+RUN_COMPLETION_COLUMNS = {'sitecraft': 'completed_at', 'v2': 'finished_at'}
+# ai_eval_runs.status of a run whose gates pass (a failing run is 'failed' in both).
+RUN_PASSED_STATUS = {'sitecraft': 'completed', 'v2': 'passed'}
+# Placeholder for ai_eval_runs timestamp columns in ``build_eval_run_row``.
+RUN_TIMESTAMP_NOW = object()
+# Digest size of ``sample_dedupe_key``; stored hex-encoded in ai_eval_samples.dedupe_key.
+SAMPLE_KEY_BYTES = 16
+# Dataset scope of a deduplicated ingest that names none (see ``scoped_run_id``).
+DEFAULT_DEDUPE_SCOPE = 'default'
+# uuid5 namespace of ``scoped_run_id``; fixed so that a scope names the same run everywhere.
+_RUN_SCOPE_NAMESPACE = UUID('6f1d3c2a-9b7e-4d8f-a5c1-2e0b7a9d4f36')
+# ai_eval_runs columns left untouched when a deduplicated ingest re-inserts an existing run.
+_RUN_UPSERT_KEEP_COLUMNS = frozenset({'started_at'})
+# Session-local table that a deduplicated COPY loads before merging into ai_eval_samples.
+_DEDUPE_STAGING_TABLE = 'ai_eval_samples_staging'
 
 
 @dataclass(frozen=True, slots=True)
@@ -29,17 +56,25 @@ def _sql_text(value: str | None) -> str:
     return f"'{escaped}'"
 
 
-def _sql_bool(value: bool) -> str:
-    return 'true' if value else 'false'
+def _sql_jsonb(value: dict[str, Any]) -> str:
+    return f'{_sql_text(_json_text(value))}::jsonb'
 
 
-def _sql_int(value: int | None) -> str:
-    return 'NULL' if value is None else str(value)
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
 
 
-def _sql_jsonb(value: dict[str, Any]) -> str:
-    payload = json.dumps(value, separators=(',', ':'), sort_keys=True)
-    return f'{_sql_text(payload)}::jsonb'
+def _copy_text(value: str | None) -> str:
+    """Encode a field for ``COPY ... FROM STDIN`` text format (tab-separated, ``\\N`` = NULL)."""
+    if value is None:
+        return '\\N'
+    # Substring checks are several times cheaper than translate() on the common clean path.
+    if '\\' in value or '\t' in value or '\n' in value or '\r' in value:
+        return value.translate(_COPY_ESCAPES)
+    return value
+
+
+def _json_text(value: dict[str, Any]) -> str:
+    return json.dumps(value, separators=(',', ':'), sort_keys=True)
 
 
 def _uuid_or_none(value: str | None) -> str | None:
@@ -57,13 +92,411 @@ def _map_sitecraft_run_type(run_type: str) -> str:
     return run_type
 
 
-def build_eval_ingest_sql(
-    records: list[EvalRecord],
-    thresholds: EvalThresholds,
-    context: EvalIngestContext,
-    report: dict[str, Any] | None = None,
-    run_id: str | None = None,
-) -> tuple[str, str, str]:
+_SAMPLE_COLUMNS = {
+    'sitecraft': (
+        'run_id, sample_key, prompt_hash, provider, model, schema_valid, patch_apply_success, '
+        'safety_html_tailwind_compliant, edited_after_generate, published_within_7d, '
+        'latency_ms, metadata'
+    ),
+    'v2': (
+        'run_id, request_id, requested_provider, selected_provider, route_strategy, '
+        'fallback_used, latency_ms, schema_valid, patch_apply_success, edited_after_generate, '
+        'published_within_7d, safety_html_tailwind_compliant, metadata'
+    ),
+}
+# Appended to the sample columns of a deduplicated ingest (see ``plan_sample_dedupe``).
+_DEDUPE_COLUMN = 'dedupe_key'
+_CANONICAL_UUID = re.compile(
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+).fullmatch
+
+
+@lru_cache(maxsize=65_536)
+def _normalize_uuid(value: str) -> str | None:
+    """Cached ``_uuid_or_none`` for non-null ids that are not already canonical."""
+    return _uuid_or_none(value)
+
+
+def _sample_request_id(value: str | None) -> str | None:
+    # Canonical ids (the common case) pass through on a regex check, which is cheaper
+    # than a cache lookup; anything else goes through the cached UUID() parse.
+    if value is None or _CANONICAL_UUID(value):
+        return value
+    return _normalize_uuid(value)
+
+
+def _sql_quoted(value: str) -> str:
+    """``_sql_text`` for a value known not to be None."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _json_nullable(value: str | None) -> str:
+    return 'null' if value is None else _json_string(value)
+
+
+# Sample metadata is written as JSON text directly, with keys in ``sort_keys`` order, so
+# the output matches ``_json_text`` of the equivalent dict without building one.
+def _sitecraft_sample_metadata(record: EvalRecord, request_id: str | None) -> str:
+    raw_request_id = record.request_id
+    invalid = ''
+    if raw_request_id and request_id is None:
+        invalid = ',"invalidRequestId":' + _json_string(raw_request_id)
+    return ''.join(
+        (
+            '{"fallbackUsed":',
+            'true' if record.fallback_used else 'false',
+            invalid,
+            ',"recordId":',
+            _json_string(record.record_id),
+            ',"requestId":',
+            _json_nullable(request_id),
+            ',"requestedProvider":',
+            _json_nullable(record.requested_provider),
+            ',"routeStrategy":',
+            _json_nullable(record.route_strategy),
+            ',"selectedProvider":',
+            _json_nullable(record.selected_provider),
+            '}',
+        )
+    )
+
+
+def _v2_sample_metadata(record: EvalRecord, request_id: str | None) -> str:
+    raw_request_id = record.request_id
+    invalid = ''
+    if raw_request_id and request_id is None:
+        invalid = '"invalidRequestId":' + _json_string(raw_request_id) + ','
+    return '{' + invalid + '"recordId":' + _json_string(record.record_id) + '}'
+
+
+# Per-sample encoders, one per (schema variant, output format). Each takes
+# ``(record, index, run_id, dedupe_key=None)``, where ``run_id`` is already rendered for
+# the target format, and returns one ``VALUES`` tuple, COPY data line or PostgREST JSON
+# object. A ``dedupe_key`` (hex, so it needs no escaping) is appended as the last column.
+def _sitecraft_insert_sample(
+    record: EvalRecord, index: int, run_id: str, dedupe_key: str | None = None
+) -> str:
+    request_id = _sample_request_id(record.request_id)
+    selected_provider = record.selected_provider
+    latency_ms = record.latency_ms
+    return ''.join(
+        (
+            '(',
+            run_id,
+            ', ',
+            _sql_quoted(f'{record.record_id}-{index}'),
+            ', NULL, ',
+            'NULL' if selected_provider is None else _sql_quoted(selected_provider),
+            ', NULL, ',
+            'true' if record.schema_valid else 'false',
+            ', ',
+            'true' if record.patch_apply_success else 'false',
+            ', ',
+            'true' if record.safety_html_tailwind_compliant else 'false',
+            ', ',
+            'true' if record.edited_after_generate else 'false',
+            ', ',
+            'true' if record.published_within_7d else 'false',
+            ', ',
+            'NULL' if latency_ms is None else str(latency_ms),
+            ', ',
+            _sql_quoted(_sitecraft_sample_metadata(record, request_id)),
+            '::jsonb)' if dedupe_key is None else f"::jsonb, '{dedupe_key}')",
+        )
+    )
+
+
+def _v2_insert_sample(
+    record: EvalRecord, index: int, run_id: str, dedupe_key: str | None = None
+) -> str:
+    request_id = _sample_request_id(record.request_id)
+    requested_provider = record.requested_provider
+    selected_provider = record.selected_provider
+    route_strategy = record.route_strategy
+    latency_ms = record.latency_ms
+    return ''.join(
+        (
+            '(',
+            run_id,
+            ', ',
+            'NULL' if request_id is None else _sql_quoted(request_id),
+            '::uuid, ',
+            'NULL' if requested_provider is None else _sql_quoted(requested_provider),
+            ', ',
+            'NULL' if selected_provider is None else _sql_quoted(selected_provider),
+            ', ',
+            'NULL' if route_strategy is None else _sql_quoted(route_strategy),
+            ', ',
+            'true' if record.fallback_used else 'false',
+            ', ',
+            'NULL' if latency_ms is None else str(latency_ms),
+            ', ',
+            'true' if record.schema_valid else 'false',
+            ', ',
+            'true' if record.patch_apply_success else 'false',
+            ', ',
+            'true' if record.edited_after_generate else 'false',
+            ', ',
+            'true' if record.published_within_7d else 'false',
+            ', ',
+            'true' if record.safety_html_tailwind_compliant else 'false',
+            ', ',
+            _sql_quoted(_v2_sample_metadata(record, request_id)),
+            '::jsonb)' if dedupe_key is None else f"::jsonb, '{dedupe_key}')",
+        )
+    )
+
+
+def _sitecraft_copy_sample(
+    record: EvalRecord, index: int, run_id: str, dedupe_key: str | None = None
+) -> str:
+    request_id = _sample_request_id(record.request_id)
+    latency_ms = record.latency_ms
+    row = '\t'.join(
+        (
+            run_id,
+            _copy_text(f'{record.record_id}-{index}'),
+            '\\N',
+            _copy_text(record.selected_provider),
+            '\\N',
+            't' if record.schema_valid else 'f',
+            't' if record.patch_apply_success else 'f',
+            't' if record.safety_html_tailwind_compliant else 'f',
+            't' if record.edited_after_generate else 'f',
+            't' if record.published_within_7d else 'f',
+            '\\N' if latency_ms is None else str(latency_ms),
+            _copy_text(_sitecraft_sample_metadata(record, request_id)),
+        )
+    )
+    return row if dedupe_key is None else f'{row}\t{dedupe_key}'
+
+
+def _v2_copy_sample(
+    record: EvalRecord, index: int, run_id: str, dedupe_key: str | None = None
+) -> str:
+    request_id = _sample_request_id(record.request_id)
+    latency_ms = record.latency_ms
+    row = '\t'.join(
+        (
+            run_id,
+            _copy_text(request_id),
+            _copy_text(record.requested_provider),
+            _copy_text(record.selected_provider),
+            _copy_text(record.route_strategy),
+            't' if record.fallback_used else 'f',
+            '\\N' if latency_ms is None else str(latency_ms),
+            't' if record.schema_valid else 'f',
+            't' if record.patch_apply_success else 'f',
+            't' if record.edited_after_generate else 'f',
+            't' if record.published_within_7d else 'f',
+            't' if record.safety_html_tailwind_compliant else 'f',
+            _copy_text(_v2_sample_metadata(record, request_id)),
+        )
+    )
+    return row if dedupe_key is None else f'{row}\t{dedupe_key}'
+
+
+def _sitecraft_json_sample(
+    record: EvalRecord, index: int, run_id: str, dedupe_key: str | None = None
+) -> str:
+    request_id = _sample_request_id(record.request_id)
+    latency_ms = record.latency_ms
+    return ''.join(
+        (
+            '{"run_id":',
+            run_id,
+            ',"sample_key":',
+            _json_string(f'{record.record_id}-{index}'),
+            ',"prompt_hash":null,"provider":',
+            _json_nullable(record.selected_provider),
+            ',"model":null,"schema_valid":',
+            'true' if record.schema_valid else 'false',
+            ',"patch_apply_success":',
+            'true' if record.patch_apply_success else 'false',
+            ',"safety_html_tailwind_compliant":',
+            'true' if record.safety_html_tailwind_compliant else 'false',
+            ',"edited_after_generate":',
+            'true' if record.edited_after_generate else 'false',
+            ',"published_within_7d":',
+            'true' if record.published_within_7d else 'false',
+            ',"latency_ms":',
+            'null' if latency_ms is None else str(latency_ms),
+            ',"metadata":',
+            _sitecraft_sample_metadata(record, request_id),
+            '}' if dedupe_key is None else f',"dedupe_key":"{dedupe_key}"}}',
+        )
+    )
+
+
+def _v2_json_sample(
+    record: EvalRecord, index: int, run_id: str, dedupe_key: str | None = None
+) -> str:
+    request_id = _sample_request_id(record.request_id)
+    latency_ms = record.latency_ms
+    return ''.join(
+        (
+            '{"run_id":',
+            run_id,
+            ',"request_id":',
+            _json_nullable(request_id),
+            ',"requested_provider":',
+            _json_nullable(record.requested_provider),
+            ',"selected_provider":',
+            _json_nullable(record.selected_provider),
+            ',"route_strategy":',
+            _json_nullable(record.route_strategy),
+            ',"fallback_used":',
+            'true' if record.fallback_used else 'false',
+            ',"latency_ms":',
+            'null' if latency_ms is None else str(latency_ms),
+            ',"schema_valid":',
+            'true' if record.schema_valid else 'false',
+            ',"patch_apply_success":',
+            'true' if record.patch_apply_success else 'false',
+            ',"edited_after_generate":',
+            'true' if record.edited_after_generate else 'false',
+            ',"published_within_7d":',
+            'true' if record.published_within_7d else 'false',
+            ',"safety_html_tailwind_compliant":',
+            'true' if record.safety_html_tailwind_compliant else 'false',
+            ',"metadata":',
+            _v2_sample_metadata(record, request_id),
+            '}' if dedupe_key is None else f',"dedupe_key":"{dedupe_key}"}}',
+        )
+    )
+
+
+_SAMPLE_ENCODERS: dict[tuple[str, str], Callable[..., str]] = {
+    ('sitecraft', 'insert'): _sitecraft_insert_sample,
+    ('sitecraft', 'copy'): _sitecraft_copy_sample,
+    ('sitecraft', 'json'): _sitecraft_json_sample,
+    ('v2', 'insert'): _v2_insert_sample,
+    ('v2', 'copy'): _v2_copy_sample,
+    ('v2', 'json'): _v2_json_sample,
+}
+
+
+def _sample_columns(schema_variant: str, dedupe: bool) -> str:
+    columns = _SAMPLE_COLUMNS[schema_variant]
+    return f'{columns}, {_DEDUPE_COLUMN}' if dedupe else columns
+
+
+def scoped_run_id(scope: str, run_type: str) -> str:
+    """Run id of a deduplicated ingest: a uuid5 of the run type and a stable dataset scope.
+
+    Every ingest of the same scope, e.g. successive exports of overlapping windows, lands
+    in the same run, so their samples get the same ``sample_dedupe_key`` and merge.
+    """
+    return str(uuid5(_RUN_SCOPE_NAMESPACE, f'{run_type}\x1f{scope}'))
+
+
+def sample_dedupe_key(run_id: str, record: EvalRecord) -> bytes:
+    """Stable identity of a sample: blake2b of its run id, the normalised request_id and
+    the record_id. The run id stands for the sample's dataset scope (``scoped_run_id``
+    unless one is given), and the key does not depend on the record's position, so
+    overlapping re-exports of the same samples map to the same key."""
+    request_id = record.request_id
+    if request_id is not None and not _CANONICAL_UUID(request_id):
+        request_id = _normalize_uuid(request_id)
+    identity = f'{run_id}\x1f{request_id or ""}\x1f{record.record_id}'
+    return blake2b(identity.encode('utf-8'), digest_size=SAMPLE_KEY_BYTES).digest()
+
+
+@dataclass(frozen=True, slots=True)
+class SampleDedupePlan:
+    """Which samples of a run to render, decided before any SQL or JSON is produced.
+
+    ``digests`` holds the ``sample_dedupe_key`` of every record (``SAMPLE_KEY_BYTES`` each)
+    and ``keep`` one flag byte per record: 0 for a repeat within the input or a key found in
+    the caller's seen-set. ``already_ingested`` counts the latter.
+    """
+
+    run_id: str
+    digests: bytes
+    keep: bytes
+    already_ingested: int = 0
+
+    def __len__(self) -> int:
+        return len(self.keep)
+
+    @property
+    def rows(self) -> int:
+        """Samples that will be rendered."""
+        return self.keep.count(1)
+
+    @property
+    def distinct(self) -> int:
+        """Distinct samples of this input the run holds once the rendered rows are loaded."""
+        return self.rows + self.already_ingested
+
+    def slice(self, start: int, stop: int) -> SampleDedupePlan:
+        return SampleDedupePlan(
+            run_id=self.run_id,
+            digests=self.digests[start * SAMPLE_KEY_BYTES : stop * SAMPLE_KEY_BYTES],
+            keep=self.keep[start:stop],
+        )
+
+    def new_keys(self) -> Iterator[bytes]:
+        """Digests of the rendered samples, to record in a seen-set after a successful load."""
+        digests = self.digests
+        for offset, flag in enumerate(self.keep):
+            if flag:
+                yield digests[offset * SAMPLE_KEY_BYTES : (offset + 1) * SAMPLE_KEY_BYTES]
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            'records': len(self),
+            'rows': self.rows,
+            'already_ingested': self.already_ingested,
+            'duplicates': len(self) - self.distinct,
+        }
+
+
+def plan_sample_dedupe(
+    records: Iterable[EvalRecord],
+    run_id: str,
+    seen_keys: Container[bytes] | None = None,
+) -> SampleDedupePlan:
+    """Key every record and keep only the first occurrence of each key not in ``seen_keys``.
+
+    ``seen_keys`` (e.g. ``evals.sample_keys.SeenSampleKeys``) is only read; record
+    ``plan.new_keys()`` in it once the rendered rows are safely loaded.
+    """
+    digests = bytearray()
+    keep = bytearray()
+    batch_keys: set[bytes] = set()
+    already_ingested = 0
+    with span('ingest_sql.plan_sample_dedupe') as stage:
+        for record in records:
+            key = sample_dedupe_key(run_id, record)
+            digests += key
+            if key in batch_keys:
+                keep.append(0)
+                continue
+            batch_keys.add(key)
+            if seen_keys is not None and key in seen_keys:
+                already_ingested += 1
+                keep.append(0)
+            else:
+                keep.append(1)
+        stage.add_rows(len(keep))
+    return SampleDedupePlan(
+        run_id=run_id,
+        digests=bytes(digests),
+        keep=bytes(keep),
+        already_ingested=already_ingested,
+    )
+
+
+def resolve_dedupe_run_id(run_id: str | None, dedupe: SampleDedupePlan | None) -> str | None:
+    if dedupe is None:
+        return run_id
+    if run_id is not None and run_id != dedupe.run_id:
+        raise ValueError(f'run_id {run_id} does not match the dedupe plan ({dedupe.run_id})')
+    return dedupe.run_id
+
+
+def _validate_context(context: EvalIngestContext) -> None:
     if context.run_type not in _VALID_RUN_TYPES:
         raise ValueError(
             f'Unsupported run_type: {context.run_type}. Must be one of {_VALID_RUN_TYPES}'
@@ -74,7 +507,33 @@ def build_eval_ingest_sql(
             f'{context.schema_variant}. Must be one of {_VALID_SCHEMA_VARIANTS}'
         )
 
-    active_run_id = run_id or str(uuid4())
+
+def _sql_run_value(value: Any, uuid: bool = False) -> str:
+    if value is RUN_TIMESTAMP_NOW:
+        return "timezone('utc', now())"
+    if isinstance(value, dict):
+        return _sql_jsonb(value)
+    if uuid:
+        return f'{_sql_text(value)}::uuid'
+    return _sql_text(value)
+
+
+def build_eval_run_row(
+    records: list[EvalRecord] | EvalRecordBatch,
+    thresholds: EvalThresholds,
+    context: EvalIngestContext,
+    report: dict[str, Any] | None = None,
+    run_id: str | None = None,
+    dedupe: SampleDedupePlan | None = None,
+) -> tuple[dict[str, Any], str, str]:
+    """Column values for the ``ai_eval_runs`` row, in insert order.
+
+    Timestamp columns hold ``RUN_TIMESTAMP_NOW`` for the caller to render (``now()`` in SQL,
+    the client clock over REST). A ``dedupe`` plan fixes the run id. Returns
+    ``(row, run_id, status)``.
+    """
+    _validate_context(context)
+    active_run_id = resolve_dedupe_run_id(run_id, dedupe) or str(uuid4())
     eval_report = report or build_eval_report(records, thresholds=thresholds)
     status = 'passed' if bool(eval_report['overall_pass']) else 'failed'
 
@@ -89,106 +548,381 @@ def build_eval_ingest_sql(
     }
 
     if context.schema_variant == 'sitecraft':
-        sitecraft_status = 'completed' if status == 'passed' else 'failed'
-        run_insert = (
-            'INSERT INTO public.ai_eval_runs ('
-            'id, run_type, status, dataset_ref, provider, model, prompt_set_version, '
-            'metrics, metadata, started_at, completed_at'
-            ') VALUES ('
-            f'{_sql_text(active_run_id)}::uuid, '
-            f'{_sql_text(_map_sitecraft_run_type(context.run_type))}, '
-            f'{_sql_text(sitecraft_status)}, '
-            f'{_sql_text(context.dataset_ref)}, '
-            'NULL, '
-            'NULL, '
-            'NULL, '
-            f'{_sql_jsonb(eval_report["metrics"])}, '
-            f'{_sql_jsonb(run_metadata)}, '
-            "timezone('utc', now()), "
-            "timezone('utc', now())"
-            ');'
-        )
+        row = {
+            'id': active_run_id,
+            'run_type': _map_sitecraft_run_type(context.run_type),
+            'status': RUN_PASSED_STATUS['sitecraft'] if status == 'passed' else 'failed',
+            'dataset_ref': context.dataset_ref,
+            'provider': None,
+            'model': None,
+            'prompt_set_version': None,
+            'metrics': eval_report['metrics'],
+            'metadata': run_metadata,
+            'started_at': RUN_TIMESTAMP_NOW,
+            'completed_at': RUN_TIMESTAMP_NOW,
+        }
     else:
-        run_insert = (
-            'INSERT INTO public.ai_eval_runs ('
-            'run_id, run_type, triggered_by, commit_sha, dataset_ref, thresholds, status, '
-            'started_at, finished_at, metadata'
-            ') VALUES ('
-            f'{_sql_text(active_run_id)}::uuid, '
-            f'{_sql_text(context.run_type)}, '
-            f'{_sql_text(context.triggered_by)}, '
-            f'{_sql_text(context.commit_sha)}, '
-            f'{_sql_text(context.dataset_ref)}, '
-            f'{_sql_jsonb(thresholds.as_dict())}, '
-            f'{_sql_text(status)}, '
-            "timezone('utc', now()), "
-            "timezone('utc', now()), "
-            f'{_sql_jsonb(run_metadata)}'
-            ');'
+        row = {
+            'run_id': active_run_id,
+            'run_type': context.run_type,
+            'triggered_by': context.triggered_by,
+            'commit_sha': context.commit_sha,
+            'dataset_ref': context.dataset_ref,
+            'thresholds': thresholds.as_dict(),
+            'status': status,
+            'started_at': RUN_TIMESTAMP_NOW,
+            'finished_at': RUN_TIMESTAMP_NOW,
+            'metadata': run_metadata,
+        }
+    return row, active_run_id, status
+
+
+def _validate_output_options(rows_per_statement: int, output_format: str) -> None:
+    if rows_per_statement <= 0:
+        raise ValueError('rows_per_statement must be > 0')
+    if output_format not in _VALID_OUTPUT_FORMATS:
+        raise ValueError(
+            f'Unsupported output_format: {output_format}. Must be one of {_VALID_OUTPUT_FORMATS}'
+        )
+
+
+def render_eval_run_insert(
+    run_row: dict[str, Any], schema_variant: str, upsert: bool = False
+) -> str:
+    """``INSERT INTO public.ai_eval_runs`` for a row from ``build_eval_run_row`` (no ``;``).
+
+    ``upsert`` overwrites an existing row with the same run id (keeping its
+    ``started_at``), so a deduplicated ingest can load more samples into an existing run.
+    """
+    key_column = RUN_KEY_COLUMNS[schema_variant]
+    run_values = ', '.join(
+        _sql_run_value(value, uuid=column == key_column) for column, value in run_row.items()
+    )
+    statement = f'INSERT INTO public.ai_eval_runs ({", ".join(run_row)}) VALUES ({run_values})'
+    if upsert:
+        updates = ', '.join(
+            f'{column} = EXCLUDED.{column}'
+            for column in run_row
+            if column != key_column and column not in _RUN_UPSERT_KEEP_COLUMNS
+        )
+        statement += f' ON CONFLICT ({key_column}) DO UPDATE SET {updates}'
+    return statement
+
+
+# ai_eval_samples flag behind each rate metric of ``EvalMetricsAccumulator``.
+_SAMPLE_RATE_FLAGS = (
+    ('schema_valid_rate', 'schema_valid'),
+    ('patch_apply_success', 'patch_apply_success'),
+    ('edit_after_generate_rate', 'edited_after_generate'),
+    ('publish_conversion_proxy', 'published_within_7d'),
+    ('safety_html_tailwind_compliance', 'safety_html_tailwind_compliant'),
+)
+# SiteCraft samples have no fallback_used column; their metadata carries the flag.
+_SAMPLE_FALLBACK_FLAG = {'sitecraft': "(metadata->>'fallbackUsed')::boolean", 'v2': 'fallback_used'}
+_LATENCY_QUANTILES = (
+    ('p50_latency_ms', 0.50),
+    ('p90_latency_ms', 0.90),
+    ('p95_latency_ms', 0.95),
+    ('p99_latency_ms', 0.99),
+)
+
+
+def _run_gate_expressions(thresholds: EvalThresholds) -> list[tuple[str, str]]:
+    return [
+        ('schema_valid_rate', f'schema_valid_rate >= {thresholds.schema_valid_rate!r}'),
+        ('patch_apply_success', f'patch_apply_success >= {thresholds.patch_apply_success!r}'),
+        (
+            'edit_after_generate_rate',
+            f'edit_after_generate_rate >= {thresholds.edit_after_generate_rate!r}',
+        ),
+        (
+            'publish_conversion_proxy',
+            f'publish_conversion_proxy >= {thresholds.publish_conversion_proxy!r}',
+        ),
+        (
+            'safety_html_tailwind_compliance',
+            f'safety_html_tailwind_compliance >= {thresholds.safety_html_tailwind_compliance!r}',
+        ),
+        ('fallback_rate_max', f'fallback_rate <= {thresholds.fallback_rate_max!r}'),
+        (
+            'p95_latency_ms_max',
+            f'COALESCE(p95_latency_ms <= {int(thresholds.p95_latency_ms_max)}, true)',
+        ),
+    ]
+
+
+def render_eval_run_refresh(
+    run_id: str, schema_variant: str, thresholds: EvalThresholds, min_samples: int = 0
+) -> str:
+    """Statements that recompute a run's record count, metrics, gates and status from the
+    samples stored for it, and set its completion time.
+
+    A deduplicated ingest merges its samples into whatever the run already holds (e.g. an
+    overlapping export window loaded earlier), so the run row is derived from
+    ``ai_eval_samples`` rather than from the input being loaded. Rates are rounded like
+    ``EvalMetricsAccumulator`` and latency percentiles are exact nearest-rank
+    (``percentile_disc``) over non-negative latencies. With ``min_samples`` the statements
+    refuse to run unless at least that many samples are stored (e.g. after a chunked load).
+    """
+    run_id_sql = f'{_sql_text(run_id)}::uuid'
+    key_column = RUN_KEY_COLUMNS[schema_variant]
+    completion_column = RUN_COMPLETION_COLUMNS[schema_variant]
+    flags = (*_SAMPLE_RATE_FLAGS, ('fallback_rate', _SAMPLE_FALLBACK_FLAG[schema_variant]))
+    aggregates = [
+        f'round(count(*) FILTER (WHERE {flag})::numeric / greatest(count(*), 1), 4)::float8 '
+        f'AS {metric}'
+        for metric, flag in flags
+    ]
+    aggregates += [
+        f'percentile_disc({quantile}) WITHIN GROUP (ORDER BY latency_ms) '
+        f'FILTER (WHERE latency_ms >= 0) AS {metric}'
+        for metric, quantile in _LATENCY_QUANTILES
+    ]
+    metric_names = [metric for metric, _ in flags] + [metric for metric, _ in _LATENCY_QUANTILES]
+    gates = _run_gate_expressions(thresholds)
+    metrics_json = ', '.join(f"'{metric}', {metric}" for metric in metric_names)
+    gates_json = ', '.join(f"'{gate}', {expression}" for gate, expression in gates)
+    passed = ' AND '.join(expression for _, expression in gates)
+    metric_column = ',\n  metrics = stats.metrics' if schema_variant == 'sitecraft' else ''
+
+    statements = ''
+    if min_samples:
+        statements = (
+            'DO $$\n'
+            'BEGIN\n'
+            f'  IF (SELECT count(*) FROM public.ai_eval_samples WHERE run_id = {run_id_sql}) '
+            f'< {min_samples} THEN\n'
+            f"    RAISE EXCEPTION 'ai_eval_samples for run {run_id} holds fewer than "
+            f"{min_samples} rows';\n"
+            '  END IF;\n'
+            'END $$;\n'
         )
+    return statements + (
+        'UPDATE public.ai_eval_runs AS eval_run SET\n'
+        f"  status = CASE WHEN stats.passed THEN '{RUN_PASSED_STATUS[schema_variant]}' "
+        "ELSE 'failed' END,\n"
+        f"  {completion_column} = timezone('utc', now()),\n"
+        "  metadata = eval_run.metadata || jsonb_build_object('recordCount', "
+        "stats.record_count, 'metrics', stats.metrics, 'gates', stats.gates)"
+        f'{metric_column}\n'
+        'FROM (\n'
+        '  SELECT\n'
+        '    record_count,\n'
+        f'    jsonb_build_object({metrics_json}) AS metrics,\n'
+        f'    jsonb_build_object({gates_json}) AS gates,\n'
+        f'    {passed} AS passed\n'
+        '  FROM (\n'
+        '    SELECT\n'
+        '      count(*) AS record_count,\n'
+        + ''.join(f'      {aggregate},\n' for aggregate in aggregates[:-1])
+        + f'      {aggregates[-1]}\n'
+        f'    FROM public.ai_eval_samples WHERE run_id = {run_id_sql}\n'
+        '  ) AS rates\n'
+        ') AS stats\n'
+        f'WHERE eval_run.{key_column} = {run_id_sql};\n'
+    )
+
+
+def render_eval_run_completion(
+    run_id: str, schema_variant: str, status: str, expected_samples: int
+) -> str:
+    """Statements that set a run's final status, refusing unless exactly
+    ``expected_samples`` samples are stored for it (e.g. after a chunked load)."""
+    run_id_sql = f'{_sql_text(run_id)}::uuid'
+    key_column = RUN_KEY_COLUMNS[schema_variant]
+    completion_column = RUN_COMPLETION_COLUMNS[schema_variant]
+    return (
+        'DO $$\n'
+        'BEGIN\n'
+        f'  IF (SELECT count(*) FROM public.ai_eval_samples WHERE run_id = {run_id_sql}) '
+        f'<> {expected_samples} THEN\n'
+        f"    RAISE EXCEPTION 'ai_eval_samples for run {run_id} does not hold "
+        f"{expected_samples} rows';\n"
+        '  END IF;\n'
+        'END $$;\n'
+        f'UPDATE public.ai_eval_runs SET status = {_sql_text(status)}, '
+        f"{completion_column} = timezone('utc', now()) WHERE {key_column} = {run_id_sql};\n"
+    )
+
+
+def _encode_samples(
+    encode_sample: Callable[..., str],
+    records: list[EvalRecord] | EvalRecordBatch,
+    run_id: str,
+    first_index: int,
+    dedupe: SampleDedupePlan | None,
+) -> Iterator[str]:
+    if dedupe is None:
+        for index, record in enumerate(records, start=first_index):
+            yield encode_sample(record, index, run_id)
+        return
+    if len(dedupe) != len(records):
+        raise ValueError(f'dedupe plan covers {len(dedupe)} records, expected {len(records)}')
+    digests, keep = dedupe.digests, dedupe.keep
+    for offset, record in enumerate(records):
+        if keep[offset]:
+            key = digests[offset * SAMPLE_KEY_BYTES : (offset + 1) * SAMPLE_KEY_BYTES].hex()
+            yield encode_sample(record, first_index + offset, run_id, key)
+
+
+def write_eval_sample_statements(
+    output: TextIO,
+    records: list[EvalRecord] | EvalRecordBatch,
+    run_id: str,
+    schema_variant: str,
+    rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT,
+    output_format: str = 'insert',
+    first_index: int = 1,
+    dedupe: SampleDedupePlan | None = None,
+) -> int:
+    """Write only the ``ai_eval_samples`` statements (no transaction or run row).
+
+    ``first_index`` is the 1-based position of ``records[0]`` in the whole run, so that
+    sample keys stay stable when a run is rendered in several pieces. With a ``dedupe``
+    plan (covering exactly ``records``) only its kept rows are written, with their
+    ``dedupe_key``, and rows whose key is already stored are skipped by the database
+    (``ON CONFLICT DO NOTHING``; COPY loads a temporary staging table first).
+    Returns the number of rows written.
+    """
+    _validate_output_options(rows_per_statement, output_format)
+    deduped = dedupe is not None
+    sample_columns = _sample_columns(schema_variant, deduped)
+    encode_sample = _SAMPLE_ENCODERS[schema_variant, output_format]
+    on_conflict = f' ON CONFLICT ({_DEDUPE_COLUMN}) DO NOTHING' if deduped else ''
 
-    lines = ['BEGIN;', run_insert]
-    for index, record in enumerate(records, start=1):
-        valid_request_id = _uuid_or_none(record.request_id)
-        sample_metadata: dict[str, Any] = {'recordId': record.record_id}
-        if record.request_id and valid_request_id is None:
-            sample_metadata['invalidRequestId'] = record.request_id
-
-        if context.schema_variant == 'sitecraft':
-            sample_key = f'{record.record_id}-{index}'
-            sample_metadata = {
-                **sample_metadata,
-                'requestId': valid_request_id,
-                'requestedProvider': record.requested_provider,
-                'selectedProvider': record.selected_provider,
-                'routeStrategy': record.route_strategy,
-                'fallbackUsed': record.fallback_used,
-            }
-            sample_insert = (
-                'INSERT INTO public.ai_eval_samples ('
-                'run_id, sample_key, prompt_hash, provider, model, schema_valid, '
-                'patch_apply_success, safety_html_tailwind_compliant, edited_after_generate, '
-                'published_within_7d, latency_ms, metadata'
-                ') VALUES ('
-                f'{_sql_text(active_run_id)}::uuid, '
-                f'{_sql_text(sample_key)}, '
-                'NULL, '
-                f'{_sql_text(record.selected_provider)}, '
-                'NULL, '
-                f'{_sql_bool(record.schema_valid)}, '
-                f'{_sql_bool(record.patch_apply_success)}, '
-                f'{_sql_bool(record.safety_html_tailwind_compliant)}, '
-                f'{_sql_bool(record.edited_after_generate)}, '
-                f'{_sql_bool(record.published_within_7d)}, '
-                f'{_sql_int(record.latency_ms)}, '
-                f'{_sql_jsonb(sample_metadata)}'
-                ');'
-            )
+    write = output.write
+    written = 0
+    with span('ingest_sql.write_samples', rows=len(records)):
+        pending: list[str] = []
+        if output_format == 'copy':
+            target = 'public.ai_eval_samples'
+            if deduped:
+                target = _DEDUPE_STAGING_TABLE
+                write(
+                    f'CREATE TEMP TABLE {target} (LIKE public.ai_eval_samples INCLUDING DEFAULTS) '
+                    'ON COMMIT DROP;\n'
+                )
+            write(f'COPY {target} ({sample_columns}) FROM STDIN;\n')
+            for row in _encode_samples(encode_sample, records, run_id, first_index, dedupe):
+                pending.append(row)
+                if len(pending) == rows_per_statement:
+                    written += len(pending)
+                    write('\n'.join(pending) + '\n')
+                    pending.clear()
+            written += len(pending)
+            pending.append('\\.')
+            write('\n'.join(pending) + '\n')
+            if deduped:
+                write(
+                    f'INSERT INTO public.ai_eval_samples ({sample_columns}) '
+                    f'SELECT {sample_columns} FROM {target}{on_conflict};\n'
+                )
         else:
-            sample_insert = (
-                'INSERT INTO public.ai_eval_samples ('
-                'run_id, request_id, requested_provider, selected_provider, route_strategy, '
-                'fallback_used, latency_ms, schema_valid, patch_apply_success, '
-                'edited_after_generate, '
-                'published_within_7d, safety_html_tailwind_compliant, metadata'
-                ') VALUES ('
-                f'{_sql_text(active_run_id)}::uuid, '
-                f'{_sql_text(valid_request_id)}::uuid, '
-                f'{_sql_text(record.requested_provider)}, '
-                f'{_sql_text(record.selected_provider)}, '
-                f'{_sql_text(record.route_strategy)}, '
-                f'{_sql_bool(record.fallback_used)}, '
-                f'{_sql_int(record.latency_ms)}, '
-                f'{_sql_bool(record.schema_valid)}, '
-                f'{_sql_bool(record.patch_apply_success)}, '
-                f'{_sql_bool(record.edited_after_generate)}, '
-                f'{_sql_bool(record.published_within_7d)}, '
-                f'{_sql_bool(record.safety_html_tailwind_compliant)}, '
-                f'{_sql_jsonb(sample_metadata)}'
-                ');'
-            )
-        lines.append(sample_insert)
-
-    lines.append('COMMIT;')
-    lines.append('')
-    return '\n'.join(lines), active_run_id, status
+            insert_prefix = f'INSERT INTO public.ai_eval_samples ({sample_columns}) VALUES '
+            statement_end = on_conflict + ';\n'
+            run_id_sql = f'{_sql_text(run_id)}::uuid'
+            for row in _encode_samples(encode_sample, records, run_id_sql, first_index, dedupe):
+                pending.append(row)
+                if len(pending) == rows_per_statement:
+                    written += len(pending)
+                    write(insert_prefix + ',\n'.join(pending) + statement_end)
+                    pending.clear()
+            if pending:
+                written += len(pending)
+                write(insert_prefix + ',\n'.join(pending) + statement_end)
+    return written
+
+
+def write_eval_ingest_sql(
+    output: TextIO,
+    records: list[EvalRecord] | EvalRecordBatch,
+    thresholds: EvalThresholds,
+    context: EvalIngestContext,
+    report: dict[str, Any] | None = None,
+    run_id: str | None = None,
+    rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT,
+    output_format: str = 'insert',
+    dedupe: SampleDedupePlan | None = None,
+) -> tuple[str, str]:
+    """Write the run row and its samples to ``output`` as one ``BEGIN``/``COMMIT`` script.
+
+    Statements are written as they are rendered, so memory stays bounded by one
+    statement regardless of run size. Returns ``(run_id, status)``.
+
+    With ``output_format='insert'`` samples are written as multi-row ``INSERT ... VALUES``
+    statements of up to ``rows_per_statement`` rows (``1`` emits one statement per sample).
+    ``'copy'`` writes them as a ``COPY ... FROM STDIN`` text-format block instead, which
+    must be run through psql rather than the Supabase SQL Editor.
+
+    A ``dedupe`` plan from ``plan_sample_dedupe`` (which fixes the run id) makes the
+    script idempotent: the run row is upserted and samples already stored for the run
+    are skipped, so it needs the ``dedupe_key`` unique index from migration 0005. An
+    overlapping input merges into the run, whose record count, metrics and status are then
+    recomputed from all of its stored samples (``render_eval_run_refresh``).
+    """
+    _validate_output_options(rows_per_statement, output_format)
+    _validate_context(context)
+
+    run_row, active_run_id, status = build_eval_run_row(
+        records, thresholds, context, report=report, run_id=run_id, dedupe=dedupe
+    )
+    variant = context.schema_variant
+    output.write('BEGIN;\n')
+    output.write(f'{render_eval_run_insert(run_row, variant, upsert=dedupe is not None)};\n')
+    write_eval_sample_statements(
+        output,
+        records,
+        active_run_id,
+        context.schema_variant,
+        rows_per_statement=rows_per_statement,
+        output_format=output_format,
+        dedupe=dedupe,
+    )
+    if dedupe is not None:
+        output.write(render_eval_run_refresh(active_run_id, variant, thresholds))
+    output.write('COMMIT;\n')
+    return active_run_id, status
+
+
+def iter_eval_sample_json(
+    records: list[EvalRecord] | EvalRecordBatch,
+    run_id: str,
+    schema_variant: str,
+    dedupe: SampleDedupePlan | None = None,
+) -> Iterator[str]:
+    """Yield each sample as a JSON object in ``ai_eval_samples`` column form (for PostgREST).
+
+    With a ``dedupe`` plan only its kept rows are yielded, carrying ``dedupe_key``.
+    """
+    if schema_variant not in _VALID_SCHEMA_VARIANTS:
+        raise ValueError(
+            f'Unsupported schema_variant: {schema_variant}. Must be one of {_VALID_SCHEMA_VARIANTS}'
+        )
+    encode_sample = _SAMPLE_ENCODERS[schema_variant, 'json']
+    yield from _encode_samples(encode_sample, records, _json_string(run_id), 1, dedupe)
+
+
+def build_eval_ingest_sql(
+    records: list[EvalRecord] | EvalRecordBatch,
+    thresholds: EvalThresholds,
+    context: EvalIngestContext,
+    report: dict[str, Any] | None = None,
+    run_id: str | None = None,
+    rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT,
+    output_format: str = 'insert',
+    dedupe: SampleDedupePlan | None = None,
+) -> tuple[str, str, str]:
+    """String-returning wrapper around ``write_eval_ingest_sql``."""
+    buffer = io.StringIO()
+    active_run_id, status = write_eval_ingest_sql(
+        buffer,
+        records,
+        thresholds,
+        context,
+        report=report,
+        run_id=run_id,
+        rows_per_statement=rows_per_statement,
+        output_format=output_format,
+        dedupe=dedupe,
+    )
+    return buffer.getvalue(), active_run_id, status
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_active: EvalProfiler | None = None
+
+
+class _NullSpan:
+    """Returned by ``span`` while profiling is off: entering and recording do nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def add_rows(self, count: int) -> None:
+        return None
+
+    def add_bytes(self, count: int) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+@dataclass(slots=True)
+class StageSpan:
+    name: str
+    depth: int
+    rows: int | None = None
+    seconds: float = 0.0
+    peak_memory_bytes: int | None = None
+    bytes: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            'name': self.name,
+            'depth': self.depth,
+            'seconds': round(self.seconds, 6),
+            'rows': self.rows,
+        }
+        if self.rows and self.seconds > 0:
+            payload['rows_per_second'] = round(self.rows / self.seconds, 1)
+        if self.bytes is not None:
+            payload['bytes'] = self.bytes
+            if self.seconds > 0:
+                payload['bytes_per_second'] = round(self.bytes / self.seconds, 1)
+        if self.peak_memory_bytes is not None:
+            payload['peak_memory_bytes'] = self.peak_memory_bytes
+        return payload
+
+
+class _ActiveSpan:
+    __slots__ = ('_profiler', '_span', '_started', '_memory_start', '_child_peak')
+
+    def __init__(self, profiler: EvalProfiler, span: StageSpan) -> None:
+        self._profiler = profiler
+        self._span = span
+        self._started = 0.0
+        self._memory_start = 0
+        self._child_peak = 0
+
+    def add_rows(self, count: int) -> None:
+        self._span.rows = (self._span.rows or 0) + count
+
+    def add_bytes(self, count: int) -> None:
+        self._span.bytes = (self._span.bytes or 0) + count
+
+    def __enter__(self) -> _ActiveSpan:
+        profiler = self._profiler
+        if profiler.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if profiler._stack:
+                parent = profiler._stack[-1]
+                parent._child_peak = max(parent._child_peak, peak)
+            self._memory_start = current
+            tracemalloc.reset_peak()
+        profiler._stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._span.seconds = time.perf_counter() - self._started
+        profiler = self._profiler
+        profiler._stack.pop()
+        if profiler.trace_memory:
+            # tracemalloc keeps one global peak, reset on every span entry; a span's peak is
+            # the larger of what it saw directly and what its children reported before
+            # their own resets.
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+            self._span.peak_memory_bytes = max(0, peak - self._memory_start)
+            if profiler._stack:
+                parent = profiler._stack[-1]
+                parent._child_peak = max(parent._child_peak, peak)
+
+
+@dataclass(slots=True)
+class EvalProfiler:
+    """Collects timed spans (with optional row counts and peak allocations) for one run."""
+
+    trace_memory: bool = True
+    spans: list[StageSpan] = field(default_factory=list)
+    _stack: list[_ActiveSpan] = field(default_factory=list, repr=False)
+
+    def span(self, name: str, rows: int | None = None) -> _ActiveSpan:
+        stage_span = StageSpan(name=name, depth=len(self._stack), rows=rows)
+        self.spans.append(stage_span)
+        return _ActiveSpan(self, stage_span)
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        rows: int | None = None,
+        byte_count: int | None = None,
+    ) -> None:
+        """Add an already-timed stage as a child of the open span.
+
+        For work interleaved with another stage, row by row, that cannot be wrapped in a
+        ``span`` of its own (e.g. fetching rows that the caller transforms as they arrive).
+        """
+        self.spans.append(
+            StageSpan(
+                name=name, depth=len(self._stack), rows=rows, seconds=seconds, bytes=byte_count
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'trace_memory': self.trace_memory,
+            'total_seconds': round(sum(span.seconds for span in self.spans if span.depth == 0), 6),
+            'stages': [span.as_dict() for span in self.spans],
+        }
+
+
+def span(name: str, rows: int | None = None) -> _ActiveSpan | _NullSpan:
+    """Time a pipeline stage under the active profiler; a shared no-op when none is active."""
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(name, rows)
+
+
+def record_stage(
+    name: str, seconds: float, rows: int | None = None, byte_count: int | None = None
+) -> None:
+    """``EvalProfiler.record`` on the active profiler; does nothing when none is active."""
+    if _active is not None:
+        _active.record(name, seconds, rows, byte_count)
+
+
+@contextmanager
+def profiling(
+    enabled: bool = True,
+    trace_memory: bool = True,
+    pstats_path: Path | None = None,
+) -> Iterator[EvalProfiler | None]:
+    """Activate an ``EvalProfiler`` for the block, optionally under cProfile.
+
+    With ``pstats_path`` the cProfile stats are dumped there on exit (load them with
+    ``python -m pstats``). Yields None when ``enabled`` is false.
+    """
+    global _active
+    if not enabled:
+        yield None
+        return
+    if _active is not None:
+        raise RuntimeError('An eval profiler is already active')
+
+    profiler = EvalProfiler(trace_memory=trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    cprofile = cProfile.Profile() if pstats_path is not None else None
+    _active = profiler
+    try:
+        if cprofile is not None:
+            cprofile.enable()
+        try:
+            yield profiler
+        finally:
+            if cprofile is not None:
+                cprofile.disable()
+    finally:
+        _active = None
+        if started_tracing:
+            tracemalloc.stop()
+        if cprofile is not None and pstats_path is not None:
+            pstats_path.parent.mkdir(parents=True, exist_ok=True)
+            pstats.Stats(cprofile).dump_stats(str(pstats_path))
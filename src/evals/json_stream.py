@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import Any, Protocol
+
+DEFAULT_READ_SIZE = 64 * 1024
+# Characters buffered for one element before the body is rejected as malformed.
+DEFAULT_MAX_ELEMENT_SIZE = 16 * 1024 * 1024
+_WHITESPACE = ' \t\n\r'
+_ELEMENT_END = frozenset(_WHITESPACE + ',]')
+
+
+class _Readable(Protocol):
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+def iter_json_array(
+    stream: _Readable,
+    read_size: int = DEFAULT_READ_SIZE,
+    max_element_size: int = DEFAULT_MAX_ELEMENT_SIZE,
+) -> Iterator[Any]:
+    """Yield the elements of a JSON array read incrementally from a binary stream.
+
+    Only the unparsed tail of the input is buffered, so memory is bounded by one element
+    plus ``read_size`` however long the array is. Raises ``ValueError`` if the document
+    is not a single JSON array, or once more than ``max_element_size`` characters are
+    pending without an element decoding (a malformed body is not buffered to EOF).
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buffer, position, eof
+        chunk = stream.read(read_size)
+        if chunk:
+            buffer = buffer[position:] + text_decoder.decode(chunk)
+        else:
+            buffer = buffer[position:] + text_decoder.decode(b'', final=True)
+            eof = True
+        position = 0
+
+    def fill_element() -> None:
+        if len(buffer) - position > max_element_size:
+            raise ValueError(
+                f'JSON array element exceeds {max_element_size} characters without decoding'
+            )
+        fill()
+
+    def next_token() -> str:
+        """Skip whitespace and return the next character without consuming it ('' at EOF)."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if eof:
+                return ''
+            fill()
+
+    if next_token() != '[':
+        raise ValueError('Expected a JSON array')
+    position += 1
+    if next_token() == ']':
+        position += 1
+    else:
+        while True:
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as error:
+                    if eof:
+                        raise ValueError(f'Malformed JSON array element: {error}') from error
+                    fill_element()
+                    continue
+                # Accept a value only once its delimiter is buffered: a number cut short by
+                # the read ('-0.' of '-0.5') still decodes, but is followed by more input.
+                if not eof and (end == len(buffer) or buffer[end] not in _ELEMENT_END):
+                    fill_element()
+                    continue
+                break
+            position = end
+            yield value
+            token = next_token()
+            position += 1
+            if token == ']':
+                break
+            if token != ',':
+                raise ValueError('Malformed JSON array: expected "," or "]"')
+            next_token()
+    if next_token() != '':
+        raise ValueError('Unexpected data after the JSON array')
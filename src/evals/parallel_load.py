@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import io
+import json
+import mmap
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .compressed_io import compression_for, open_text
+from .contracts import EvalRecord, EvalRecordBatch
+from .runner import EvalMetricsAccumulator, GroupedEvalAccumulator, load_eval_batch
+
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+
+_INVALID_JSON = 'invalid_json'
+_NOT_AN_OBJECT = 'not_an_object'
+
+
+@dataclass(frozen=True, slots=True)
+class _ShardResult:
+    line_count: int
+    payload: EvalRecordBatch | EvalMetricsAccumulator | GroupedEvalAccumulator | None = None
+    error_kind: str | None = None
+    error_line: int = 0
+
+
+def plan_byte_ranges(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Split ``path`` into ``[start, end)`` byte ranges that each end on a newline."""
+    if chunk_size <= 0:
+        raise ValueError('chunk_size must be > 0')
+    size = path.stat().st_size
+    if size == 0:
+        return []
+
+    ranges: list[tuple[int, int]] = []
+    with path.open('rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            boundary = data.find(b'\n', min(start + chunk_size, size) - 1)
+            end = size if boundary == -1 else boundary + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _parse_byte_range(task: tuple[str, int, int, bool, tuple[str, ...]]) -> _ShardResult:
+    path, start, end, as_records, group_by = task
+    with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode('utf-8')
+    # StringIO applies the same universal-newline splitting as iterating a text file, so
+    # local line numbers line up with load_eval_records.
+    return _parse_lines(io.StringIO(text, newline=None), as_records, group_by)
+
+
+def _parse_lines(lines: Iterable[str], as_records: bool, group_by: tuple[str, ...]) -> _ShardResult:
+    sink: EvalRecordBatch | EvalMetricsAccumulator | GroupedEvalAccumulator
+    if as_records:
+        sink = EvalRecordBatch()
+        add = sink.append
+    elif group_by:
+        sink = GroupedEvalAccumulator(group_by)
+        add = sink.add
+    else:
+        sink = EvalMetricsAccumulator()
+        add = sink.add
+
+    line_count = 0
+    for line_count, raw_line in enumerate(lines, start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError:
+            return _ShardResult(line_count, error_kind=_INVALID_JSON, error_line=line_count)
+        if not isinstance(payload, dict):
+            return _ShardResult(line_count, error_kind=_NOT_AN_OBJECT, error_line=line_count)
+        add(EvalRecord.from_dict(payload))
+    return _ShardResult(line_count, payload=sink)
+
+
+def _parse_shards(
+    path: Path,
+    workers: int,
+    chunk_size: int,
+    as_records: bool,
+    group_by: tuple[str, ...] = (),
+) -> list[Any]:
+    if not path.exists():
+        raise FileNotFoundError(f'Input file not found: {path}')
+    compressed = compression_for(path) is not None
+    # Compressed input has no byte offsets to split on, so it is decompressed and parsed as
+    # one stream in-process.
+    tasks = (
+        []
+        if compressed
+        else [
+            (str(path), start, end, as_records, group_by)
+            for start, end in plan_byte_ranges(path, chunk_size)
+        ]
+    )
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(tasks) > 1 else None
+    handle = open_text(path) if compressed else None
+    try:
+        results: Iterable[_ShardResult]
+        if handle is not None:
+            results = [_parse_lines(handle, as_records, group_by)]
+        elif executor is not None:
+            results = executor.map(_parse_byte_range, tasks)
+        else:
+            results = map(_parse_byte_range, tasks)
+        payloads: list[Any] = []
+        lines_before = 0
+        for result in results:
+            if result.error_kind is not None:
+                line_number = lines_before + result.error_line
+                if result.error_kind == _INVALID_JSON:
+                    raise ValueError(f'Invalid JSONL at line {line_number} in {path}')
+                raise ValueError(
+                    f'Each JSONL line must be an object (line {line_number} in {path})'
+                )
+            lines_before += result.line_count
+            if result.payload is not None:
+                payloads.append(result.payload)
+        return payloads
+    finally:
+        if handle is not None:
+            handle.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def load_eval_records_parallel(
+    path: Path, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> list[EvalRecord]:
+    """Parse ``path`` across a process pool and return records in file order."""
+    records: list[EvalRecord] = []
+    for batch in _parse_shards(path, workers or os.cpu_count() or 1, chunk_size, True):
+        records.extend(batch)
+    return records
+
+
+def load_eval_batch_parallel(
+    path: Path, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> EvalRecordBatch:
+    """Columnar variant of ``load_eval_records_parallel``; one worker parses in-process.
+
+    Each shard comes back as an ``EvalRecordBatch`` and the columns are concatenated in
+    file order, so no ``EvalRecord`` list is built for the whole file.
+    """
+    if workers is not None and workers <= 1:
+        return load_eval_batch(path)
+    return EvalRecordBatch.concat(
+        _parse_shards(path, workers or os.cpu_count() or 1, chunk_size, True)
+    )
+
+
+def accumulate_eval_records_parallel(
+    path: Path, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> EvalMetricsAccumulator:
+    """Parse ``path`` across a process pool, merging per-shard metric partials."""
+    accumulator = EvalMetricsAccumulator()
+    for partial in _parse_shards(path, workers or os.cpu_count() or 1, chunk_size, False):
+        accumulator.merge(partial)
+    return accumulator
+
+
+def accumulate_eval_groups_parallel(
+    path: Path,
+    group_by: Sequence[str],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> GroupedEvalAccumulator:
+    """Grouped variant of ``accumulate_eval_records_parallel``."""
+    accumulator = GroupedEvalAccumulator(tuple(group_by))
+    for partial in _parse_shards(
+        path, workers or os.cpu_count() or 1, chunk_size, False, accumulator.group_by
+    ):
+        accumulator.merge(partial)
+    return accumulator
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import contextlib
+import http.client
+import json
+import math
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from .contracts import EvalRecord, EvalRecordBatch, EvalThresholds
+from .http_pool import HttpConnectionPool, HttpResponse, backoff_delay, parse_retry_after
+from .ingest_sql import (
+    RUN_COMPLETION_COLUMNS,
+    RUN_KEY_COLUMNS,
+    RUN_PASSED_STATUS,
+    RUN_TIMESTAMP_NOW,
+    EvalIngestContext,
+    SampleDedupePlan,
+    build_eval_run_row,
+    iter_eval_sample_json,
+)
+from .instrumentation import span
+from .runner import EvalMetricsAccumulator
+
+DEFAULT_BATCH_SIZE = 1_000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_SECONDS = 0.5
+
+# Status written for a run whose samples could not all be inserted.
+_RUN_ABORTED_STATUS = {'sitecraft': 'failed', 'v2': 'aborted'}
+# PostgREST upsert modes for a deduplicated ingest: skip stored samples, refresh the run.
+_DEDUPE_SAMPLES_PATH = '/rest/v1/ai_eval_samples?on_conflict=dedupe_key'
+_DEDUPE_SAMPLES_PREFER = 'return=minimal,resolution=ignore-duplicates'
+_DEDUPE_RUN_PREFER = 'return=minimal,resolution=merge-duplicates'
+# ai_eval_samples columns read back to recompute a merged run; SiteCraft samples keep
+# fallback_used in their metadata.
+_RUN_SAMPLE_SELECT = {
+    'sitecraft': (
+        'dedupe_key,schema_valid,patch_apply_success,edited_after_generate,'
+        'published_within_7d,safety_html_tailwind_compliant,'
+        'fallback_used:metadata->fallbackUsed,latency_ms'
+    ),
+    'v2': (
+        'dedupe_key,schema_valid,patch_apply_success,edited_after_generate,'
+        'published_within_7d,safety_html_tailwind_compliant,fallback_used,latency_ms'
+    ),
+}
+
+
+class RestIngestError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    index: int
+    rows: int
+    request_bytes: int
+    attempts: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'index': self.index,
+            'rows': self.rows,
+            'request_bytes': self.request_bytes,
+            'attempts': self.attempts,
+            'seconds': round(self.seconds, 6),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+@dataclass(slots=True)
+class RestIngestResult:
+    run_id: str
+    status: str
+    batches: list[BatchResult] = field(default_factory=list)
+    seconds: float = 0.0
+    connections_opened: int = 0
+
+    @property
+    def rows(self) -> int:
+        return sum(batch.rows for batch in self.batches)
+
+    def as_dict(self) -> dict[str, Any]:
+        latencies = sorted(batch.seconds for batch in self.batches)
+        p95_index = max(0, math.ceil(0.95 * len(latencies)) - 1)
+        return {
+            'run_id': self.run_id,
+            'status': self.status,
+            'rows': self.rows,
+            'seconds': round(self.seconds, 6),
+            'rows_per_second': round(self.rows / self.seconds, 1) if self.seconds > 0 else 0.0,
+            'connections_opened': self.connections_opened,
+            'retries': sum(batch.attempts - 1 for batch in self.batches),
+            'batch_seconds_p50': round(latencies[len(latencies) // 2], 6) if latencies else None,
+            'batch_seconds_p95': round(latencies[p95_index], 6) if latencies else None,
+            'batch_seconds_max': round(latencies[-1], 6) if latencies else None,
+            'batches': [
+                batch.as_dict() for batch in sorted(self.batches, key=lambda batch: batch.index)
+            ],
+        }
+
+
+def rest_headers(service_role_key: str) -> dict[str, str]:
+    return {
+        'apikey': service_role_key,
+        'Authorization': f'Bearer {service_role_key}',
+        'Content-Type': 'application/json',
+        'Prefer': 'return=minimal',
+    }
+
+
+def send_with_retry(
+    pool: HttpConnectionPool,
+    method: str,
+    path: str,
+    body: bytes | None,
+    headers: dict[str, str],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+) -> tuple[HttpResponse, int]:
+    """Send a request, retrying connection errors and transient statuses with backoff.
+
+    Retries wait a full-jitter exponential ``backoff_delay``, or the server's
+    ``Retry-After`` if that is longer. Returns ``(response, attempts)``. Raises
+    ``RestIngestError`` on a non-transient error status or once ``max_retries`` retries
+    are used up.
+    """
+    last_error = ''
+    retry_after: float | None = None
+    for attempt in range(max_retries + 1):
+        if attempt:
+            time.sleep(max(backoff_delay(attempt, backoff_seconds), retry_after or 0.0))
+            retry_after = None
+        try:
+            response = pool.request(method, path, body=body, headers=headers)
+        except (OSError, http.client.HTTPException) as exc:
+            last_error = f'{type(exc).__name__}: {exc}'
+            continue
+        if response.ok:
+            return response, attempt + 1
+        last_error = f'HTTP {response.status}: {response.body[:500].decode("utf-8", "replace")}'
+        if not response.transient:
+            raise RestIngestError(f'{method} {path} failed with {last_error}')
+        retry_after = parse_retry_after(response.headers.get('retry-after'))
+    raise RestIngestError(f'{method} {path} failed after {max_retries + 1} attempts: {last_error}')
+
+
+def count_run_samples(
+    pool: HttpConnectionPool,
+    run_id: str,
+    headers: dict[str, str],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+) -> int:
+    """Number of ``ai_eval_samples`` rows stored for ``run_id``, from PostgREST's exact count.
+
+    Sends a ``HEAD`` request, so no rows are transferred; the total is the part after the
+    ``/`` in the ``Content-Range`` response header.
+    """
+    response, _ = send_with_retry(
+        pool,
+        'HEAD',
+        f'/rest/v1/ai_eval_samples?run_id=eq.{run_id}&select=run_id',
+        None,
+        {**headers, 'Prefer': 'count=exact'},
+        max_retries,
+        backoff_seconds,
+    )
+    content_range = response.headers.get('content-range', '')
+    total = content_range.rpartition('/')[2]
+    if not total.isdigit():
+        raise RestIngestError(f'ai_eval_samples count returned Content-Range {content_range!r}')
+    return int(total)
+
+
+def accumulate_run_samples(
+    pool: HttpConnectionPool,
+    run_id: str,
+    schema_variant: str,
+    headers: dict[str, str],
+    page_size: int = DEFAULT_BATCH_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+) -> EvalMetricsAccumulator:
+    """Fold every keyed ``ai_eval_samples`` row of ``run_id`` into an accumulator.
+
+    Reads only the metric columns, ``page_size`` rows at a time with keyset pagination on
+    ``dedupe_key``. Samples stored without a key are not read.
+    """
+    accumulator = EvalMetricsAccumulator()
+    add_values = accumulator.add_values
+    base_path = (
+        f'/rest/v1/ai_eval_samples?run_id=eq.{run_id}&select={_RUN_SAMPLE_SELECT[schema_variant]}'
+        f'&order=dedupe_key.asc&limit={page_size}'
+    )
+    cursor_filter = '&dedupe_key=not.is.null'
+    with span('rest_ingest.accumulate_run_samples') as stage:
+        while True:
+            response, _ = send_with_retry(
+                pool, 'GET', base_path + cursor_filter, None, headers, max_retries, backoff_seconds
+            )
+            rows = json.loads(response.body)
+            for row in rows:
+                add_values(
+                    bool(row['schema_valid']),
+                    bool(row['patch_apply_success']),
+                    bool(row['edited_after_generate']),
+                    bool(row['published_within_7d']),
+                    bool(row['safety_html_tailwind_compliant']),
+                    row['fallback_used'] is True,
+                    row['latency_ms'],
+                )
+            stage.add_rows(len(rows))
+            if len(rows) < page_size:
+                return accumulator
+            cursor_filter = f'&dedupe_key=gt.{rows[-1]["dedupe_key"]}'
+
+
+def iter_sample_batches(
+    records: list[EvalRecord] | EvalRecordBatch,
+    run_id: str,
+    schema_variant: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dedupe: SampleDedupePlan | None = None,
+) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(row_count, body)`` JSON-array request bodies of up to ``batch_size`` samples."""
+    if batch_size <= 0:
+        raise ValueError('batch_size must be > 0')
+    pending: list[str] = []
+    for sample in iter_eval_sample_json(records, run_id, schema_variant, dedupe=dedupe):
+        pending.append(sample)
+        if len(pending) == batch_size:
+            yield len(pending), ('[' + ','.join(pending) + ']').encode('utf-8')
+            pending.clear()
+    if pending:
+        yield len(pending), ('[' + ','.join(pending) + ']').encode('utf-8')
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def ingest_eval_run_rest(
+    supabase_url: str,
+    service_role_key: str,
+    records: list[EvalRecord] | EvalRecordBatch,
+    thresholds: EvalThresholds,
+    context: EvalIngestContext,
+    report: dict[str, Any] | None = None,
+    run_id: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    timeout: float = 30.0,
+    on_batch: Callable[[BatchResult], None] | None = None,
+    dedupe: SampleDedupePlan | None = None,
+) -> RestIngestResult:
+    """Insert an eval run and its samples through the Supabase REST API (PostgREST).
+
+    The run row is inserted first with status ``running``; samples are then POSTed to
+    ``/rest/v1/ai_eval_samples`` as JSON arrays of ``batch_size`` rows, with up to
+    ``concurrency`` requests in flight over pooled keep-alive connections, and the run is
+    finally patched to its gate status. Before that patch the stored sample count is checked
+    against what was sent: a retried POST whose first attempt was applied despite a timeout,
+    reset or gateway error would otherwise leave duplicate samples behind. If a batch still
+    fails after ``max_retries`` retries, or the count does not match, the run is marked
+    failed/aborted and ``RestIngestError`` is raised.
+    ``on_batch`` is called (from worker threads) as each batch completes.
+    With a ``dedupe`` plan only its kept samples are sent, as ``on_conflict=dedupe_key``
+    inserts that ignore stored duplicates, and the run row is upserted, so an overlapping
+    input merges into an existing run. The run must then hold at least the plan's distinct
+    samples, all of them keyed, and its record count, metrics and status are recomputed
+    from the stored samples (as ``render_eval_run_refresh`` does in SQL); ``status`` of
+    the result is the recomputed one.
+    """
+    if concurrency <= 0:
+        raise ValueError('concurrency must be > 0')
+    if batch_size <= 0:
+        raise ValueError('batch_size must be > 0')
+    run_row, active_run_id, status = build_eval_run_row(
+        records, thresholds, context, report=report, run_id=run_id, dedupe=dedupe
+    )
+    variant = context.schema_variant
+    completion_column = RUN_COMPLETION_COLUMNS[variant]
+    final_status = run_row['status']
+    run_row = {
+        column: _utc_now_iso() if value is RUN_TIMESTAMP_NOW else value
+        for column, value in run_row.items()
+    }
+    run_row['status'] = 'running'
+    run_row[completion_column] = None
+    run_path = f'/rest/v1/ai_eval_runs?{RUN_KEY_COLUMNS[variant]}=eq.{active_run_id}'
+
+    headers = rest_headers(service_role_key)
+    run_headers = sample_headers = headers
+    samples_path = '/rest/v1/ai_eval_samples'
+    if dedupe is not None:
+        run_headers = {**headers, 'Prefer': _DEDUPE_RUN_PREFER}
+        sample_headers = {**headers, 'Prefer': _DEDUPE_SAMPLES_PREFER}
+        samples_path = _DEDUPE_SAMPLES_PATH
+    result = RestIngestResult(run_id=active_run_id, status=status)
+    started = time.perf_counter()
+    with HttpConnectionPool(supabase_url, max_connections=concurrency, timeout=timeout) as pool:
+
+        def send(
+            method: str, path: str, payload: dict[str, Any], headers: dict[str, str] = headers
+        ) -> None:
+            body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+            send_with_retry(pool, method, path, body, headers, max_retries, backoff_seconds)
+
+        def post_batch(index: int, rows: int, body: bytes) -> BatchResult:
+            batch_started = time.perf_counter()
+            _, attempts = send_with_retry(
+                pool,
+                'POST',
+                samples_path,
+                body,
+                sample_headers,
+                max_retries,
+                backoff_seconds,
+            )
+            batch = BatchResult(
+                index=index,
+                rows=rows,
+                request_bytes=len(body),
+                attempts=attempts,
+                seconds=time.perf_counter() - batch_started,
+            )
+            if on_batch is not None:
+                on_batch(batch)
+            return batch
+
+        send('POST', '/rest/v1/ai_eval_runs', run_row, run_headers)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            with span('rest_ingest.post_samples', rows=len(records)):
+                # Keep a bounded number of rendered bodies queued so memory stays flat.
+                in_flight: set[Future[BatchResult]] = set()
+                batches = iter_sample_batches(
+                    records, active_run_id, variant, batch_size, dedupe=dedupe
+                )
+                for index, (rows, body) in enumerate(batches):
+                    if len(in_flight) >= 2 * concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        result.batches.extend(future.result() for future in done)
+                    in_flight.add(executor.submit(post_batch, index, rows, body))
+                for future in in_flight:
+                    result.batches.append(future.result())
+            stored = count_run_samples(pool, active_run_id, headers, max_retries, backoff_seconds)
+            final_patch: dict[str, Any] = {'status': final_status}
+            if dedupe is None:
+                # Nothing stops a retried batch from being stored twice.
+                if stored != result.rows:
+                    raise RestIngestError(
+                        f'ai_eval_samples holds {stored} rows for run {active_run_id}, '
+                        f'expected {result.rows}'
+                    )
+            else:
+                if stored < dedupe.distinct:
+                    raise RestIngestError(
+                        f'ai_eval_samples holds {stored} rows for run {active_run_id}, '
+                        f'expected at least {dedupe.distinct}'
+                    )
+                accumulator = accumulate_run_samples(
+                    pool, active_run_id, variant, headers, batch_size, max_retries, backoff_seconds
+                )
+                if accumulator.record_count != stored:
+                    raise RestIngestError(
+                        f'ai_eval_samples holds {stored - accumulator.record_count} rows '
+                        f'without a dedupe_key for run {active_run_id}'
+                    )
+                run_report = accumulator.build_report(thresholds)
+                result.status = 'passed' if run_report['overall_pass'] else 'failed'
+                final_patch = {
+                    'status': RUN_PASSED_STATUS[variant] if result.status == 'passed' else 'failed',
+                    'metadata': {
+                        **run_row['metadata'],
+                        'recordCount': run_report['record_count'],
+                        'metrics': run_report['metrics'],
+                        'gates': run_report['gates'],
+                    },
+                }
+                if variant == 'sitecraft':
+                    final_patch['metrics'] = run_report['metrics']
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            with contextlib.suppress(RestIngestError):
+                send('PATCH', run_path, {'status': _RUN_ABORTED_STATUS[variant]})
+            raise
+        executor.shutdown()
+        send('PATCH', run_path, {**final_patch, completion_column: _utc_now_iso()})
+        result.connections_opened = pool.connections_opened
+    result.seconds = time.perf_counter() - started
+    return result
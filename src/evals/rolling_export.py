@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .compressed_io import compression_for, open_text
+from .instrumentation import span
+
+STATE_VERSION = 1
+STATE_NAME = 'state.json'
+SEGMENTS_DIR = 'segments'
+
+
+class ExportStateError(ValueError):
+    """Raised when a rolling export state file is unreadable or inconsistent."""
+
+
+def source_filter_key(sources: Iterable[str]) -> str:
+    return ','.join(sorted(set(sources)))
+
+
+def _timestamp(value: Any) -> datetime:
+    return datetime.fromisoformat(str(value))
+
+
+@dataclass(frozen=True, slots=True)
+class ExportWatermark:
+    """Newest exported ``created_at`` for a source filter, plus the ids already exported at
+    exactly that instant, so rows sharing the timestamp are neither repeated nor lost
+    whatever the id type."""
+
+    created_at: str
+    ids: tuple[str, ...]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'created_at': self.created_at, 'ids': list(self.ids)}
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> ExportWatermark:
+        return ExportWatermark(
+            created_at=str(payload['created_at']),
+            ids=tuple(str(value) for value in payload['ids']),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSegment:
+    name: str
+    source_key: str
+    rows: int
+    min_created_at: str
+    max_created_at: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'source_key': self.source_key,
+            'rows': self.rows,
+            'min_created_at': self.min_created_at,
+            'max_created_at': self.max_created_at,
+        }
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> DatasetSegment:
+        return DatasetSegment(
+            name=str(payload['name']),
+            source_key=str(payload['source_key']),
+            rows=int(payload['rows']),
+            min_created_at=str(payload['min_created_at']),
+            max_created_at=str(payload['max_created_at']),
+        )
+
+
+class _WatermarkTracker:
+    """Filters rows already covered by a watermark and tracks the advanced watermark."""
+
+    __slots__ = ('_after', '_seen_ids', 'newest', 'newest_ids', 'oldest')
+
+    def __init__(self, watermark: ExportWatermark | None) -> None:
+        self._after = _timestamp(watermark.created_at) if watermark else None
+        self._seen_ids = frozenset(watermark.ids) if watermark else frozenset()
+        self.newest: tuple[datetime, str] | None = (
+            (self._after, watermark.created_at) if watermark and self._after else None
+        )
+        self.newest_ids: set[str] = set(self._seen_ids)
+        self.oldest: tuple[datetime, str] | None = None
+
+    def admit(self, row: dict[str, Any]) -> bool:
+        created_at = _timestamp(row['created_at'])
+        row_id = str(row['id'])
+        if self._after is not None and (
+            created_at < self._after or (created_at == self._after and row_id in self._seen_ids)
+        ):
+            return False
+        if self.newest is None or created_at > self.newest[0]:
+            self.newest = (created_at, str(row['created_at']))
+            self.newest_ids = {row_id}
+        elif created_at == self.newest[0]:
+            self.newest_ids.add(row_id)
+        if self.oldest is None or created_at < self.oldest[0]:
+            self.oldest = (created_at, str(row['created_at']))
+        return True
+
+    def watermark(self) -> ExportWatermark | None:
+        if self.newest is None:
+            return None
+        return ExportWatermark(created_at=self.newest[1], ids=tuple(sorted(self.newest_ids)))
+
+
+def _segment_name(suffix: str = '') -> str:
+    return f'{datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")}{suffix}.jsonl'
+
+
+def _write_atomic(path: Path, write: Callable[[Any], Any]) -> None:
+    # The temp file keeps a compression suffix so it is written in the target's format.
+    suffix = '.tmp' + (path.suffix if compression_for(path) else '')
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix=suffix)
+    os.close(descriptor)
+    try:
+        with open_text(Path(temp_name), 'w') as handle:
+            write(handle)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+class RollingDataset:
+    """Eval records exported incrementally into a directory of JSONL segments.
+
+    ``state.json`` holds a watermark per source filter and the list of committed segments.
+    Each ``append`` writes only rows newer than the watermark to a new segment, then commits
+    the segment and the advanced watermark together; segment files not listed in the
+    state (left by an interrupted run) are discarded on load.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.segments_dir = directory / SEGMENTS_DIR
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.watermarks: dict[str, ExportWatermark] = {}
+        self.segments: list[DatasetSegment] = []
+        state_path = directory / STATE_NAME
+        if state_path.exists():
+            try:
+                payload = json.loads(state_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as error:
+                raise ExportStateError(f'Unreadable export state: {state_path}') from error
+            if not isinstance(payload, dict) or payload.get('version') != STATE_VERSION:
+                raise ExportStateError(f'Unsupported export state version in {state_path}')
+            try:
+                self.watermarks = {
+                    key: ExportWatermark.from_dict(value)
+                    for key, value in payload['watermarks'].items()
+                }
+                self.segments = [DatasetSegment.from_dict(item) for item in payload['segments']]
+            except (AttributeError, KeyError, TypeError, ValueError) as error:
+                raise ExportStateError(f'Malformed export state: {state_path}') from error
+        committed = {segment.name for segment in self.segments}
+        for path in self.segments_dir.iterdir():
+            if path.name not in committed:
+                path.unlink()
+        for segment in self.segments:
+            if not (self.segments_dir / segment.name).exists():
+                raise ExportStateError(f'Missing dataset segment: {segment.name}')
+
+    def _save_state(self) -> None:
+        payload = {
+            'version': STATE_VERSION,
+            'watermarks': {key: value.as_dict() for key, value in self.watermarks.items()},
+            'segments': [segment.as_dict() for segment in self.segments],
+        }
+
+        def write(handle: Any) -> None:
+            json.dump(payload, handle, indent=2)
+            handle.write('\n')
+
+        _write_atomic(self.directory / STATE_NAME, write)
+
+    def watermark(self, sources: Iterable[str]) -> ExportWatermark | None:
+        return self.watermarks.get(source_filter_key(sources))
+
+    def segments_for(self, sources: Iterable[str]) -> list[DatasetSegment]:
+        """Committed segments of the source filter, newest first."""
+        return self._segments_for(source_filter_key(sources))
+
+    def segment_path(self, segment: DatasetSegment) -> Path:
+        return self.segments_dir / segment.name
+
+    def _segments_for(self, source_key: str) -> list[DatasetSegment]:
+        # Newest first, matching the row order inside each segment.
+        return sorted(
+            (segment for segment in self.segments if segment.source_key == source_key),
+            key=lambda segment: (_timestamp(segment.max_created_at), segment.name),
+            reverse=True,
+        )
+
+    def append(
+        self,
+        sources: Iterable[str],
+        rows: Iterable[dict[str, Any]],
+        transform: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> DatasetSegment | None:
+        """Write rows newer than the watermark (as ``transform``-ed JSONL) to a new segment.
+
+        Returns the committed segment, or ``None`` when there was nothing new.
+        """
+        source_key = source_filter_key(sources)
+        tracker = _WatermarkTracker(self.watermarks.get(source_key))
+        name = _segment_name()
+        path = self.segments_dir / name
+        count = 0
+        with span('rolling_export.append') as stage:
+            try:
+                with path.open('w', encoding='utf-8') as handle:
+                    write = handle.write
+                    for row in rows:
+                        if tracker.admit(row):
+                            write(json.dumps(transform(row), separators=(',', ':')) + '\n')
+                            count += 1
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+            stage.add_rows(count)
+        watermark = tracker.watermark()
+        if not count or watermark is None or tracker.oldest is None:
+            path.unlink()
+            return None
+        segment = DatasetSegment(
+            name=name,
+            source_key=source_key,
+            rows=count,
+            min_created_at=tracker.oldest[1],
+            max_created_at=watermark.created_at,
+        )
+        self.segments.append(segment)
+        self.watermarks[source_key] = watermark
+        self._save_state()
+        return segment
+
+    def compact(self, sources: Iterable[str], retain_since_iso: str | None = None) -> int:
+        """Drop segments entirely older than ``retain_since_iso`` and merge the rest into one.
+
+        Returns the number of segments removed.
+        """
+        source_key = source_filter_key(sources)
+        segments = self._segments_for(source_key)
+        cutoff = _timestamp(retain_since_iso) if retain_since_iso else None
+        kept = [
+            segment
+            for segment in segments
+            if cutoff is None or _timestamp(segment.max_created_at) >= cutoff
+        ]
+        if len(kept) == len(segments) and len(kept) <= 1:
+            return 0
+        merged: DatasetSegment | None = None
+        if kept:
+            merged = replace(
+                kept[0],
+                name=_segment_name('-compacted'),
+                rows=sum(segment.rows for segment in kept),
+                min_created_at=kept[-1].min_created_at,
+            )
+            with span('rolling_export.compact', rows=merged.rows):
+                _write_atomic(
+                    self.segments_dir / merged.name,
+                    lambda handle: self._copy_segments(kept, handle),
+                )
+        self.segments = [
+            segment for segment in self.segments if segment.source_key != source_key
+        ] + ([merged] if merged else [])
+        self._save_state()
+        for segment in segments:
+            (self.segments_dir / segment.name).unlink(missing_ok=True)
+        return len(segments) - (1 if merged else 0)
+
+    def _copy_segments(self, segments: list[DatasetSegment], handle: Any) -> int:
+        rows = 0
+        for segment in segments:
+            with (self.segments_dir / segment.name).open(encoding='utf-8') as source:
+                for line in source:
+                    handle.write(line)
+                    rows += 1
+        return rows
+
+    def write_combined(self, sources: Iterable[str], output: Path) -> int:
+        """Write every segment of the source filter, newest first, to ``output``.
+
+        ``output`` is compressed when its suffix is ``.gz`` or ``.zst``.
+        """
+        segments = self._segments_for(source_filter_key(sources))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        rows = 0
+
+        def write(handle: Any) -> None:
+            nonlocal rows
+            rows = self._copy_segments(segments, handle)
+
+        with span('rolling_export.write_combined') as stage:
+            _write_atomic(output, write)
+            stage.add_rows(rows)
+        return rows
@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import json
-import math
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
-from .contracts import EvalRecord, EvalThresholds
+from .compressed_io import open_text
+from .contracts import EvalRecord, EvalRecordBatch, EvalThresholds, count_true
+from .instrumentation import span
+from .sketch import LatencySketch
 
 
-def load_eval_records(path: Path) -> list[EvalRecord]:
+def iter_eval_records(path: Path) -> Iterator[EvalRecord]:
     if not path.exists():
         raise FileNotFoundError(f'Input file not found: {path}')
+    return _iter_eval_records(path)
+
 
-    records: list[EvalRecord] = []
-    with path.open('r', encoding='utf-8') as handle:
+def _iter_eval_records(path: Path) -> Iterator[EvalRecord]:
+    with open_text(path) as handle:
         for line_number, raw_line in enumerate(handle, start=1):
             line = raw_line.strip()
             if not line:
@@ -27,43 +34,343 @@ def load_eval_records(path: Path) -> list[EvalRecord]:
                 raise ValueError(
                     f'Each JSONL line must be an object (line {line_number} in {path})'
                 )
-            records.append(EvalRecord.from_dict(payload))
+            yield EvalRecord.from_dict(payload)
+
+
+def load_eval_records(path: Path) -> list[EvalRecord]:
+    with span('runner.load_eval_records') as stage:
+        records = list(iter_eval_records(path))
+        stage.add_rows(len(records))
     return records
 
 
-def _rate(values: list[bool]) -> float:
-    if not values:
+def load_eval_batch(path: Path) -> EvalRecordBatch:
+    with span('runner.load_eval_batch') as stage:
+        batch = EvalRecordBatch.from_records(iter_eval_records(path))
+        stage.add_rows(len(batch))
+    return batch
+
+
+def _rate(count: int, total: int) -> float:
+    if not total:
         return 0.0
-    return round(sum(1 for value in values if value) / len(values), 4)
+    return round(count / total, 4)
 
 
-def compute_metric_rates(records: list[EvalRecord]) -> dict[str, float]:
-    return {
-        'schema_valid_rate': _rate([record.schema_valid for record in records]),
-        'patch_apply_success': _rate([record.patch_apply_success for record in records]),
-        'edit_after_generate_rate': _rate([record.edited_after_generate for record in records]),
-        'publish_conversion_proxy': _rate([record.published_within_7d for record in records]),
-        'safety_html_tailwind_compliance': _rate(
-            [record.safety_html_tailwind_compliant for record in records]
-        ),
-    }
+@dataclass(slots=True)
+class EvalMetricsAccumulator:
+    """Single-pass, mergeable counters behind every eval report metric."""
 
+    record_count: int = 0
+    schema_valid_count: int = 0
+    patch_apply_success_count: int = 0
+    edited_after_generate_count: int = 0
+    published_within_7d_count: int = 0
+    safety_html_tailwind_compliant_count: int = 0
+    fallback_used_count: int = 0
+    latency: LatencySketch = field(default_factory=LatencySketch)
 
-def _p95(values: list[int]) -> int | None:
-    if not values:
-        return None
-    ordered = sorted(values)
-    rank = math.ceil(0.95 * len(ordered)) - 1
-    rank = max(0, min(rank, len(ordered) - 1))
-    return ordered[rank]
+    def add(self, record: EvalRecord) -> None:
+        self.record_count += 1
+        if record.schema_valid:
+            self.schema_valid_count += 1
+        if record.patch_apply_success:
+            self.patch_apply_success_count += 1
+        if record.edited_after_generate:
+            self.edited_after_generate_count += 1
+        if record.published_within_7d:
+            self.published_within_7d_count += 1
+        if record.safety_html_tailwind_compliant:
+            self.safety_html_tailwind_compliant_count += 1
+        if record.fallback_used:
+            self.fallback_used_count += 1
+        latency_ms = record.latency_ms
+        if latency_ms is not None and latency_ms >= 0:
+            self.latency.add(latency_ms)
 
+    def add_values(
+        self,
+        schema_valid: int,
+        patch_apply_success: int,
+        edited_after_generate: int,
+        published_within_7d: int,
+        safety_html_tailwind_compliant: int,
+        fallback_used: int,
+        latency_ms: int | None,
+    ) -> None:
+        self.record_count += 1
+        self.schema_valid_count += schema_valid
+        self.patch_apply_success_count += patch_apply_success
+        self.edited_after_generate_count += edited_after_generate
+        self.published_within_7d_count += published_within_7d
+        self.safety_html_tailwind_compliant_count += safety_html_tailwind_compliant
+        self.fallback_used_count += fallback_used
+        if latency_ms is not None and latency_ms >= 0:
+            self.latency.add(latency_ms)
+
+    def add_batch(self, batch: EvalRecordBatch) -> EvalMetricsAccumulator:
+        self.record_count += len(batch)
+        self.schema_valid_count += count_true(batch.schema_valid)
+        self.patch_apply_success_count += count_true(batch.patch_apply_success)
+        self.edited_after_generate_count += count_true(batch.edited_after_generate)
+        self.published_within_7d_count += count_true(batch.published_within_7d)
+        self.safety_html_tailwind_compliant_count += count_true(
+            batch.safety_html_tailwind_compliant
+        )
+        self.fallback_used_count += count_true(batch.fallback_used)
+        self.latency.update(batch.valid_latencies())
+        return self
+
+    def update(self, records: Iterable[EvalRecord]) -> EvalMetricsAccumulator:
+        with span('runner.accumulate') as stage:
+            previous_count = self.record_count
+            if isinstance(records, EvalRecordBatch):
+                self.add_batch(records)
+            else:
+                add = self.add
+                for record in records:
+                    add(record)
+            stage.add_rows(self.record_count - previous_count)
+        return self
+
+    def merge(self, other: EvalMetricsAccumulator) -> EvalMetricsAccumulator:
+        self.record_count += other.record_count
+        self.schema_valid_count += other.schema_valid_count
+        self.patch_apply_success_count += other.patch_apply_success_count
+        self.edited_after_generate_count += other.edited_after_generate_count
+        self.published_within_7d_count += other.published_within_7d_count
+        self.safety_html_tailwind_compliant_count += other.safety_html_tailwind_compliant_count
+        self.fallback_used_count += other.fallback_used_count
+        self.latency.merge(other.latency)
+        return self
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'record_count': self.record_count,
+            'schema_valid_count': self.schema_valid_count,
+            'patch_apply_success_count': self.patch_apply_success_count,
+            'edited_after_generate_count': self.edited_after_generate_count,
+            'published_within_7d_count': self.published_within_7d_count,
+            'safety_html_tailwind_compliant_count': self.safety_html_tailwind_compliant_count,
+            'fallback_used_count': self.fallback_used_count,
+            'latency': self.latency.as_dict(),
+        }
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> EvalMetricsAccumulator:
+        return EvalMetricsAccumulator(
+            record_count=int(payload['record_count']),
+            schema_valid_count=int(payload['schema_valid_count']),
+            patch_apply_success_count=int(payload['patch_apply_success_count']),
+            edited_after_generate_count=int(payload['edited_after_generate_count']),
+            published_within_7d_count=int(payload['published_within_7d_count']),
+            safety_html_tailwind_compliant_count=int(
+                payload['safety_html_tailwind_compliant_count']
+            ),
+            fallback_used_count=int(payload['fallback_used_count']),
+            latency=LatencySketch.from_dict(payload['latency']),
+        )
+
+    def metric_rates(self) -> dict[str, float]:
+        total = self.record_count
+        return {
+            'schema_valid_rate': _rate(self.schema_valid_count, total),
+            'patch_apply_success': _rate(self.patch_apply_success_count, total),
+            'edit_after_generate_rate': _rate(self.edited_after_generate_count, total),
+            'publish_conversion_proxy': _rate(self.published_within_7d_count, total),
+            'safety_html_tailwind_compliance': _rate(
+                self.safety_html_tailwind_compliant_count, total
+            ),
+        }
+
+    def operational_metrics(self) -> dict[str, float | int | None]:
+        return {
+            'fallback_rate': _rate(self.fallback_used_count, self.record_count),
+            'p50_latency_ms': self.latency.quantile(0.50),
+            'p90_latency_ms': self.latency.quantile(0.90),
+            'p95_latency_ms': self.latency.quantile(0.95),
+            'p99_latency_ms': self.latency.quantile(0.99),
+        }
+
+    def summarize(self, thresholds: EvalThresholds) -> dict[str, Any]:
+        quality_metrics = self.metric_rates()
+        operational_metrics = self.operational_metrics()
+        quality_gates = _gate_quality_metrics(quality_metrics, thresholds)
+        operational_gates = _gate_operational_metrics(operational_metrics, thresholds)
+        gates = {**quality_gates, **operational_gates}
+        return {
+            'record_count': self.record_count,
+            'metrics': {**quality_metrics, **operational_metrics},
+            'gates': gates,
+            'overall_pass': all(gates.values()),
+        }
+
+    def build_report(self, thresholds: EvalThresholds | None = None) -> dict[str, Any]:
+        effective_thresholds = thresholds or EvalThresholds()
+        with span('runner.summarize', rows=self.record_count):
+            summary = self.summarize(effective_thresholds)
+        return {
+            'generated_at': datetime.now(UTC).isoformat(),
+            'record_count': summary['record_count'],
+            'metrics': summary['metrics'],
+            'thresholds': effective_thresholds.as_dict(),
+            'gates': summary['gates'],
+            'overall_pass': summary['overall_pass'],
+        }
+
+
+EVAL_GROUP_BY_FIELDS = (
+    'requested_provider',
+    'selected_provider',
+    'route_strategy',
+    'tenant_id',
+    'route_id',
+    'model_id',
+    'model_version_id',
+)
+
+GroupKey = tuple[str | None, ...]
 
-def compute_operational_metrics(records: list[EvalRecord]) -> dict[str, float | int | None]:
-    latency_samples = [record.latency_ms for record in records if record.latency_ms is not None]
-    return {
-        'fallback_rate': _rate([record.fallback_used for record in records]),
-        'p95_latency_ms': _p95([value for value in latency_samples if value >= 0]),
-    }
+
+def _group_sort_key(key: GroupKey) -> tuple[tuple[bool, str], ...]:
+    return tuple((value is not None, value or '') for value in key)
+
+
+@dataclass(slots=True)
+class GroupedEvalAccumulator:
+    """One-pass hash aggregation of eval metrics per ``group_by`` key tuple."""
+
+    group_by: tuple[str, ...]
+    groups: dict[GroupKey, EvalMetricsAccumulator] = field(default_factory=dict)
+    _key_getter: attrgetter = field(init=False, repr=False)
+    _single_field: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.group_by = tuple(self.group_by)
+        if not self.group_by:
+            raise ValueError('group_by must name at least one field')
+        unknown = [name for name in self.group_by if name not in EVAL_GROUP_BY_FIELDS]
+        if unknown:
+            raise ValueError(
+                f'Unsupported group_by fields: {unknown}. Must be from {EVAL_GROUP_BY_FIELDS}'
+            )
+        self._key_getter = attrgetter(*self.group_by)
+        self._single_field = len(self.group_by) == 1
+
+    def add(self, record: EvalRecord) -> None:
+        key = self._key_getter(record)
+        if self._single_field:
+            key = (key,)
+        accumulator = self.groups.get(key)
+        if accumulator is None:
+            accumulator = self.groups[key] = EvalMetricsAccumulator()
+        accumulator.add(record)
+
+    def add_batch(self, batch: EvalRecordBatch) -> GroupedEvalAccumulator:
+        columns = [getattr(batch, name) for name in self.group_by]
+        by_codes: dict[tuple[int, ...], EvalMetricsAccumulator] = {}
+        rows = zip(
+            batch.schema_valid,
+            batch.patch_apply_success,
+            batch.edited_after_generate,
+            batch.published_within_7d,
+            batch.safety_html_tailwind_compliant,
+            batch.fallback_used,
+            batch.latency_ms,
+            batch.latency_mask,
+            zip(*(column.codes for column in columns), strict=True),
+            strict=True,
+        )
+        for flags_and_latency in rows:
+            codes = flags_and_latency[8]
+            accumulator = by_codes.get(codes)
+            if accumulator is None:
+                key = tuple(
+                    column.values[code] for column, code in zip(columns, codes, strict=True)
+                )
+                accumulator = self.groups.get(key)
+                if accumulator is None:
+                    accumulator = self.groups[key] = EvalMetricsAccumulator()
+                by_codes[codes] = accumulator
+            accumulator.add_values(
+                *flags_and_latency[:6],
+                flags_and_latency[6] if flags_and_latency[7] else None,
+            )
+        return self
+
+    def update(self, records: Iterable[EvalRecord]) -> GroupedEvalAccumulator:
+        with span('runner.accumulate_groups') as stage:
+            if isinstance(records, EvalRecordBatch):
+                self.add_batch(records)
+                stage.add_rows(len(records))
+            else:
+                add = self.add
+                row_count = 0
+                for record in records:
+                    add(record)
+                    row_count += 1
+                stage.add_rows(row_count)
+        return self
+
+    def merge(self, other: GroupedEvalAccumulator) -> GroupedEvalAccumulator:
+        if other.group_by != self.group_by:
+            raise ValueError('Cannot merge grouped accumulators with different group_by')
+        for key, partial in other.groups.items():
+            accumulator = self.groups.get(key)
+            if accumulator is None:
+                accumulator = self.groups[key] = EvalMetricsAccumulator()
+            accumulator.merge(partial)
+        return self
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'group_by': list(self.group_by),
+            'groups': [
+                {'key': list(key), 'state': self.groups[key].as_dict()}
+                for key in sorted(self.groups, key=_group_sort_key)
+            ],
+        }
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> GroupedEvalAccumulator:
+        accumulator = GroupedEvalAccumulator(tuple(payload['group_by']))
+        for group in payload['groups']:
+            key = tuple(group['key'])
+            if len(key) != len(accumulator.group_by):
+                raise ValueError(f'Group key {key} does not match group_by {accumulator.group_by}')
+            accumulator.groups[key] = EvalMetricsAccumulator.from_dict(group['state'])
+        return accumulator
+
+    def overall(self) -> EvalMetricsAccumulator:
+        total = EvalMetricsAccumulator()
+        for accumulator in self.groups.values():
+            total.merge(accumulator)
+        return total
+
+    def build_report(self, thresholds: EvalThresholds | None = None) -> dict[str, Any]:
+        """Global report plus a ``groups`` list with one summary per key, sorted by key."""
+        effective_thresholds = thresholds or EvalThresholds()
+        report = self.overall().build_report(effective_thresholds)
+        report['group_by'] = list(self.group_by)
+        with span('runner.summarize_groups', rows=len(self.groups)):
+            report['groups'] = [
+                {
+                    'key': dict(zip(self.group_by, key, strict=True)),
+                    **self.groups[key].summarize(effective_thresholds),
+                }
+                for key in sorted(self.groups, key=_group_sort_key)
+            ]
+        return report
+
+
+def compute_metric_rates(records: Iterable[EvalRecord]) -> dict[str, float]:
+    return EvalMetricsAccumulator().update(records).metric_rates()
+
+
+def compute_operational_metrics(
+    records: Iterable[EvalRecord],
+) -> dict[str, float | int | None]:
+    return EvalMetricsAccumulator().update(records).operational_metrics()
 
 
 def _gate_quality_metrics(metrics: dict[str, float], thresholds: EvalThresholds) -> dict[str, bool]:
@@ -96,20 +403,16 @@ def _gate_operational_metrics(
 
 
 def build_eval_report(
-    records: list[EvalRecord], thresholds: EvalThresholds | None = None
+    records: Iterable[EvalRecord], thresholds: EvalThresholds | None = None
 ) -> dict[str, Any]:
-    effective_thresholds = thresholds or EvalThresholds()
-    quality_metrics = compute_metric_rates(records)
-    operational_metrics = compute_operational_metrics(records)
-    metrics = {**quality_metrics, **operational_metrics}
-    quality_gates = _gate_quality_metrics(quality_metrics, effective_thresholds)
-    operational_gates = _gate_operational_metrics(operational_metrics, effective_thresholds)
-    gates = {**quality_gates, **operational_gates}
-    return {
-        'generated_at': datetime.now(UTC).isoformat(),
-        'record_count': len(records),
-        'metrics': metrics,
-        'thresholds': effective_thresholds.as_dict(),
-        'gates': gates,
-        'overall_pass': all(gates.values()),
-    }
+    with span('runner.build_eval_report'):
+        return EvalMetricsAccumulator().update(records).build_report(thresholds)
+
+
+def build_grouped_eval_report(
+    records: Iterable[EvalRecord],
+    group_by: Sequence[str],
+    thresholds: EvalThresholds | None = None,
+) -> dict[str, Any]:
+    with span('runner.build_grouped_eval_report'):
+        return GroupedEvalAccumulator(tuple(group_by)).update(records).build_report(thresholds)
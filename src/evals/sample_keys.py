@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import heapq
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .ingest_sql import SAMPLE_KEY_BYTES
+
+SEEN_KEYS_MAGIC = b'EVSEEN01'
+
+
+class SeenKeysError(ValueError):
+    """Raised when a seen-keys file is not a sorted list of sample key digests."""
+
+
+class SeenSampleKeys:
+    """Exact set of ingested ``sample_dedupe_key`` digests, persisted as a sorted key file.
+
+    The file is the magic header followed by the digests in ascending order. Lookups
+    binary-search the loaded bytes, so stored keys cost ``SAMPLE_KEY_BYTES`` each and,
+    unlike a Bloom filter, a sample is never skipped by a false positive. Keys added since
+    loading live in a set until ``save`` merges them into the file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._sorted = b''
+        self._added: set[bytes] = set()
+        if path.exists():
+            data = path.read_bytes()
+            body = len(data) - len(SEEN_KEYS_MAGIC)
+            if not data.startswith(SEEN_KEYS_MAGIC) or body % SAMPLE_KEY_BYTES:
+                raise SeenKeysError(f'Not a seen-keys file: {path}')
+            self._sorted = data[len(SEEN_KEYS_MAGIC) :]
+
+    def __len__(self) -> int:
+        return len(self._sorted) // SAMPLE_KEY_BYTES + len(self._added)
+
+    def _stored(self, key: bytes) -> bool:
+        data = self._sorted
+        low, high = 0, len(data) // SAMPLE_KEY_BYTES
+        while low < high:
+            middle = (low + high) // 2
+            probe = data[middle * SAMPLE_KEY_BYTES : (middle + 1) * SAMPLE_KEY_BYTES]
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, bytes):
+            return False
+        return key in self._added or self._stored(key)
+
+    def update(self, keys: Iterable[bytes]) -> None:
+        for key in keys:
+            if len(key) != SAMPLE_KEY_BYTES:
+                raise ValueError(f'sample keys must be {SAMPLE_KEY_BYTES} bytes')
+            if not self._stored(key):
+                self._added.add(key)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._iter_stored()
+        yield from self._added
+
+    def _iter_stored(self) -> Iterator[bytes]:
+        data = self._sorted
+        for offset in range(0, len(data), SAMPLE_KEY_BYTES):
+            yield data[offset : offset + SAMPLE_KEY_BYTES]
+
+    def save(self) -> None:
+        """Merge added keys into the file (atomically replaced) and reload it."""
+        if not self._added and self.path.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        merged = bytearray(SEEN_KEYS_MAGIC)
+        for key in heapq.merge(self._iter_stored(), sorted(self._added)):
+            merged += key
+        descriptor, temp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as handle:
+                handle.write(merged)
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self._sorted = bytes(merged[len(SEEN_KEYS_MAGIC) :])
+        self._added.clear()
+
+
+def write_pending_keys(path: Path, keys: Iterable[bytes]) -> int:
+    """Write the keys of rendered but not yet loaded samples to a key file at ``path``.
+
+    Any earlier pending file is replaced. The keys only belong in the seen-set once the
+    SQL is confirmed loaded; ``commit_pending_keys`` merges them then. Returns the count.
+    """
+    path.unlink(missing_ok=True)
+    pending = SeenSampleKeys(path)
+    pending.update(keys)
+    pending.save()
+    return len(pending)
+
+
+def commit_pending_keys(pending_path: Path, seen_keys_path: Path) -> int:
+    """Merge a ``write_pending_keys`` file into the seen-keys file, then delete it.
+
+    Returns the number of keys merged; 0 when there is no pending file (e.g. it was
+    already committed).
+    """
+    if not pending_path.exists():
+        return 0
+    pending = SeenSampleKeys(pending_path)
+    seen = SeenSampleKeys(seen_keys_path)
+    seen.update(pending)
+    seen.save()
+    pending_path.unlink()
+    return len(pending)
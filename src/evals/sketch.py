@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_EXACT_CAPACITY = 10_000
+
+
+@dataclass(slots=True)
+class LatencySketch:
+    """Mergeable quantile sketch for non-negative latencies (DDSketch-style).
+
+    Up to ``exact_capacity`` values are kept verbatim and quantiles are exact, using the
+    nearest-rank definition the p95 release gate has always used (``ceil(q * n) - 1``). Past
+    that the values are folded into logarithmic buckets with ratio
+    ``gamma = (1 + alpha) / (1 - alpha)``: any reported quantile ``x'`` of a true value
+    ``x`` then satisfies ``|x' - x| <= alpha * x`` (before rounding to an integer
+    millisecond). Memory is bounded by the bucket count, about
+    ``log(max_latency) / log(gamma)`` (~630 buckets for 5 minutes at alpha=0.01).
+    """
+
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    exact_capacity: int = DEFAULT_EXACT_CAPACITY
+    count: int = 0
+    zero_count: int = 0
+    values: list[int] | None = field(default_factory=list)
+    buckets: dict[int, int] = field(default_factory=dict)
+    _sorted: bool = field(default=True, repr=False)
+    _log_gamma: float = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError('relative_accuracy must be between 0 and 1 (exclusive)')
+        if self.exact_capacity < 0:
+            raise ValueError('exact_capacity must be >= 0')
+        alpha = self.relative_accuracy
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+
+    @property
+    def is_exact(self) -> bool:
+        return self.values is not None
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        values = self.values
+        if values is not None:
+            values.append(value)
+            self._sorted = False
+            if len(values) > self.exact_capacity:
+                self._collapse()
+            return
+        self._add_to_buckets(value)
+
+    def update(self, values: Iterable[int]) -> LatencySketch:
+        values = iter(values)
+        exact_values = self.values
+        if exact_values is not None:
+            # Take at most one value past capacity, so a huge iterable is never held whole.
+            previous = len(exact_values)
+            exact_values.extend(islice(values, self.exact_capacity + 1 - previous))
+            self.count += len(exact_values) - previous
+            self._sorted = False
+            if len(exact_values) <= self.exact_capacity:
+                return self
+            self._collapse()
+        add_to_buckets = self._add_to_buckets
+        for value in values:
+            self.count += 1
+            add_to_buckets(value)
+        return self
+
+    def update_counts(self, histogram: Iterable[tuple[int, int]]) -> LatencySketch:
+        """Add each ``(value, count)`` pair as ``count`` copies of ``value``.
+
+        The result equals adding the values one by one: the sketch stays exact only while
+        the total fits ``exact_capacity``, and bucketing does not depend on order.
+        """
+        pairs = list(histogram)
+        total = sum(count for _, count in pairs)
+        values = self.values
+        if values is not None and len(values) + total <= self.exact_capacity:
+            for value, count in pairs:
+                values.extend([value] * count)
+            self.count += total
+            self._sorted = False
+            return self
+        if values is not None:
+            self._collapse()
+        self.count += total
+        buckets = self.buckets
+        for value, count in pairs:
+            if value <= 0:
+                self.zero_count += count
+                continue
+            index = math.ceil(math.log(value) / self._log_gamma)
+            buckets[index] = buckets.get(index, 0) + count
+        return self
+
+    def merge(self, other: LatencySketch) -> LatencySketch:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Cannot merge sketches with different relative_accuracy')
+        self.count += other.count
+        if (
+            self.values is not None
+            and other.values is not None
+            and len(self.values) + len(other.values) <= self.exact_capacity
+        ):
+            self.values.extend(other.values)
+            self._sorted = False
+            return self
+        if self.values is not None:
+            self._collapse()
+        if other.values is not None:
+            for value in other.values:
+                self._add_to_buckets(value)
+        else:
+            self.zero_count += other.zero_count
+            for index, bucket_count in other.buckets.items():
+                self.buckets[index] = self.buckets.get(index, 0) + bucket_count
+        return self
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'exact_capacity': self.exact_capacity,
+            'count': self.count,
+            'zero_count': self.zero_count,
+            'values': None if self.values is None else list(self.values),
+            'buckets': sorted(self.buckets.items()),
+        }
+
+    @staticmethod
+    def from_dict(payload: dict[str, Any]) -> LatencySketch:
+        values = payload['values']
+        return LatencySketch(
+            relative_accuracy=float(payload['relative_accuracy']),
+            exact_capacity=int(payload['exact_capacity']),
+            count=int(payload['count']),
+            zero_count=int(payload['zero_count']),
+            values=None if values is None else [int(value) for value in values],
+            buckets={int(index): int(count) for index, count in payload['buckets']},
+            _sorted=False,
+        )
+
+    def quantile(self, q: float) -> int | None:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError('q must be between 0 and 1')
+        if not self.count:
+            return None
+        rank = max(0, min(math.ceil(q * self.count) - 1, self.count - 1))
+        values = self.values
+        if values is not None:
+            if not self._sorted:
+                values.sort()
+                self._sorted = True
+            return values[rank]
+
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        gamma = math.exp(self._log_gamma)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return round(2 * gamma**index / (gamma + 1))
+        raise AssertionError('bucket counts do not add up to sketch count')
+
+    def _collapse(self) -> None:
+        values = self.values or []
+        self.values = None
+        self._sorted = True
+        for value in values:
+            self._add_to_buckets(value)
+
+    def _add_to_buckets(self, value: int) -> None:
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
@@ -1,10 +1,31 @@
 from __future__ import annotations
 
+import http.client
 import json
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+
+from .contracts import EvalRecordBatch, coerce_latency_ms
+from .http_pool import HttpConnectionPool, StreamedResponse, backoff_delay, parse_retry_after
+from .instrumentation import record_stage
+from .json_stream import iter_json_array
+from .rest_ingest import DEFAULT_BACKOFF_SECONDS, DEFAULT_MAX_RETRIES, RestIngestError
+
+DEFAULT_PAGE_SIZE = 1000
+_EXPORT_PATH = '/rest/v1/ai_training_examples'
+_EXPORT_COLUMNS = (
+    'id,request_id,requested_provider,selected_provider,route_strategy,'
+    'fallback_used,latency_ms,metadata,created_at,source,'
+    'tenant_id,route_id,model_id,model_version_id'
+)
 
 
 def _to_bool(value: Any, default: bool) -> bool:
@@ -19,22 +40,35 @@ def _to_bool(value: Any, default: bool) -> bool:
     return default
 
 
-def _to_int(value: Any) -> int | None:
-    if value is None:
-        return None
-    if isinstance(value, bool):
-        return int(value)
-    if isinstance(value, (int, float)):
-        return int(value)
-    if isinstance(value, str):
-        stripped = value.strip()
-        if not stripped:
-            return None
-        try:
-            return int(float(stripped))
-        except ValueError:
-            return None
-    return None
+def _postgrest_value(value: str) -> str:
+    """Double-quote a value inside a PostgREST ``or=(...)`` tree (timestamps contain ``.``)."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _export_query(
+    since_iso: str,
+    limit: int,
+    sources: list[str] | None = None,
+    after: tuple[str, str] | None = None,
+    until_iso: str | None = None,
+) -> str:
+    source_values = sources or ['generation', 'generation_cached']
+    params = [
+        ('select', _EXPORT_COLUMNS),
+        ('source', f'in.({",".join(source_values)})'),
+        ('created_at', f'gte.{since_iso}'),
+    ]
+    if until_iso is not None:
+        params.append(('created_at', f'lt.{until_iso}'))
+    params += [('order', 'created_at.desc,id.desc'), ('limit', str(limit))]
+    if after is not None:
+        # Keyset cursor: rows strictly after (created_at, id) in descending order.
+        created_at, row_id = (_postgrest_value(value) for value in after)
+        params.append(
+            ('or', f'(created_at.lt.{created_at},and(created_at.eq.{created_at},id.lt.{row_id}))')
+        )
+    return urlencode(params, safe='(),.:')
 
 
 def build_eval_export_url(
@@ -42,22 +76,414 @@ def build_eval_export_url(
     since_iso: str,
     limit: int,
     sources: list[str] | None = None,
+    after: tuple[str, str] | None = None,
+    until_iso: str | None = None,
 ) -> str:
-    source_values = sources or ['generation', 'generation_cached']
-    query = urlencode(
-        {
-            'select': (
-                'id,request_id,requested_provider,selected_provider,route_strategy,'
-                'fallback_used,latency_ms,metadata,created_at,source'
-            ),
-            'source': f'in.({",".join(source_values)})',
-            'created_at': f'gte.{since_iso}',
-            'order': 'created_at.desc',
-            'limit': str(limit),
-        },
-        safe='(),.:',
-    )
-    return f'{supabase_url.rstrip("/")}/rest/v1/ai_training_examples?{query}'
+    query = _export_query(since_iso, limit, sources=sources, after=after, until_iso=until_iso)
+    return f'{supabase_url.rstrip("/")}{_EXPORT_PATH}?{query}'
+
+
+def split_export_window(since_iso: str, until_iso: str, shards: int) -> list[tuple[str, str]]:
+    """Split ``[since, until)`` into ``shards`` equal half-open ranges, newest first."""
+    if shards <= 0:
+        raise ValueError('shards must be > 0')
+    since = datetime.fromisoformat(since_iso)
+    until = datetime.fromisoformat(until_iso)
+    if until <= since:
+        return [(since_iso, until_iso)]
+    step = (until - since) / shards
+    bounds = [since_iso, *((since + step * index).isoformat() for index in range(1, shards))]
+    bounds.append(until_iso)
+    return [(bounds[index - 1], bounds[index]) for index in range(shards, 0, -1)]
+
+
+def _export_headers(service_role_key: str) -> dict[str, str]:
+    return {
+        'apikey': service_role_key,
+        'Authorization': f'Bearer {service_role_key}',
+        'Accept': 'application/json',
+        # Streamed bodies are gunzipped incrementally by StreamedResponse.
+        'Accept-Encoding': 'gzip',
+    }
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent export requests, shared by the shard workers.
+
+    Each successful request raises the limit by ``1 / limit`` (about +1 per round of
+    requests) up to ``maximum``; a throttled or overloaded response (429, 503, other
+    transient statuses) halves it, at most once per round since the requests already in
+    flight report the same congestion. A ``Retry-After`` pauses every worker.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, initial: int | None = None) -> None:
+        if not 1 <= minimum <= maximum:
+            raise ValueError('AdaptiveConcurrencyLimiter needs 1 <= minimum <= maximum')
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial or maximum, minimum), maximum))
+        self.lowest_limit = self.limit
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._generation = 0
+        self._resume_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> int:
+        """Block until a request may start; returns the token to pass to ``release``."""
+        with self._condition:
+            while True:
+                pause = self._resume_at - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self._in_flight >= int(self.limit):
+                    self._condition.wait()
+                else:
+                    break
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+            return self._generation
+
+    def release(
+        self, token: int, congested: bool | None = None, retry_after: float | None = None
+    ) -> None:
+        """End a request: ``congested`` True shrinks the limit, False (success) grows it."""
+        with self._condition:
+            self._in_flight -= 1
+            if retry_after:
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+            if congested and token == self._generation:
+                self.limit = max(float(self.minimum), self.limit / 2)
+                self.lowest_limit = min(self.lowest_limit, self.limit)
+                self._generation += 1
+            elif congested is False:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+@dataclass(slots=True)
+class ExportStats:
+    """Throughput of one export, updated by the shard workers as responses complete.
+
+    ``bytes`` counts response bodies as received (before gunzip). ``fetch_seconds`` is the
+    time the consumer spent waiting on rows: requests and streamed JSON parsing, but not
+    the caller's own work between rows.
+    """
+
+    rows: int = 0
+    bytes: int = 0
+    fetch_seconds: float = 0.0
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    max_concurrency: int = 0
+    peak_concurrency: int = 0
+    lowest_concurrency_limit: float = 0.0
+    final_concurrency_limit: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(
+        self, rows: int = 0, retry: bool = False, throttled: bool = False, received_bytes: int = 0
+    ) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += rows
+            self.bytes += received_bytes
+            self.retries += retry
+            self.throttled += throttled
+
+    def finish(self, limiter: AdaptiveConcurrencyLimiter) -> None:
+        self.finished = time.perf_counter()
+        self.max_concurrency = limiter.maximum
+        self.peak_concurrency = limiter.peak_in_flight
+        self.lowest_concurrency_limit = limiter.lowest_limit
+        self.final_concurrency_limit = limiter.limit
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        seconds = self.seconds
+        return self.rows / seconds if seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'seconds': round(self.seconds, 6),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'fetch_seconds': round(self.fetch_seconds, 6),
+            'requests': self.requests,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'max_concurrency': self.max_concurrency,
+            'peak_concurrency': self.peak_concurrency,
+            'lowest_concurrency_limit': round(self.lowest_concurrency_limit, 3),
+            'final_concurrency_limit': round(self.final_concurrency_limit, 3),
+        }
+
+
+class _ExportCancelled(Exception):
+    """Raised inside a shard that stopped because the export was closed or another failed."""
+
+
+@dataclass(frozen=True, slots=True)
+class _ExportSession:
+    pool: HttpConnectionPool
+    headers: dict[str, str]
+    limiter: AdaptiveConcurrencyLimiter
+    stats: ExportStats
+    page_size: int
+    sources: list[str] | None
+    max_retries: int
+    backoff_seconds: float
+
+
+def _iter_window_rows(
+    session: _ExportSession,
+    since_iso: str,
+    until_iso: str | None,
+    limit: int | None,
+    stop: threading.Event | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Keyset-page one window, parsing each response body as it streams in.
+
+    A connection error or transient status (even part-way through a body) is retried with
+    jittered exponential backoff, after any ``Retry-After``, from the last row already
+    yielded, so no row is repeated or lost. Once ``stop`` is set, ``_ExportCancelled`` is
+    raised before the next page is requested.
+    """
+    remaining = limit
+    after: tuple[str, str] | None = None
+    attempt = 0
+    last_error = ''
+    while remaining is None or remaining > 0:
+        if attempt:
+            if attempt > session.max_retries:
+                raise RestIngestError(
+                    f'GET {_EXPORT_PATH} failed after {session.max_retries + 1} attempts: '
+                    f'{last_error}'
+                )
+            time.sleep(backoff_delay(attempt, session.backoff_seconds))
+        if stop is not None and stop.is_set():
+            raise _ExportCancelled
+        size = session.page_size if remaining is None else min(session.page_size, remaining)
+        query = _export_query(since_iso, size, session.sources, after=after, until_iso=until_iso)
+        received = 0
+        retry = attempt > 0
+        congested: bool | None = None
+        retry_after: float | None = None
+        streamed: StreamedResponse | None = None
+        token = session.limiter.acquire()
+        try:
+            with session.pool.stream(
+                'GET', f'{_EXPORT_PATH}?{query}', headers=session.headers
+            ) as response:
+                streamed = response
+                if not response.ok:
+                    body = response.read()[:500].decode('utf-8', 'replace')
+                    last_error = f'HTTP {response.status}: {body}'
+                    if not response.transient:
+                        raise RestIngestError(f'GET {_EXPORT_PATH} failed with {last_error}')
+                    congested = True
+                    retry_after = parse_retry_after(response.headers.get('retry-after'))
+                    attempt += 1
+                    continue
+                for row in iter_json_array(response):
+                    received += 1
+                    if not isinstance(row, dict):
+                        continue
+                    if row.get('created_at') is None or row.get('id') is None:
+                        raise ValueError(
+                            'Supabase export rows need created_at and id for pagination'
+                        )
+                    after = (str(row['created_at']), str(row['id']))
+                    yield row
+            congested = False
+        except (OSError, http.client.HTTPException) as exc:
+            last_error = f'{type(exc).__name__}: {exc}'
+            attempt += 1
+            if remaining is not None:
+                remaining -= received
+            continue
+        finally:
+            session.limiter.release(token, congested, retry_after)
+            session.stats.record(
+                received,
+                retry=retry,
+                throttled=bool(congested),
+                received_bytes=streamed.bytes_received if streamed is not None else 0,
+            )
+        attempt = 0
+        if received < size:
+            return
+        if remaining is not None:
+            remaining -= received
+
+
+def _spool_window(
+    spool_dir: str, session: _ExportSession, window: tuple[str, str], stop: threading.Event
+) -> Path:
+    """Write one shard's rows to a JSONL file, setting ``stop`` if the shard fails."""
+    since_iso, until_iso = window
+    try:
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=spool_dir, suffix='.jsonl', delete=False
+        ) as handle:
+            for row in _iter_window_rows(session, since_iso, until_iso, None, stop):
+                if stop.is_set():
+                    raise _ExportCancelled
+                handle.write(json.dumps(row, separators=(',', ':')) + '\n')
+    except _ExportCancelled:
+        raise
+    except BaseException:
+        stop.set()
+        raise
+    return Path(handle.name)
+
+
+def _shard_error(futures: list[Future[Path]]) -> BaseException:
+    """The error of the shard that stopped the others."""
+    for future in futures:
+        if future.cancelled():
+            continue
+        error = future.exception()
+        if error is not None and not isinstance(error, _ExportCancelled):
+            return error
+    return RestIngestError('Supabase export shards were cancelled')
+
+
+def iter_training_example_rows(
+    supabase_url: str,
+    service_role_key: str,
+    since_iso: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sources: list[str] | None = None,
+    limit: int | None = None,
+    timeout: float = 30.0,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    until_iso: str | None = None,
+    shards: int = 1,
+    workers: int = 1,
+    stats: ExportStats | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield the rows of the export window newest-first, as their bytes arrive.
+
+    Pages of ``page_size`` rows are fetched with keyset pagination on ``(created_at, id)``
+    over keep-alive connections, so every row in the window is visited exactly once and
+    each request costs the same regardless of depth (unlike ``offset``). Response bodies
+    are parsed incrementally, so a serial export holds one row at a time. ``limit`` caps
+    the total number of rows; ``None`` exports the whole window.
+
+    With ``shards > 1`` the window ``[since, until)`` (``until`` defaults to now) is split
+    into equal time ranges paged concurrently by ``workers`` threads sharing one pool of
+    ``workers`` connections. Each shard is spooled to a temporary JSONL file and the
+    files are replayed in window order, so the rows and their order are identical to a
+    serial export while memory stays flat. Concurrency adapts below ``workers`` (see
+    ``AdaptiveConcurrencyLimiter``) when the API throttles; pass ``stats`` to collect
+    rows/s, bytes, retries and throttling counts. Under an active profiler the time spent
+    producing rows is recorded as a ``supabase_export.fetch`` stage, a child of whatever
+    span the caller consumes the rows in.
+
+    A ``limit`` turns sharding off: the newest rows all come from the newest shards, so the
+    window is paged serially and stops as soon as the limit is met, instead of every shard
+    fetching up to ``limit`` rows only for most of them to be discarded.
+    """
+    if page_size <= 0:
+        raise ValueError('page_size must be > 0')
+    if workers <= 0:
+        raise ValueError('workers must be > 0')
+    stats = stats if stats is not None else ExportStats()
+    sharded = shards > 1 and limit is None
+    connections = workers if sharded else 1
+    limiter = AdaptiveConcurrencyLimiter(connections)
+    try:
+        with HttpConnectionPool(supabase_url, max_connections=connections, timeout=timeout) as pool:
+            session = _ExportSession(
+                pool=pool,
+                headers=_export_headers(service_role_key),
+                limiter=limiter,
+                stats=stats,
+                page_size=page_size,
+                sources=sources,
+                max_retries=max_retries,
+                backoff_seconds=backoff_seconds,
+            )
+            if sharded:
+                rows = _iter_sharded_rows(session, since_iso, until_iso, shards, workers)
+            else:
+                rows = _iter_window_rows(session, since_iso, until_iso, limit)
+            # Rows are consumed as they are parsed, so request/parse time is the time spent
+            # inside this generator between yields.
+            clock = time.perf_counter
+            started = clock()
+            for row in rows:
+                stats.fetch_seconds += clock() - started
+                yield row
+                started = clock()
+            stats.fetch_seconds += clock() - started
+    finally:
+        stats.finish(limiter)
+        record_stage('supabase_export.fetch', stats.fetch_seconds, stats.rows, stats.bytes)
+
+
+def _iter_sharded_rows(
+    session: _ExportSession,
+    since_iso: str,
+    until_iso: str | None,
+    shards: int,
+    workers: int,
+) -> Iterator[dict[str, Any]]:
+    windows = split_export_window(since_iso, until_iso or datetime.now(UTC).isoformat(), shards)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    # A shard still finishing its page after a stop may leave a spool file behind.
+    with tempfile.TemporaryDirectory(
+        prefix='supabase-export-', ignore_cleanup_errors=True
+    ) as spool_dir:
+        try:
+            futures = [
+                executor.submit(_spool_window, spool_dir, session, window, stop)
+                for window in windows
+            ]
+            for future in futures:
+                try:
+                    spooled_path = future.result()
+                except _ExportCancelled:
+                    raise _shard_error(futures) from None
+                with spooled_path.open(encoding='utf-8') as spooled:
+                    for line in spooled:
+                        yield json.loads(line)
+        finally:
+            # On an error or an early close, in-flight shards stop at their next page
+            # instead of downloading the rest of their range, and queued ones never start.
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_training_example_pages(
+    supabase_url: str,
+    service_role_key: str,
+    since_iso: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    **options: Any,
+) -> Iterator[list[dict[str, Any]]]:
+    """``iter_training_example_rows`` grouped into lists of up to ``page_size`` rows."""
+    page: list[dict[str, Any]] = []
+    for row in iter_training_example_rows(
+        supabase_url, service_role_key, since_iso, page_size=page_size, **options
+    ):
+        page.append(row)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
 
 
 def fetch_training_example_rows(
@@ -66,28 +492,19 @@ def fetch_training_example_rows(
     since_iso: str,
     limit: int = 1000,
     sources: list[str] | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
 ) -> list[dict[str, Any]]:
-    url = build_eval_export_url(
-        supabase_url=supabase_url,
-        since_iso=since_iso,
-        limit=limit,
-        sources=sources,
+    """The newest ``limit`` rows of the window as one list (see ``iter_training_example_rows``)."""
+    return list(
+        iter_training_example_rows(
+            supabase_url,
+            service_role_key,
+            since_iso,
+            page_size=min(page_size, max(limit, 1)),
+            sources=sources,
+            limit=limit,
+        )
     )
-    request = Request(
-        url=url,
-        headers={
-            'apikey': service_role_key,
-            'Authorization': f'Bearer {service_role_key}',
-            'Accept': 'application/json',
-        },
-        method='GET',
-    )
-    with urlopen(request, timeout=30) as response:  # noqa: S310
-        payload = response.read().decode('utf-8')
-    parsed = json.loads(payload)
-    if not isinstance(parsed, list):
-        raise ValueError('Expected list response from Supabase REST API')
-    return [row for row in parsed if isinstance(row, dict)]
 
 
 def row_to_eval_record_payload(row: dict[str, Any]) -> dict[str, Any]:
@@ -104,9 +521,9 @@ def row_to_eval_record_payload(row: dict[str, Any]) -> dict[str, Any]:
         row.get('fallback_used'),
         _to_bool(metadata.get('fallbackUsed'), False),
     )
-    latency_ms = _to_int(row.get('latency_ms'))
+    latency_ms = coerce_latency_ms(row.get('latency_ms'))
     if latency_ms is None:
-        latency_ms = _to_int(metadata.get('latencyMs'))
+        latency_ms = coerce_latency_ms(metadata.get('latencyMs'))
 
     return {
         'record_id': str(record_id),
@@ -128,6 +545,91 @@ def row_to_eval_record_payload(row: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _to_optional_str(value: Any) -> str | None:
+    return value if value is None or type(value) is str else str(value)
+
+
+def append_rows_to_eval_batch(batch: EvalRecordBatch, rows: Iterable[dict[str, Any]]) -> int:
+    """Append raw ``ai_training_examples`` rows to ``batch`` as typed columns.
+
+    Equivalent to ``EvalRecord.from_dict(row_to_eval_record_payload(row))`` followed by
+    ``batch.append``, including every metadata fallback, but writes the flag, latency and
+    dictionary-encoded string columns directly, without the per-row payload dict or record.
+    Returns the number of rows appended.
+    """
+    record_ids = batch.record_ids.append
+    request_ids = batch.request_ids.append
+    schema_valid = batch.schema_valid.append
+    patch_apply_success = batch.patch_apply_success.append
+    edited_after_generate = batch.edited_after_generate.append
+    published_within_7d = batch.published_within_7d.append
+    safety_compliant = batch.safety_html_tailwind_compliant.append
+    fallback_used = batch.fallback_used.append
+    latency_ms = batch.latency_ms.append
+    latency_mask = batch.latency_mask.append
+    requested_provider = batch.requested_provider.append
+    selected_provider = batch.selected_provider.append
+    route_strategy = batch.route_strategy.append
+    tenant_id = batch.tenant_id.append
+    route_id = batch.route_id.append
+    model_id = batch.model_id.append
+    model_version_id = batch.model_version_id.append
+    to_bool, to_latency, to_str = _to_bool, coerce_latency_ms, _to_optional_str
+    empty: dict[str, Any] = {}
+    count = 0
+    for row in rows:
+        get = row.get
+        metadata = get('metadata')
+        meta = metadata.get if isinstance(metadata, dict) else empty.get
+        request_id = get('request_id')
+        record_ids(str(get('id') or request_id or 'unknown'))
+        request_ids(str(request_id) if request_id is not None else None)
+
+        # JSON booleans are by far the common case; anything else takes the string rules.
+        value = meta('schemaValid')
+        schema_valid(value if type(value) is bool else to_bool(value, True))
+        value = meta('patchApplySuccess')
+        patch_apply_success(value if type(value) is bool else to_bool(value, True))
+        value = meta('editedAfterGenerate')
+        edited_after_generate(value if type(value) is bool else to_bool(value, False))
+        value = meta('publishedWithin7d')
+        published_within_7d(value if type(value) is bool else to_bool(value, False))
+        value = meta('safetyHtmlTailwindCompliant')
+        safety_compliant(value if type(value) is bool else to_bool(value, True))
+        value = get('fallback_used')
+        if type(value) is not bool:
+            value = to_bool(value, to_bool(meta('fallbackUsed'), False))
+        fallback_used(value)
+
+        value = get('latency_ms')
+        latency = to_latency(value)
+        if latency is None:
+            latency = to_latency(meta('latencyMs'))
+        if latency is None:
+            latency_ms(0)
+            latency_mask(0)
+        else:
+            latency_ms(latency)
+            latency_mask(1)
+
+        requested_provider(to_str(get('requested_provider')))
+        selected_provider(to_str(get('selected_provider')))
+        route_strategy(to_str(get('route_strategy')))
+        tenant_id(to_str(get('tenant_id') or meta('tenantId')))
+        route_id(to_str(get('route_id') or meta('routeId')))
+        model_id(to_str(get('model_id') or meta('modelId')))
+        model_version_id(to_str(get('model_version_id') or meta('modelVersionId')))
+        count += 1
+    return count
+
+
+def rows_to_eval_batch(rows: Iterable[dict[str, Any]]) -> EvalRecordBatch:
+    """Columnar ``EvalRecordBatch`` of raw rows (see ``append_rows_to_eval_batch``)."""
+    batch = EvalRecordBatch()
+    append_rows_to_eval_batch(batch, rows)
+    return batch
+
+
 def compute_since_iso(days: int) -> str:
     window_start = datetime.now(UTC) - timedelta(days=days)
     return window_start.isoformat()
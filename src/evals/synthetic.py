@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from .compressed_io import open_text
+from .supabase_export import row_to_eval_record_payload
+
+BENCHMARK_ROW_COUNTS = (10_000, 1_000_000, 10_000_000)
+
+_PROVIDERS = ('openai', 'anthropic', 'custom')
+_PROVIDER_WEIGHTS = (0.6, 0.3, 0.1)
+_BLOCK_SIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticEvalConfig:
+    """Distributions for generated ``ai_training_examples`` rows.
+
+    Tenants follow a Zipf law (rank ``k`` is drawn with weight ``1 / k**zipf_exponent``)
+    and latencies are lognormal around ``latency_median_ms``.
+    """
+
+    seed: int = 0
+    tenant_count: int = 1_000
+    zipf_exponent: float = 1.1
+    route_count: int = 20
+    model_count: int = 4
+    latency_median_ms: float = 2_500.0
+    latency_sigma: float = 0.6
+    fallback_share: float = 0.08
+    missing_latency_share: float = 0.02
+    metadata_latency_share: float = 0.1
+    schema_valid_share: float = 0.995
+    patch_apply_success_share: float = 0.97
+    edited_after_generate_share: float = 0.35
+    published_within_7d_share: float = 0.2
+    safety_compliant_share: float = 0.998
+    start: datetime = datetime(2026, 1, 1, tzinfo=UTC)
+    mean_interval_ms: int = 250
+
+    def __post_init__(self) -> None:
+        if self.tenant_count <= 0 or self.route_count <= 0 or self.model_count <= 0:
+            raise ValueError('tenant_count, route_count and model_count must be > 0')
+        for name in (
+            'fallback_share',
+            'missing_latency_share',
+            'metadata_latency_share',
+            'schema_valid_share',
+            'patch_apply_success_share',
+            'edited_after_generate_share',
+            'published_within_7d_share',
+            'safety_compliant_share',
+        ):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f'{name} must be between 0 and 1')
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def _zipf_cum_weights(count: int, exponent: float) -> list[float]:
+    return list(itertools.accumulate(1.0 / rank**exponent for rank in range(1, count + 1)))
+
+
+def iter_synthetic_training_rows(
+    count: int, config: SyntheticEvalConfig | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield ``count`` seeded rows shaped like the Supabase ``ai_training_examples`` export."""
+    config = config or SyntheticEvalConfig()
+    rng = random.Random(config.seed)
+    tenants = [_uuid(rng) for _ in range(config.tenant_count)]
+    tenant_weights = _zipf_cum_weights(config.tenant_count, config.zipf_exponent)
+    routes = [f'route-{index:03d}' for index in range(config.route_count)]
+    models = [f'model-{index}' for index in range(config.model_count)]
+    latency_mu = math.log(config.latency_median_ms)
+    created_at = config.start
+
+    produced = 0
+    while produced < count:
+        block = min(_BLOCK_SIZE, count - produced)
+        block_tenants = rng.choices(tenants, cum_weights=tenant_weights, k=block)
+        block_providers = rng.choices(_PROVIDERS, weights=_PROVIDER_WEIGHTS, k=block)
+        for tenant_id, requested_provider in zip(block_tenants, block_providers, strict=True):
+            produced += 1
+            created_at += timedelta(milliseconds=rng.expovariate(1.0 / config.mean_interval_ms))
+            fallback_used = rng.random() < config.fallback_share
+            selected_provider = 'custom' if fallback_used else requested_provider
+            latency_ms: int | None = None
+            if rng.random() >= config.missing_latency_share:
+                latency_ms = round(rng.lognormvariate(latency_mu, config.latency_sigma))
+                if fallback_used:
+                    latency_ms *= 2
+            model_index = rng.randrange(config.model_count)
+
+            metadata: dict[str, Any] = {
+                'schemaValid': rng.random() < config.schema_valid_share,
+                'patchApplySuccess': rng.random() < config.patch_apply_success_share,
+                'editedAfterGenerate': rng.random() < config.edited_after_generate_share,
+                'publishedWithin7d': rng.random() < config.published_within_7d_share,
+                'safetyHtmlTailwindCompliant': rng.random() < config.safety_compliant_share,
+                'tenantId': tenant_id,
+                'routeId': routes[rng.randrange(config.route_count)],
+                'modelId': models[model_index],
+                'modelVersionId': f'{models[model_index]}-v{1 + produced % 3}',
+            }
+            row_latency = latency_ms
+            if latency_ms is not None and rng.random() < config.metadata_latency_share:
+                metadata['latencyMs'] = latency_ms
+                row_latency = None
+
+            yield {
+                'id': _uuid(rng),
+                'request_id': _uuid(rng),
+                'requested_provider': requested_provider,
+                'selected_provider': selected_provider,
+                'route_strategy': 'fallback' if fallback_used else 'single_provider',
+                'fallback_used': fallback_used,
+                'latency_ms': row_latency,
+                'metadata': metadata,
+                'created_at': created_at.isoformat(),
+                'source': 'generation_cached' if rng.random() < 0.15 else 'generation',
+            }
+
+
+def iter_synthetic_eval_payloads(
+    count: int, config: SyntheticEvalConfig | None = None
+) -> Iterator[dict[str, Any]]:
+    """Eval JSONL payloads for the same rows, as the Supabase exporter would write them."""
+    for row in iter_synthetic_training_rows(count, config):
+        yield row_to_eval_record_payload(row)
+
+
+def write_synthetic_eval_jsonl(
+    path: Path, count: int, config: SyntheticEvalConfig | None = None
+) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(path, 'w') as handle:
+        for payload in iter_synthetic_eval_payloads(count, config):
+            handle.write(json.dumps(payload, separators=(',', ':')))
+            handle.write('\n')
+    return path
+
+
+def write_synthetic_training_rows(
+    path: Path, count: int, config: SyntheticEvalConfig | None = None
+) -> Path:
+    """Write rows as a JSON array, the body shape the Supabase REST API returns."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w', encoding='utf-8') as handle:
+        handle.write('[')
+        for index, row in enumerate(iter_synthetic_training_rows(count, config)):
+            if index:
+                handle.write(',\n')
+            handle.write(json.dumps(row, separators=(',', ':')))
+        handle.write(']\n')
+    return path
@@ -0,0 +1,24 @@
+-- 20261017090000_ai_eval_samples_dedupe_key.sql
+-- Purpose:
+--   Idempotent eval ingestion: a stable per-sample key with a unique index, so repeating or
+--   resuming the load of a run skips samples that are already stored.
+-- Notes:
+--   - dedupe_key is the hex blake2b-128 of (run id, normalised request_id, record_id), as
+--     written by scripts/evals/generate_eval_ingest_sql.py (dedupe is its default). The run
+--     id is derived from a stable --scope, so re-exported samples get the same key. Rows
+--     ingested earlier keep a NULL key and are not constrained.
+--   - Ingest uses ON CONFLICT (dedupe_key) DO NOTHING, which needs this exact (non-partial)
+--     unique index. Overlapping inputs merge into one run, whose record count, metrics and
+--     status are then recomputed from its stored samples.
+--   - Works for both the SiteCraft and v2 ai_eval_samples layouts.
+--   - Designed to be idempotent and safe on partially-migrated environments.
+
+BEGIN;
+
+ALTER TABLE public.ai_eval_samples
+  ADD COLUMN IF NOT EXISTS dedupe_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ai_eval_samples_dedupe_key
+  ON public.ai_eval_samples(dedupe_key);
+
+COMMIT;
@@ -0,0 +1,207 @@
+import json
+import re
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from evals.aggregate_pushdown import AGGREGATE_RPC_PATH, fetch_eval_aggregate
+from evals.contracts import EvalRecord
+from evals.runner import build_eval_report, build_grouped_eval_report
+from evals.supabase_export import row_to_eval_record_payload
+from evals.synthetic import SyntheticEvalConfig, iter_synthetic_training_rows
+
+_SQL_WHITESPACE = ' \t\n\r\f\v'
+_SQL_NUMBER = re.compile(r'[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?')
+_FLAGS = (
+    ('schema_valid', 'schemaValid', True),
+    ('patch_apply_success', 'patchApplySuccess', True),
+    ('edited_after_generate', 'editedAfterGenerate', False),
+    ('published_within_7d', 'publishedWithin7d', False),
+    ('safety_html_tailwind_compliant', 'safetyHtmlTailwindCompliant', True),
+)
+_LINEAGE = {
+    'tenant_id': 'tenantId',
+    'route_id': 'routeId',
+    'model_id': 'modelId',
+    'model_version_id': 'modelVersionId',
+}
+
+
+def _jsonb_get(metadata: Any, key: str) -> Any:
+    return metadata.get(key) if isinstance(metadata, dict) else None
+
+
+def _sql_flag(value: Any, default: bool) -> bool:
+    """public.ai_eval_flag_v1"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        normalized = value.strip(_SQL_WHITESPACE).lower()
+        if normalized in ('true', '1', 'yes'):
+            return True
+        if normalized in ('false', '0', 'no'):
+            return False
+    return default
+
+
+def _sql_latency(value: Any) -> int | None:
+    """public.ai_eval_latency_ms_v1"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int | float):
+        return int(value)
+    if isinstance(value, str) and _SQL_NUMBER.fullmatch(value.strip(_SQL_WHITESPACE)):
+        return int(float(value.strip(_SQL_WHITESPACE)))
+    return None
+
+
+def _sql_aggregate(
+    rows: list[dict[str, Any]], sources: list[str], group_by: list[str]
+) -> list[dict[str, Any]]:
+    """Stand-in for public.ai_eval_training_aggregate_v1 over in-memory table rows."""
+    groups: dict[tuple, dict[str, Any]] = {}
+    latencies: dict[tuple, Counter] = defaultdict(Counter)
+    for row in rows:
+        if row['source'] not in sources:
+            continue
+        metadata = row['metadata']
+        key_values = {
+            'requested_provider': row['requested_provider'],
+            'selected_provider': row['selected_provider'],
+            'route_strategy': row['route_strategy'],
+            **{
+                name: row.get(name) or _jsonb_get(metadata, metadata_key)
+                for name, metadata_key in _LINEAGE.items()
+            },
+        }
+        key = tuple(key_values[name] if name in group_by else None for name in key_values)
+        group = groups.setdefault(
+            key,
+            {
+                **dict(zip(key_values, key, strict=True)),
+                'record_count': 0,
+                **{f'{name}_count': 0 for name, _, _ in _FLAGS},
+                'fallback_used_count': 0,
+            },
+        )
+        group['record_count'] += 1
+        for name, metadata_key, default in _FLAGS:
+            group[f'{name}_count'] += _sql_flag(_jsonb_get(metadata, metadata_key), default)
+        fallback_used = row['fallback_used']
+        if fallback_used is None:
+            fallback_used = _sql_flag(_jsonb_get(metadata, 'fallbackUsed'), False)
+        group['fallback_used_count'] += fallback_used
+        latency_ms = row['latency_ms']
+        if latency_ms is None:
+            latency_ms = _sql_latency(_jsonb_get(metadata, 'latencyMs'))
+        if latency_ms is not None and latency_ms >= 0:
+            latencies[key][latency_ms] += 1
+    for key, group in groups.items():
+        histogram = sorted(latencies[key].items())
+        group['latency_values'] = [value for value, _ in histogram]
+        group['latency_counts'] = [count for _, count in histogram]
+    return list(groups.values())
+
+
+class _StubRpcServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        super().__init__(('127.0.0.1', 0), _StubRpcHandler)
+        self.rows = rows
+        self.calls: list[dict[str, Any]] = []
+
+
+class _StubRpcHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: _StubRpcServer
+
+    def do_POST(self) -> None:
+        assert self.path == AGGREGATE_RPC_PATH
+        arguments = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.calls.append(arguments)
+        body = json.dumps(
+            _sql_aggregate(self.server.rows, arguments['p_sources'], arguments['p_group_by'])
+        ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+@contextmanager
+def _stub_rpc_server(rows: list[dict[str, Any]]) -> Iterator[_StubRpcServer]:
+    server = _StubRpcServer(rows)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _synthetic_table(count: int) -> list[dict[str, Any]]:
+    rows = list(iter_synthetic_training_rows(count, SyntheticEvalConfig(seed=7)))
+    # Exercise the metadata fallbacks the local transform has to agree with.
+    odd_flags = ['yes', ' FALSE ', 'maybe', 1, None, '0']
+    odd_latencies = ['1234.9', ' 77 ', 'n/a', 12.7, True, -5]
+    for index, row in enumerate(rows[::7]):
+        row['metadata']['schemaValid'] = odd_flags[index % len(odd_flags)]
+        row['metadata']['fallbackUsed'] = odd_flags[(index + 1) % len(odd_flags)]
+        row['fallback_used'] = None
+        row['latency_ms'] = None
+        row['metadata']['latencyMs'] = odd_latencies[index % len(odd_latencies)]
+    for row in rows[::97]:
+        row['metadata'] = ['not', 'an', 'object']
+    rows[1]['source'] = 'patch'
+    # Lineage columns win over metadata wherever both are set.
+    for index, row in enumerate(rows[::5]):
+        row['tenant_id'] = f'column-tenant-{index % 3}'
+        row['model_version_id'] = f'column-version-{index % 2}'
+    return rows
+
+
+@pytest.mark.parametrize(
+    ('count', 'group_by'),
+    [
+        (12_000, []),
+        (3_000, ['selected_provider']),
+        (3_000, ['model_version_id']),
+        (3_000, ['tenant_id']),
+    ],
+)
+def test_pushdown_report_matches_local_report(count: int, group_by: list[str]) -> None:
+    rows = _synthetic_table(count)
+    local_records = [
+        EvalRecord.from_dict(row_to_eval_record_payload(row))
+        for row in rows
+        if row['source'] in ('generation', 'generation_cached')
+    ]
+    with _stub_rpc_server(rows) as server:
+        accumulator = fetch_eval_aggregate(
+            f'http://127.0.0.1:{server.server_address[1]}',
+            'service-key',
+            '2026-01-01T00:00:00+00:00',
+            group_by=group_by,
+        )
+    assert server.calls[0]['p_group_by'] == group_by
+
+    pushdown = accumulator.build_report()
+    local = (
+        build_grouped_eval_report(local_records, group_by)
+        if group_by
+        else build_eval_report(local_records)
+    )
+    pushdown.pop('generated_at')
+    local.pop('generated_at')
+    assert pushdown == local
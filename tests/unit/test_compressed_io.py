@@ -0,0 +1,50 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from evals.checkpoint import run_incremental_eval
+from evals.compressed_io import open_binary, zstd_available
+from evals.parallel_load import accumulate_eval_records_parallel
+from evals.runner import build_eval_report, load_eval_records
+from evals.synthetic import write_synthetic_eval_jsonl
+
+
+def _without_timestamp(report: dict) -> dict:
+    return {key: value for key, value in report.items() if key != 'generated_at'}
+
+
+@pytest.mark.parametrize('suffix', ['.gz', '.zst'])
+def test_compressed_jsonl_loads_like_plain_jsonl(tmp_path: Path, suffix: str) -> None:
+    if suffix == '.zst' and not zstd_available():
+        pytest.skip('zstd support is not installed')
+    plain = write_synthetic_eval_jsonl(tmp_path / 'records.jsonl', 500)
+    compressed = write_synthetic_eval_jsonl(tmp_path / f'records.jsonl{suffix}', 500)
+
+    assert compressed.stat().st_size < plain.stat().st_size / 3
+    with open_binary(compressed) as handle:
+        assert handle.read() == plain.read_bytes()
+    records = load_eval_records(compressed)
+    assert records == load_eval_records(plain)
+    assert _without_timestamp(
+        accumulate_eval_records_parallel(compressed, workers=2).build_report()
+    ) == _without_timestamp(build_eval_report(records))
+
+
+def test_incremental_eval_folds_appended_gzip_members(tmp_path: Path) -> None:
+    plain = write_synthetic_eval_jsonl(tmp_path / 'records.jsonl', 400)
+    lines = plain.read_bytes().splitlines(keepends=True)
+    compressed = tmp_path / 'records.jsonl.gz'
+    compressed.write_bytes(gzip.compress(b''.join(lines[:300])))
+    checkpoint_path = tmp_path / 'report.checkpoint.json'
+
+    assert run_incremental_eval(compressed, checkpoint_path).mode == 'full'
+    with compressed.open('ab') as handle:
+        handle.write(gzip.compress(b''.join(lines[300:])))
+    second = run_incremental_eval(compressed, checkpoint_path)
+
+    assert second.mode == 'incremental'
+    assert second.new_record_count == 100
+    assert _without_timestamp(second.accumulator.build_report()) == _without_timestamp(
+        build_eval_report(load_eval_records(plain))
+    )
@@ -0,0 +1,82 @@
+import os
+import shutil
+from pathlib import Path
+
+from evals.dataset_cache import (
+    cache_path_for,
+    evict_cache_entries,
+    load_eval_batch_cached,
+    read_batch_cache,
+)
+from evals.runner import build_eval_report, load_eval_batch, load_eval_records
+
+FIXTURE_PATH = Path(__file__).resolve().parents[1] / 'fixtures' / 'eval_records_gate_pass.jsonl'
+
+
+def test_cache_round_trip_is_memory_mapped_and_lossless(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    shutil.copyfile(FIXTURE_PATH, input_path)
+    cache_dir = tmp_path / 'cache'
+    loads: list[Path] = []
+
+    def counting_loader(path: Path):
+        loads.append(path)
+        return load_eval_batch(path)
+
+    first = load_eval_batch_cached(input_path, cache_dir, loader=counting_loader)
+    second = load_eval_batch_cached(input_path, cache_dir, loader=counting_loader)
+
+    assert loads == [input_path]
+    assert isinstance(second.schema_valid, memoryview)
+    assert isinstance(second.latency_ms, memoryview)
+    assert list(second) == list(first) == load_eval_records(input_path)
+    assert build_eval_report(second)['metrics'] == build_eval_report(first)['metrics']
+
+
+def test_cache_is_invalidated_by_input_changes_and_corruption(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    shutil.copyfile(FIXTURE_PATH, input_path)
+    cache_dir = tmp_path / 'cache'
+    load_eval_batch_cached(input_path, cache_dir)
+    cache_path = cache_path_for(input_path, cache_dir)
+
+    cache_path.write_bytes(cache_path.read_bytes()[:100])
+    assert read_batch_cache(cache_path) is None
+    assert len(load_eval_batch_cached(input_path, cache_dir)) == len(load_eval_batch(input_path))
+
+    with input_path.open('a', encoding='utf-8') as handle:
+        handle.write('{"record_id":"appended","schema_valid":true}\n')
+    stat = input_path.stat()
+    os.utime(input_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    refreshed = load_eval_batch_cached(input_path, cache_dir)
+    assert refreshed.record_ids[-1] == 'appended'
+
+
+def test_cache_reads_latencies_outside_int64_as_missing(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    input_path.write_text(
+        '{"record_id":"a","latency_ms":1e20}\n{"record_id":"b","latency_ms":-5}\n',
+        encoding='utf-8',
+    )
+
+    batch = load_eval_batch_cached(input_path, tmp_path / 'cache')
+    assert list(batch) == load_eval_records(input_path)
+    assert [record.latency_ms for record in batch] == [None, -5]
+    assert list((tmp_path / 'cache').glob('*.evalcache'))
+
+
+def test_evict_cache_entries_keeps_most_recently_used(tmp_path: Path) -> None:
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    for index in range(4):
+        entry = cache_dir / f'input-{index}.evalcache'
+        entry.write_bytes(b'x' * 10)
+        os.utime(entry, ns=(index * 1_000_000_000, index * 1_000_000_000))
+
+    evicted = evict_cache_entries(cache_dir, max_entries=3, max_bytes=25)
+
+    assert sorted(path.name for path in evicted) == ['input-0.evalcache', 'input-1.evalcache']
+    assert sorted(path.name for path in cache_dir.iterdir()) == [
+        'input-2.evalcache',
+        'input-3.evalcache',
+    ]
@@ -0,0 +1,90 @@
+from collections import Counter
+from pathlib import Path
+
+from evals.benchmark import (
+    StageResult,
+    build_benchmark_baseline,
+    compare_to_baseline,
+    run_eval_benchmarks,
+)
+from evals.contracts import EvalRecord
+from evals.synthetic import (
+    SyntheticEvalConfig,
+    iter_synthetic_eval_payloads,
+    iter_synthetic_training_rows,
+)
+
+
+def test_synthetic_rows_are_seeded_and_follow_configured_distributions() -> None:
+    config = SyntheticEvalConfig(seed=7, tenant_count=50, fallback_share=0.2)
+
+    first = list(iter_synthetic_training_rows(5_000, config))
+    assert first == list(iter_synthetic_training_rows(5_000, config))
+    assert first != list(iter_synthetic_training_rows(5_000, SyntheticEvalConfig(seed=8)))
+
+    fallback_share = sum(row['fallback_used'] for row in first) / len(first)
+    assert 0.17 < fallback_share < 0.23
+
+    tenant_counts = Counter(row['metadata']['tenantId'] for row in first).most_common()
+    assert tenant_counts[0][1] > 5 * tenant_counts[len(tenant_counts) // 2][1]
+
+    created_at = [row['created_at'] for row in first]
+    assert created_at == sorted(created_at)
+
+    payloads = list(iter_synthetic_eval_payloads(5_000, config))
+    assert all(payload['latency_ms'] is None or payload['latency_ms'] > 0 for payload in payloads)
+    assert EvalRecord.from_dicts(payloads)[0].tenant_id == first[0]['metadata']['tenantId']
+
+
+def test_run_eval_benchmarks_reports_every_stage(tmp_path: Path) -> None:
+    results = run_eval_benchmarks(200, tmp_path, SyntheticEvalConfig(tenant_count=5), repeat=1)
+
+    assert [result.stage for result in results] == [
+        'row_to_eval_record_payload',
+        'rows_to_eval_batch',
+        'load_eval_records',
+        'build_eval_report',
+        'build_eval_ingest_sql',
+    ]
+    assert all(result.rows == 200 and result.seconds > 0 for result in results)
+    assert len(list(tmp_path.glob('synthetic-eval-200-*.jsonl'))) == 1
+
+
+def test_compare_to_baseline_flags_throughput_and_memory_regressions() -> None:
+    baseline = build_benchmark_baseline(
+        [
+            StageResult('load_eval_records', 1_000, seconds=1.0, peak_memory_bytes=1_000),
+            StageResult('build_eval_report', 1_000, seconds=1.0, peak_memory_bytes=1_000),
+        ],
+        tolerance=0.2,
+    )
+
+    assert not compare_to_baseline(
+        [StageResult('load_eval_records', 1_000, seconds=1.1, peak_memory_bytes=1_100)], baseline
+    )
+
+    regressions = compare_to_baseline(
+        [
+            StageResult('load_eval_records', 1_000, seconds=2.0, peak_memory_bytes=1_000),
+            StageResult('build_eval_report', 1_000, seconds=1.0, peak_memory_bytes=5_000),
+            StageResult('build_eval_report', 50, seconds=9.0, peak_memory_bytes=9_000),
+        ],
+        baseline,
+    )
+    assert len(regressions) == 2
+    assert regressions[0].startswith('load_eval_records@1000: throughput')
+    assert regressions[1].startswith('build_eval_report@1000: peak memory')
+
+    # A stage the recorded tier lacks fails the gate instead of passing unchecked.
+    assert compare_to_baseline(
+        [StageResult('rows_to_eval_batch', 1_000, seconds=1.0, peak_memory_bytes=1_000)],
+        baseline,
+    ) == [
+        'rows_to_eval_batch@1000: no baseline entry; re-record the baseline with --update-baseline'
+    ]
+
+    assert not compare_to_baseline(
+        [StageResult('load_eval_records', 1_000, seconds=2.0, peak_memory_bytes=1_000)],
+        baseline,
+        tolerance=0.6,
+    )
@@ -0,0 +1,165 @@
+import json
+import shutil
+from pathlib import Path
+
+from evals.checkpoint import (
+    load_eval_checkpoint,
+    run_incremental_eval,
+    run_incremental_segment_eval,
+)
+from evals.rolling_export import RollingDataset
+from evals.runner import build_eval_report, build_grouped_eval_report, load_eval_records
+
+FIXTURES = Path(__file__).resolve().parents[1] / 'fixtures'
+GATE_PASS_PATH = FIXTURES / 'eval_records_gate_pass.jsonl'
+SAMPLE_PATH = FIXTURES / 'eval_records_sample.jsonl'
+
+
+def _append(target: Path, source: Path) -> None:
+    with target.open('a', encoding='utf-8') as handle:
+        handle.write(source.read_text(encoding='utf-8'))
+
+
+def _without_timestamp(report: dict) -> dict:
+    return {key: value for key, value in report.items() if key != 'generated_at'}
+
+
+def test_incremental_run_matches_full_recompute_after_append(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    checkpoint_path = tmp_path / 'report.checkpoint.json'
+    shutil.copyfile(GATE_PASS_PATH, input_path)
+
+    first = run_incremental_eval(input_path, checkpoint_path)
+    assert first.mode == 'full'
+    assert first.rebuild_reason == 'no checkpoint'
+
+    _append(input_path, SAMPLE_PATH)
+    second = run_incremental_eval(input_path, checkpoint_path)
+
+    assert second.mode == 'incremental'
+    assert second.new_record_count == len(load_eval_records(SAMPLE_PATH))
+    assert _without_timestamp(second.accumulator.build_report()) == _without_timestamp(
+        build_eval_report(load_eval_records(input_path))
+    )
+    assert load_eval_checkpoint(checkpoint_path).input_offset == input_path.stat().st_size
+
+    unchanged = run_incremental_eval(input_path, checkpoint_path)
+    assert unchanged.mode == 'incremental'
+    assert unchanged.new_record_count == 0
+
+
+def test_grouped_incremental_run_matches_full_recompute(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    checkpoint_path = tmp_path / 'report.checkpoint.json'
+    shutil.copyfile(GATE_PASS_PATH, input_path)
+    group_by = ('tenant_id', 'selected_provider')
+
+    run_incremental_eval(input_path, checkpoint_path, group_by=group_by)
+    _append(input_path, SAMPLE_PATH)
+    result = run_incremental_eval(input_path, checkpoint_path, group_by=group_by)
+
+    assert result.mode == 'incremental'
+    assert _without_timestamp(result.accumulator.build_report()) == _without_timestamp(
+        build_grouped_eval_report(load_eval_records(input_path), group_by)
+    )
+
+
+def test_corrupt_or_stale_checkpoint_falls_back_to_full_rebuild(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    checkpoint_path = tmp_path / 'report.checkpoint.json'
+    shutil.copyfile(GATE_PASS_PATH, input_path)
+    run_incremental_eval(input_path, checkpoint_path)
+
+    envelope = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+    envelope['checkpoint']['input_offset'] = 0
+    checkpoint_path.write_text(json.dumps(envelope), encoding='utf-8')
+    corrupted = run_incremental_eval(input_path, checkpoint_path)
+    assert corrupted.mode == 'full'
+    assert 'checksum' in (corrupted.rebuild_reason or '')
+
+    lines = input_path.read_text(encoding='utf-8').splitlines(keepends=True)
+    lines[0] = lines[0].replace('"schema_valid":true', '"schema_valid":false')
+    input_path.write_text(''.join(lines), encoding='utf-8')
+    rewritten = run_incremental_eval(input_path, checkpoint_path)
+    assert rewritten.mode == 'full'
+    assert rewritten.rebuild_reason == 'input prefix changed'
+    assert _without_timestamp(rewritten.accumulator.build_report()) == _without_timestamp(
+        build_eval_report(load_eval_records(input_path))
+    )
+
+    regrouped = run_incremental_eval(input_path, checkpoint_path, group_by=('tenant_id',))
+    assert regrouped.rebuild_reason == 'group_by changed'
+
+    forced = run_incremental_eval(input_path, checkpoint_path, full_rebuild=True)
+    assert forced.rebuild_reason == 'forced full rebuild'
+    assert forced.new_record_count == len(load_eval_records(input_path))
+
+
+def test_change_in_the_middle_of_a_large_prefix_is_detected(tmp_path: Path) -> None:
+    input_path = tmp_path / 'records.jsonl'
+    checkpoint_path = tmp_path / 'report.checkpoint.json'
+    lines = GATE_PASS_PATH.read_text(encoding='utf-8').splitlines(keepends=True) * 400
+    input_path.write_text(''.join(lines), encoding='utf-8')
+    run_incremental_eval(input_path, checkpoint_path)
+
+    middle = len(lines) // 2
+    lines[middle] = lines[middle].replace('"latency_ms":1400', '"latency_ms":9400')
+    input_path.write_text(''.join(lines), encoding='utf-8')
+    rewritten = run_incremental_eval(input_path, checkpoint_path)
+
+    assert rewritten.rebuild_reason == 'input prefix changed'
+    assert _without_timestamp(rewritten.accumulator.build_report()) == _without_timestamp(
+        build_eval_report(load_eval_records(input_path))
+    )
+
+
+def test_segment_eval_parses_only_new_segments_and_drops_compacted_ones(tmp_path: Path) -> None:
+    sources = ['generation']
+    dataset = RollingDataset(tmp_path / 'state')
+    checkpoint_path = tmp_path / 'report.checkpoint.json'
+    combined = tmp_path / 'combined.jsonl'
+    payloads = [
+        json.loads(line)
+        for path in (GATE_PASS_PATH, SAMPLE_PATH)
+        for line in path.read_text(encoding='utf-8').splitlines()
+    ]
+
+    def append(day: int, chunk: list[dict]) -> None:
+        rows = [
+            {**payload, 'id': f'{day}-{index}', 'created_at': f'2026-02-{day:02d}T00:00:00+00:00'}
+            for index, payload in enumerate(chunk)
+        ]
+        dataset.append(sources, rows, lambda row: row)
+
+    def expected(group_by: tuple[str, ...] = ()) -> dict:
+        dataset.write_combined(sources, combined)
+        records = load_eval_records(combined)
+        if group_by:
+            return _without_timestamp(build_grouped_eval_report(records, group_by))
+        return _without_timestamp(build_eval_report(records))
+
+    append(10, payloads[:4])
+    first = run_incremental_segment_eval(tmp_path / 'state', checkpoint_path, sources)
+    assert (first.mode, first.rebuild_reason) == ('full', 'no checkpoint')
+
+    append(11, payloads[4:])
+    second = run_incremental_segment_eval(tmp_path / 'state', checkpoint_path, sources)
+    assert second.mode == 'incremental'
+    assert second.reused_segments == 1
+    assert second.new_record_count == len(payloads) - 4
+    assert _without_timestamp(second.accumulator.build_report()) == expected()
+
+    # The window slides: day 10 is dropped and day 11 is merged into a new segment.
+    dataset.compact(sources, '2026-02-11T00:00:00+00:00')
+    third = run_incremental_segment_eval(tmp_path / 'state', checkpoint_path, sources)
+    assert third.reused_segments == 0
+    assert third.accumulator.record_count == len(payloads) - 4
+    assert _without_timestamp(third.accumulator.build_report()) == expected()
+
+    regrouped = run_incremental_segment_eval(
+        tmp_path / 'state', checkpoint_path, sources, group_by=('selected_provider',)
+    )
+    assert regrouped.rebuild_reason == 'group_by changed'
+    assert _without_timestamp(regrouped.accumulator.build_report()) == expected(
+        ('selected_provider',)
+    )
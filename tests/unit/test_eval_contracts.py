@@ -0,0 +1,79 @@
+from dataclasses import replace
+
+from evals.contracts import EvalRecord, EvalRecordBatch
+
+
+def test_from_dict_applies_fallbacks_and_coercions() -> None:
+    record = EvalRecord.from_dict(
+        {
+            'id': 42,
+            'schema_valid': 1,
+            'patch_apply_success': 'yes',
+            'edited_after_generate': 0,
+            'latency_ms': '1500',
+            'selected_provider': 7,
+            'route_strategy': None,
+            'request_id': 'req-1',
+        }
+    )
+
+    assert record == EvalRecord(
+        record_id='42',
+        schema_valid=True,
+        patch_apply_success=True,
+        edited_after_generate=False,
+        published_within_7d=False,
+        safety_html_tailwind_compliant=False,
+        fallback_used=False,
+        latency_ms=1500,
+        selected_provider='7',
+        request_id='req-1',
+    )
+    assert EvalRecord.from_dict({'record_id': '', 'id': None}).record_id == 'unknown'
+    assert EvalRecord.from_dict({'latency_ms': 12.9}).latency_ms == 12
+    assert EvalRecord.from_dict({'latency_ms': True}).latency_ms == 1
+
+
+def test_from_dicts_matches_from_dict() -> None:
+    payloads = [
+        {'record_id': 'a', 'schema_valid': True, 'tenant_id': 'tenant-1', 'latency_ms': 0},
+        {'id': 'b', 'fallback_used': True, 'model_version_id': None},
+        {},
+    ]
+    records = EvalRecord.from_dicts(payloads)
+
+    assert records == [EvalRecord.from_dict(payload) for payload in payloads]
+    assert records[1].record_id == 'b'
+    assert records[2].record_id == 'unknown'
+    assert hash(records[0]) == hash(EvalRecord.from_dict(payloads[0]))
+
+
+def test_latencies_outside_int64_are_read_as_missing() -> None:
+    payloads = [
+        {'latency_ms': 1 << 63},
+        {'latency_ms': -(1 << 63)},
+        {'latency_ms': 1e20},
+        {'latency_ms': float('inf')},
+        {'latency_ms': float('nan')},
+        {'latency_ms': 'n/a'},
+        {'latency_ms': ' 12.9 '},
+        {'latency_ms': [1]},
+    ]
+    records = [EvalRecord.from_dict(payload) for payload in payloads]
+    assert [record.latency_ms for record in records] == [
+        None,
+        -(1 << 63),
+        None,
+        None,
+        None,
+        None,
+        12,
+        None,
+    ]
+
+    # A record built directly with an unrepresentable latency is appended as missing.
+    batch = EvalRecordBatch()
+    batch.append(replace(EvalRecord.from_dict({'record_id': 'a'}), latency_ms=1 << 70))
+    batch.append(EvalRecord.from_dict({'record_id': 'b', 'latency_ms': 250}))
+    assert list(batch.latency_mask) == [0, 1]
+    assert [record.latency_ms for record in batch] == [None, 250]
@@ -1,5 +1,24 @@
+import io
+import json
+import re
+from pathlib import Path
+
+import pytest
+
 from evals.contracts import EvalRecord, EvalThresholds
-from evals.ingest_sql import EvalIngestContext, build_eval_ingest_sql
+from evals.ingest_sql import (
+    EvalIngestContext,
+    build_eval_ingest_sql,
+    plan_sample_dedupe,
+    sample_dedupe_key,
+    write_eval_ingest_sql,
+)
+from evals.sample_keys import (
+    SeenKeysError,
+    SeenSampleKeys,
+    commit_pending_keys,
+    write_pending_keys,
+)
 
 
 def test_build_eval_ingest_sql_generates_expected_statements() -> None:
@@ -62,3 +81,300 @@ def test_build_eval_ingest_sql_generates_expected_statements() -> None:
     assert 'sample_key' in sql_text
     assert "'not-a-uuid'" not in sql_text
     assert 'invalidRequestId' in sql_text
+
+
+def _sample_rows(sql_text: str) -> list[str]:
+    rows: list[str] = []
+    for statement in sql_text.split(';\n'):
+        if statement.startswith('INSERT INTO public.ai_eval_samples'):
+            rows.extend(statement.split(' VALUES ', 1)[1].removesuffix(';').split(',\n'))
+    return rows
+
+
+def test_build_eval_ingest_sql_batches_sample_rows_per_statement() -> None:
+    records = [
+        EvalRecord(
+            record_id=f'rec-{index}',
+            schema_valid=True,
+            patch_apply_success=index % 2 == 0,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            latency_ms=None if index == 3 else 1000 + index,
+            selected_provider="o'brien",
+            request_id='36f7ebca-5661-4c0f-b215-175f9627b99e' if index % 2 else None,
+        )
+        for index in range(7)
+    ]
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+
+    for schema_variant in ('sitecraft', 'v2'):
+        context = EvalIngestContext(schema_variant=schema_variant)
+        single, _, _ = build_eval_ingest_sql(
+            records, EvalThresholds(), context, run_id=run_id, rows_per_statement=1
+        )
+        batched, _, _ = build_eval_ingest_sql(
+            records, EvalThresholds(), context, run_id=run_id, rows_per_statement=3
+        )
+
+        assert single.count('INSERT INTO public.ai_eval_samples') == 7
+        assert batched.count('INSERT INTO public.ai_eval_samples') == 3
+        assert batched.startswith('BEGIN;\nINSERT INTO public.ai_eval_runs')
+        assert batched.endswith('COMMIT;\n') and batched.count('COMMIT;') == 1
+        assert _sample_rows(batched) == _sample_rows(single)
+        assert len(_sample_rows(single)) == 7
+
+    with pytest.raises(ValueError, match='rows_per_statement'):
+        build_eval_ingest_sql(records, EvalThresholds(), context, rows_per_statement=0)
+
+
+def _unescape_copy_field(field: str) -> str | None:
+    if field == '\\N':
+        return None
+    replacements = {'\\\\': '\\', '\\t': '\t', '\\n': '\n', '\\r': '\r'}
+    return re.sub(r'\\[\\tnr]', lambda match: replacements[match.group(0)], field)
+
+
+def test_build_eval_ingest_sql_copy_format_escapes_fields_and_nulls() -> None:
+    records = [
+        EvalRecord(
+            record_id='rec\t1\\x\n',
+            schema_valid=True,
+            patch_apply_success=False,
+            edited_after_generate=True,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            fallback_used=True,
+            latency_ms=None,
+            requested_provider='openai',
+            selected_provider='say "hi"',
+            route_strategy=None,
+            request_id='not-a-uuid',
+        ),
+        EvalRecord(
+            record_id='rec-2',
+            schema_valid=True,
+            patch_apply_success=True,
+            edited_after_generate=False,
+            published_within_7d=True,
+            safety_html_tailwind_compliant=True,
+            latency_ms=900,
+            request_id='36f7ebca-5661-4c0f-b215-175f9627b99e',
+        ),
+    ]
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+
+    for schema_variant, column_count in (('sitecraft', 12), ('v2', 13)):
+        sql_text, _, _ = build_eval_ingest_sql(
+            records,
+            EvalThresholds(),
+            EvalIngestContext(schema_variant=schema_variant),
+            run_id=run_id,
+            output_format='copy',
+        )
+        lines = sql_text.split('\n')
+        assert lines[0] == 'BEGIN;'
+        assert lines[1].startswith('INSERT INTO public.ai_eval_runs')
+        assert lines[2].startswith('COPY public.ai_eval_samples (run_id, ')
+        assert lines[2].endswith(') FROM STDIN;')
+        assert lines[5:] == ['\\.', 'COMMIT;', '']
+
+        rows = [[_unescape_copy_field(field) for field in line.split('\t')] for line in lines[3:5]]
+        assert all(len(row) == column_count and row[0] == run_id for row in rows)
+        metadata = json.loads(rows[0][-1])
+        assert metadata['recordId'] == 'rec\t1\\x\n'
+        assert metadata['invalidRequestId'] == 'not-a-uuid'
+        if schema_variant == 'sitecraft':
+            assert rows[0][1] == 'rec\t1\\x\n-1'
+            assert rows[0][3] == 'say "hi"'
+            assert rows[0][10] is None
+            assert rows[1][10] == '900'
+            assert metadata['requestId'] is None
+        else:
+            assert rows[0][1] is None
+            assert rows[1][1] == '36f7ebca-5661-4c0f-b215-175f9627b99e'
+            assert rows[0][4] is None
+            assert rows[0][5] == 't' and rows[0][6] is None
+
+    with pytest.raises(ValueError, match='output_format'):
+        build_eval_ingest_sql(records, EvalThresholds(), EvalIngestContext(), output_format='csv')
+
+
+class _RecordingWriter(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_sizes: list[int] = []
+
+    def write(self, text: str) -> int:
+        self.write_sizes.append(len(text))
+        return super().write(text)
+
+
+def test_write_eval_ingest_sql_streams_one_statement_per_write() -> None:
+    records = [
+        EvalRecord(
+            record_id=f'rec-{index}',
+            schema_valid=True,
+            patch_apply_success=True,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            latency_ms=1000 + index,
+        )
+        for index in range(50)
+    ]
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+
+    for output_format in ('insert', 'copy'):
+        expected, _, expected_status = build_eval_ingest_sql(
+            records,
+            EvalThresholds(),
+            EvalIngestContext(),
+            run_id=run_id,
+            rows_per_statement=10,
+            output_format=output_format,
+        )
+        output = _RecordingWriter()
+        returned_run_id, status = write_eval_ingest_sql(
+            output,
+            records,
+            EvalThresholds(),
+            EvalIngestContext(),
+            run_id=run_id,
+            rows_per_statement=10,
+            output_format=output_format,
+        )
+
+        assert (returned_run_id, status) == (run_id, expected_status)
+        assert output.getvalue() == expected
+        assert len(output.write_sizes) >= 5
+        assert max(output.write_sizes) < len(expected) / 3
+
+
+def test_sample_encoders_match_json_dumps_and_normalize_request_ids() -> None:
+    request_id = '36f7ebca-5661-4c0f-b215-175f9627b99e'
+    records = [
+        EvalRecord(
+            record_id=f'rec-{index}-é\'"',
+            schema_valid=True,
+            patch_apply_success=True,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            fallback_used=index % 2 == 1,
+            requested_provider="o'brien" if index else None,
+            selected_provider='custom',
+            request_id=raw_request_id,
+        )
+        for index, raw_request_id in enumerate(
+            [request_id, '{' + request_id.upper() + '}', request_id.replace('-', ''), 'nope', '']
+        )
+    ]
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+
+    for schema_variant in ('sitecraft', 'v2'):
+        sql_text, _, _ = build_eval_ingest_sql(
+            records,
+            EvalThresholds(),
+            EvalIngestContext(schema_variant=schema_variant),
+            run_id=run_id,
+            output_format='copy',
+        )
+        rows = [
+            [_unescape_copy_field(field) for field in line.split('\t')]
+            for line in sql_text.split('\n')[3:8]
+        ]
+        valid_request_ids = [request_id, request_id, request_id, None, None]
+        for record, row, valid_request_id in zip(records, rows, valid_request_ids, strict=True):
+            expected: dict[str, object] = {'recordId': record.record_id}
+            if record.request_id and valid_request_id is None:
+                expected['invalidRequestId'] = record.request_id
+            if schema_variant == 'sitecraft':
+                expected.update(
+                    requestId=valid_request_id,
+                    requestedProvider=record.requested_provider,
+                    selectedProvider=record.selected_provider,
+                    routeStrategy=record.route_strategy,
+                    fallbackUsed=record.fallback_used,
+                )
+            else:
+                assert row[1] == valid_request_id
+            assert row[-1] == json.dumps(expected, separators=(',', ':'), sort_keys=True)
+
+
+def test_deduplicated_ingest_skips_repeats_and_seen_keys(tmp_path: Path) -> None:
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+
+    def record(record_id: str, request_id: str | None) -> EvalRecord:
+        return EvalRecord(
+            record_id=record_id,
+            schema_valid=True,
+            patch_apply_success=True,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            request_id=request_id,
+        )
+
+    other_run_id = 'a1c6b4a4-6a0f-4a36-9d7e-5f4d3c2b1a09'
+    request_id = '36f7ebca-5661-4c0f-b215-175f9627b99e'
+    window = [
+        record('rec-1', request_id),
+        record('rec-2', None),
+        # Same sample re-exported by an overlapping window, with an upper-case request id.
+        record('rec-1', request_id.upper()),
+    ]
+    assert sample_dedupe_key(run_id, window[0]) == sample_dedupe_key(run_id, window[2])
+    assert sample_dedupe_key(run_id, window[0]) != sample_dedupe_key(other_run_id, window[0])
+
+    seen = SeenSampleKeys(tmp_path / 'seen.keys')
+    plan = plan_sample_dedupe(window, run_id, seen)
+    assert plan.as_dict() == {'records': 3, 'rows': 2, 'already_ingested': 0, 'duplicates': 1}
+
+    context = EvalIngestContext(schema_variant='v2')
+    sql, active_run_id, _ = build_eval_ingest_sql(
+        window, EvalThresholds(), context, rows_per_statement=10, dedupe=plan
+    )
+    assert active_run_id == run_id
+    assert 'ON CONFLICT (run_id) DO UPDATE SET run_type = EXCLUDED.run_type' in sql
+    assert 'started_at = EXCLUDED' not in sql
+    samples = next(line for line in sql.splitlines() if 'ai_eval_samples' in line)
+    assert ', metadata, dedupe_key) VALUES (' in samples
+    assert sql.count(f"'{sample_dedupe_key(run_id, window[0]).hex()}')") == 1
+    assert sql.count('::uuid, NULL::uuid') == 1
+    assert 'ON CONFLICT (dedupe_key) DO NOTHING;' in sql
+    # The run is recomputed from every stored sample once this input's samples are in.
+    assert sql.index('ON CONFLICT (dedupe_key)') < sql.index('UPDATE public.ai_eval_runs')
+    assert sql.endswith(f"WHERE eval_run.run_id = '{run_id}'::uuid;\nCOMMIT;\n")
+    assert 'FILTER (WHERE fallback_used)' in sql
+    assert 'COALESCE(p95_latency_ms <= 45000, true)' in sql
+    with pytest.raises(ValueError, match='does not match the dedupe plan'):
+        build_eval_ingest_sql(window, EvalThresholds(), context, run_id=other_run_id, dedupe=plan)
+
+    copy_sql, _, _ = build_eval_ingest_sql(
+        window, EvalThresholds(), context, output_format='copy', dedupe=plan
+    )
+    assert 'CREATE TEMP TABLE ai_eval_samples_staging (LIKE public.ai_eval_samples' in copy_sql
+    assert 'FROM ai_eval_samples_staging ON CONFLICT (dedupe_key) DO NOTHING;' in copy_sql
+
+    # Keys stay pending until the load is confirmed.
+    pending = tmp_path / 'run.sql.pending-keys'
+    assert write_pending_keys(pending, plan.new_keys()) == 2
+    assert not (tmp_path / 'seen.keys').exists()
+    assert commit_pending_keys(pending, tmp_path / 'seen.keys') == 2
+    assert not pending.exists()
+    assert commit_pending_keys(pending, tmp_path / 'seen.keys') == 0
+    reloaded = SeenSampleKeys(tmp_path / 'seen.keys')
+    assert len(reloaded) == 2
+
+    # Re-ingesting the same input renders nothing.
+    rerun = plan_sample_dedupe(window, run_id, reloaded)
+    assert rerun.as_dict() == {'records': 3, 'rows': 0, 'already_ingested': 2, 'duplicates': 1}
+    assert rerun.distinct == 2
+    # An overlapping window only renders its new sample.
+    next_plan = plan_sample_dedupe([window[1], record('rec-3', None)], run_id, reloaded)
+    assert next_plan.as_dict() == {'records': 2, 'rows': 1, 'already_ingested': 1, 'duplicates': 0}
+
+    (tmp_path / 'bad.keys').write_bytes(b'not a key file')
+    with pytest.raises(SeenKeysError):
+        SeenSampleKeys(tmp_path / 'bad.keys')
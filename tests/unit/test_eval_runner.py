@@ -1,10 +1,13 @@
 from pathlib import Path
 
-from evals.contracts import EvalRecord, EvalThresholds
+from evals.contracts import EvalRecord, EvalRecordBatch, EvalThresholds
 from evals.runner import (
+    EvalMetricsAccumulator,
     build_eval_report,
+    build_grouped_eval_report,
     compute_metric_rates,
     compute_operational_metrics,
+    iter_eval_records,
     load_eval_records,
 )
 
@@ -76,6 +79,8 @@ def test_operational_metrics_and_threshold_gates() -> None:
     operational_metrics = compute_operational_metrics(records)
     assert operational_metrics['fallback_rate'] == 0.3333
     assert operational_metrics['p95_latency_ms'] == 3000
+    assert operational_metrics['p50_latency_ms'] == 2400
+    assert operational_metrics['p99_latency_ms'] == 3000
 
     thresholds = EvalThresholds(
         schema_valid_rate=1.0,
@@ -91,3 +96,93 @@ def test_operational_metrics_and_threshold_gates() -> None:
     assert report['gates']['fallback_rate_max'] is True
     assert report['gates']['p95_latency_ms_max'] is True
     assert report['overall_pass'] is True
+
+
+def test_accumulator_streams_and_merges_to_same_report() -> None:
+    fixture_path = Path(__file__).resolve().parents[1] / 'fixtures' / 'eval_records_gate_pass.jsonl'
+    records = load_eval_records(fixture_path)
+    thresholds = EvalThresholds()
+
+    streamed = build_eval_report(iter_eval_records(fixture_path), thresholds=thresholds)
+    listed = build_eval_report(records, thresholds=thresholds)
+
+    midpoint = len(records) // 2
+    merged = EvalMetricsAccumulator().update(records[:midpoint])
+    merged.merge(EvalMetricsAccumulator().update(records[midpoint:]))
+    merged_report = merged.build_report(thresholds)
+
+    for report in (streamed, merged_report):
+        assert report['record_count'] == listed['record_count'] == len(records)
+        assert report['metrics'] == listed['metrics']
+        assert report['gates'] == listed['gates']
+        assert report['overall_pass'] == listed['overall_pass']
+
+
+def test_accumulator_handles_empty_input() -> None:
+    report = EvalMetricsAccumulator().build_report()
+    assert report['record_count'] == 0
+    assert report['metrics']['schema_valid_rate'] == 0.0
+    assert report['metrics']['p95_latency_ms'] is None
+
+
+def test_columnar_batch_matches_list_based_report() -> None:
+    fixture_path = Path(__file__).resolve().parents[1] / 'fixtures' / 'eval_records_gate_pass.jsonl'
+    records = load_eval_records(fixture_path)
+    records.append(
+        EvalRecord(
+            record_id='negative-latency',
+            schema_valid=False,
+            patch_apply_success=True,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            latency_ms=-5,
+            selected_provider='custom',
+        )
+    )
+    batch = EvalRecordBatch.from_records(records)
+
+    assert len(batch) == len(records)
+    assert list(batch) == records
+    assert batch.selected_provider.values == ['openai', 'custom']
+    assert compute_metric_rates(batch) == compute_metric_rates(records)
+    assert compute_operational_metrics(batch) == compute_operational_metrics(records)
+    assert build_eval_report(batch)['gates'] == build_eval_report(records)['gates']
+
+
+def test_grouped_report_matches_per_group_reports() -> None:
+    records = [
+        EvalRecord(
+            record_id=f'grp-{index}',
+            schema_valid=index % 3 != 0,
+            patch_apply_success=True,
+            edited_after_generate=index % 2 == 0,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            fallback_used=index % 4 == 0,
+            latency_ms=1000 + index * 10 if index % 5 else None,
+            selected_provider='custom' if index % 4 == 0 else 'openai',
+            tenant_id=f'tenant-{index % 7}' if index % 6 else None,
+        )
+        for index in range(200)
+    ]
+    group_by = ('selected_provider', 'tenant_id')
+
+    report = build_grouped_eval_report(records, group_by)
+    batch_report = build_grouped_eval_report(EvalRecordBatch.from_records(records), group_by)
+
+    assert report['group_by'] == list(group_by)
+    assert report['metrics'] == build_eval_report(records)['metrics']
+    assert batch_report['groups'] == report['groups']
+    assert report['groups'][0]['key'] == {'selected_provider': 'custom', 'tenant_id': None}
+    assert sum(group['record_count'] for group in report['groups']) == len(records)
+    for group in report['groups']:
+        members = [
+            record
+            for record in records
+            if (record.selected_provider, record.tenant_id) == tuple(group['key'].values())
+        ]
+        expected = build_eval_report(members)
+        assert group['record_count'] == len(members)
+        assert group['metrics'] == expected['metrics']
+        assert group['gates'] == expected['gates']
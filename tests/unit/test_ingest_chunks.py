@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+
+from evals.contracts import EvalRecord, EvalRecordBatch, EvalThresholds
+from evals.ingest_chunks import (
+    PENDING_KEYS_NAME,
+    IngestManifestError,
+    apply_ingest_chunks,
+    load_ingest_manifest,
+    read_applied_chunks,
+    write_eval_ingest_chunks,
+)
+from evals.ingest_sql import EvalIngestContext, build_eval_ingest_sql, plan_sample_dedupe
+
+RUN_ID = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+
+
+def _records(count: int) -> list[EvalRecord]:
+    return [
+        EvalRecord(
+            record_id=f'rec-{index}',
+            schema_valid=True,
+            patch_apply_success=index % 3 != 0,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            latency_ms=None if index == 4 else 1000 + index,
+            selected_provider='openai' if index % 2 else "o'brien",
+            request_id='36f7ebca-5661-4c0f-b215-175f9627b99e' if index % 2 else None,
+        )
+        for index in range(count)
+    ]
+
+
+def _sample_rows(sql_text: str) -> list[str]:
+    rows: list[str] = []
+    for statement in sql_text.split(';\n'):
+        if statement.startswith('INSERT INTO public.ai_eval_samples'):
+            rows.extend(statement.split(' VALUES ', 1)[1].split(',\n'))
+    return rows
+
+
+def test_write_eval_ingest_chunks_matches_single_file_samples(tmp_path: Path) -> None:
+    records = _records(23)
+    context = EvalIngestContext(schema_variant='sitecraft')
+    single, _, status = build_eval_ingest_sql(
+        records, EvalThresholds(), context, run_id=RUN_ID, rows_per_statement=5
+    )
+
+    for name, source, workers in (('list', records, 1), ('batch', None, 2)):
+        output_dir = tmp_path / name
+        manifest = write_eval_ingest_chunks(
+            output_dir,
+            source if source is not None else EvalRecordBatch.from_records(records),
+            EvalThresholds(),
+            context,
+            chunks=4,
+            run_id=RUN_ID,
+            rows_per_statement=5,
+            workers=workers,
+        )
+
+        assert manifest == load_ingest_manifest(output_dir)
+        assert (manifest.run_id, manifest.status, manifest.rows) == (RUN_ID, status, 23)
+        assert [chunk.rows for chunk in manifest.chunks] == [6, 6, 6, 5]
+        chunk_texts = [(output_dir / chunk.name).read_text() for chunk in manifest.chunks]
+        assert all(
+            text.startswith('BEGIN;\n') and text.endswith('COMMIT;\n') for text in chunk_texts
+        )
+        assert [row for text in chunk_texts for row in _sample_rows(text)] == _sample_rows(single)
+
+        start = (output_dir / manifest.start.name).read_text()
+        assert "'running'" in start and start.rstrip().endswith('ON CONFLICT DO NOTHING;\nCOMMIT;')
+        finalize = (output_dir / manifest.finalize.name).read_text()
+        assert '<> 23 THEN' in finalize
+        assert (
+            "SET status = 'failed', completed_at = timezone('utc', now()) WHERE id = " in finalize
+        )
+
+
+def test_apply_ingest_chunks_resumes_after_failure_and_verifies_checksums(tmp_path: Path) -> None:
+    manifest = write_eval_ingest_chunks(
+        tmp_path, _records(10), EvalThresholds(), EvalIngestContext(), chunks=5, run_id=RUN_ID
+    )
+    attempted: list[str] = []
+    failures = {'chunk-00002.sql'}
+
+    def flaky_apply(path: Path) -> None:
+        attempted.append(path.name)
+        if path.name in failures:
+            failures.remove(path.name)
+            raise RuntimeError('connection reset')
+
+    with pytest.raises(RuntimeError, match='connection reset'):
+        apply_ingest_chunks(tmp_path, flaky_apply, parallel=1)
+    applied = read_applied_chunks(tmp_path)
+    assert manifest.start.name in applied
+    assert 'chunk-00002.sql' not in applied and manifest.finalize.name not in applied
+
+    attempted.clear()
+    applied_now = apply_ingest_chunks(tmp_path, flaky_apply, parallel=2)
+    assert set(attempted) == set(applied_now)
+    assert 'chunk-00002.sql' in applied_now and applied_now[-1] == manifest.finalize.name
+    assert manifest.start.name not in applied_now
+    assert apply_ingest_chunks(tmp_path, flaky_apply) == []
+
+    (tmp_path / 'applied.txt').unlink()
+    (tmp_path / 'chunk-00001.sql').write_text('BEGIN;\nCOMMIT;\n')
+    with pytest.raises(IngestManifestError, match='chunk-00001.sql'):
+        apply_ingest_chunks(tmp_path, flaky_apply)
+
+
+def test_deduplicated_chunks_merge_and_recompute_the_run(tmp_path: Path) -> None:
+    # rec-0..rec-9 twice: 20 records, 10 distinct samples.
+    records = _records(10) * 2
+    plan = plan_sample_dedupe(records, RUN_ID)
+    (tmp_path / PENDING_KEYS_NAME).write_bytes(b'keys of an earlier render')
+
+    manifest = write_eval_ingest_chunks(
+        tmp_path, records, EvalThresholds(), EvalIngestContext(), chunks=3, dedupe=plan
+    )
+
+    assert manifest.rows == 10
+    start = (tmp_path / manifest.start.name).read_text()
+    assert 'ON CONFLICT (id) DO UPDATE SET' in start
+    finalize = (tmp_path / manifest.finalize.name).read_text()
+    # The run may already hold samples of an overlapping input, so the count is a floor.
+    assert '< 10 THEN' in finalize
+    assert "status = CASE WHEN stats.passed THEN 'completed' ELSE 'failed' END" in finalize
+    assert 'metrics = stats.metrics' in finalize
+    assert not (tmp_path / PENDING_KEYS_NAME).exists()
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from evals.instrumentation import profiling, record_stage, span
+from evals.runner import build_eval_report, load_eval_records
+
+FIXTURE_PATH = Path(__file__).resolve().parents[1] / 'fixtures' / 'eval_records_sample.jsonl'
+
+
+def test_span_is_a_shared_no_op_when_profiling_is_disabled() -> None:
+    first = span('runner.load_eval_records')
+    with first as stage:
+        stage.add_rows(10)
+    assert first is span('ingest_sql.render_samples')
+
+    with profiling(enabled=False) as profiler:
+        assert profiler is None
+        assert span('runner.accumulate') is first
+
+
+def test_profiling_records_nested_stages_rows_and_peak_memory(tmp_path: Path) -> None:
+    pstats_path = tmp_path / 'eval.pstats'
+    with profiling(pstats_path=pstats_path) as profiler:
+        with span('outer') as outer:
+            blob = bytearray(2_000_000)
+            with span('inner', rows=3):
+                inner_blob = bytearray(1_000_000)
+                del inner_blob
+            outer.add_rows(len(blob) // 1_000_000)
+            del blob
+        records = load_eval_records(FIXTURE_PATH)
+        build_eval_report(records)
+
+    assert profiler is not None
+    stages = {stage['name']: stage for stage in profiler.as_dict()['stages']}
+    assert stages['outer']['depth'] == 0 and stages['outer']['rows'] == 2
+    assert stages['inner']['depth'] == 1 and stages['inner']['rows'] == 3
+    assert stages['outer']['peak_memory_bytes'] >= 3_000_000
+    assert 1_000_000 <= stages['inner']['peak_memory_bytes'] < 2_000_000
+    assert stages['runner.load_eval_records']['rows'] == len(records)
+    assert stages['runner.accumulate']['depth'] == 1
+    assert stages['runner.summarize']['rows'] == len(records)
+    assert pstats_path.stat().st_size > 0
+    assert span('outer') is span('inner')
+
+
+def test_record_stage_adds_a_timed_child_with_bytes() -> None:
+    record_stage('ignored', 1.0, rows=1, byte_count=1)
+    with profiling(trace_memory=False) as profiler, span('outer'):
+        record_stage('interleaved', 0.5, rows=10, byte_count=2_000)
+
+    assert profiler is not None
+    stages = profiler.as_dict()['stages']
+    assert [stage['name'] for stage in stages] == ['outer', 'interleaved']
+    assert stages[1] == {
+        'name': 'interleaved',
+        'depth': 1,
+        'seconds': 0.5,
+        'rows': 10,
+        'rows_per_second': 20.0,
+        'bytes': 2_000,
+        'bytes_per_second': 4_000.0,
+    }
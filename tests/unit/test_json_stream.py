@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from evals.json_stream import iter_json_array
+
+
+class _TrickleReader(io.RawIOBase):
+    """Returns at most ``step`` bytes per read, splitting tokens and UTF-8 sequences."""
+
+    def __init__(self, payload: bytes, step: int) -> None:
+        self._payload = io.BytesIO(payload)
+        self._step = step
+
+    def read(self, size: int = -1) -> bytes:
+        return self._payload.read(min(self._step, size) if size >= 0 else self._step)
+
+
+def test_iter_json_array_matches_json_loads_across_read_boundaries() -> None:
+    document = [
+        {'id': 1, 'metadata': {'note': 'café – \U0001f680', 'nested': [1, 2.5, None]}},
+        12345678901234567890,
+        -0.125e-3,
+        'text with ] and , and \\"quotes\\"',
+        [],
+        {},
+        True,
+        None,
+    ]
+    payload = (' \n[ ' + ' ,\n '.join(json.dumps(item) for item in document) + ' ]\n').encode()
+    for step in (1, 2, 3, 7, 64, 1 << 16):
+        assert list(iter_json_array(_TrickleReader(payload, step), read_size=step)) == document
+    assert list(iter_json_array(io.BytesIO(b'[]'))) == []
+
+    for malformed in (b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1,]', b'[1] x'):
+        with pytest.raises(ValueError):
+            list(iter_json_array(_TrickleReader(malformed, 2), read_size=2))
+
+
+def test_iter_json_array_rejects_an_element_larger_than_the_limit() -> None:
+    class _Endless(io.RawIOBase):
+        """An unterminated string that never reaches EOF."""
+
+        def __init__(self) -> None:
+            self.reads = 0
+
+        def read(self, size: int = -1) -> bytes:
+            self.reads += 1
+            return b'[{"a": "' if self.reads == 1 else b'x' * size
+
+    stream = _Endless()
+    with pytest.raises(ValueError, match='exceeds 4096 characters'):
+        list(iter_json_array(stream, read_size=1024, max_element_size=4096))
+    assert stream.reads < 10
+
+    # Elements within the limit still decode when the array as a whole is larger.
+    payload = json.dumps([{'note': 'x' * 1000}] * 20).encode()
+    rows = list(iter_json_array(_TrickleReader(payload, 512), read_size=512, max_element_size=2048))
+    assert len(rows) == 20
@@ -0,0 +1,65 @@
+import math
+import random
+
+from evals.sketch import LatencySketch
+
+
+def _nearest_rank(values: list[int], q: float) -> int:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def test_exact_mode_matches_nearest_rank() -> None:
+    values = [1500, 2400, 3000, 0, 980]
+    sketch = LatencySketch().update(values)
+
+    assert sketch.is_exact is True
+    for q in (0.5, 0.9, 0.95, 0.99):
+        assert sketch.quantile(q) == _nearest_rank(values, q)
+    assert LatencySketch().quantile(0.95) is None
+
+
+def test_bucketed_mode_respects_relative_error_bound() -> None:
+    rng = random.Random(7)
+    values = [int(rng.lognormvariate(7.5, 0.8)) for _ in range(20_000)]
+    sketch = LatencySketch(relative_accuracy=0.01, exact_capacity=1_000).update(values)
+
+    assert sketch.is_exact is False
+    assert len(sketch.buckets) < 1_000
+    for q in (0.5, 0.9, 0.95, 0.99):
+        expected = _nearest_rank(values, q)
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected + 1
+
+
+def test_merge_matches_single_sketch() -> None:
+    rng = random.Random(11)
+    values = [rng.randint(0, 60_000) for _ in range(5_000)]
+    whole = LatencySketch(exact_capacity=100).update(values)
+
+    left = LatencySketch(exact_capacity=100).update(values[:40])
+    right = LatencySketch(exact_capacity=100).update(values[40:])
+    merged = left.merge(right)
+
+    assert merged.count == whole.count == len(values)
+    assert merged.zero_count == whole.zero_count
+    assert merged.buckets == whole.buckets
+    assert merged.quantile(0.95) == whole.quantile(0.95)
+
+
+def test_update_streams_past_exact_capacity() -> None:
+    pulled = 0
+
+    def values():
+        nonlocal pulled
+        for value in range(1, 50_001):
+            pulled += 1
+            yield value
+            # Once collapsed the sketch must not buffer what is still to come.
+            assert sketch.values is None or len(sketch.values) <= sketch.exact_capacity + 1
+
+    sketch = LatencySketch(exact_capacity=1_000)
+    sketch.update(values())
+
+    assert pulled == sketch.count == 50_000
+    assert sketch.is_exact is False
+    assert abs(sketch.quantile(0.5) - 25_000) <= 0.01 * 25_000 + 1
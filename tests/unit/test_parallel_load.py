@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from evals.parallel_load import (
+    accumulate_eval_groups_parallel,
+    accumulate_eval_records_parallel,
+    load_eval_batch_parallel,
+    load_eval_records_parallel,
+    plan_byte_ranges,
+)
+from evals.runner import build_eval_report, build_grouped_eval_report, load_eval_records
+
+FIXTURE_PATH = Path(__file__).resolve().parents[1] / 'fixtures' / 'eval_records_gate_pass.jsonl'
+
+
+def test_plan_byte_ranges_are_newline_aligned_and_cover_file() -> None:
+    data = FIXTURE_PATH.read_bytes()
+    ranges = plan_byte_ranges(FIXTURE_PATH, chunk_size=100)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (next_start, _) in zip(ranges, ranges[1:], strict=False):
+        assert end == next_start
+        assert data[end - 1 : end] == b'\n'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_loader_matches_serial_loader(workers: int) -> None:
+    serial_records = load_eval_records(FIXTURE_PATH)
+
+    records = load_eval_records_parallel(FIXTURE_PATH, workers=workers, chunk_size=200)
+    accumulator = accumulate_eval_records_parallel(FIXTURE_PATH, workers=workers, chunk_size=200)
+
+    assert records == serial_records
+    serial_report = build_eval_report(serial_records)
+    assert accumulator.build_report()['metrics'] == serial_report['metrics']
+    assert accumulator.record_count == len(serial_records)
+
+    grouped = accumulate_eval_groups_parallel(
+        FIXTURE_PATH, ['selected_provider'], workers=workers, chunk_size=200
+    )
+    serial_grouped = build_grouped_eval_report(serial_records, ['selected_provider'])
+    assert grouped.build_report()['groups'] == serial_grouped['groups']
+
+
+def test_parallel_batch_concatenates_shard_columns_in_file_order() -> None:
+    serial_records = load_eval_records(FIXTURE_PATH)
+
+    batch = load_eval_batch_parallel(FIXTURE_PATH, workers=2, chunk_size=200)
+
+    assert list(batch) == serial_records
+    for column in (batch.selected_provider, batch.requested_provider, batch.route_strategy):
+        assert len(set(column.values)) == len(column.values)
+        assert len(column) == len(serial_records)
+
+
+def test_parallel_loader_keeps_line_numbered_errors(tmp_path: Path) -> None:
+    valid_line = json.dumps({'record_id': 'ok', 'schema_valid': True})
+    bad_json_path = tmp_path / 'bad_json.jsonl'
+    bad_json_path.write_text('\n'.join([valid_line] * 5 + ['', '{not json'] + [valid_line]) + '\n')
+    not_object_path = tmp_path / 'not_object.jsonl'
+    not_object_path.write_text('\n'.join([valid_line] * 3 + ['[1, 2]']) + '\n')
+
+    with pytest.raises(ValueError, match=r'Invalid JSONL at line 7 in'):
+        load_eval_records_parallel(bad_json_path, workers=2, chunk_size=40)
+    with pytest.raises(ValueError, match=r'must be an object \(line 4 in'):
+        accumulate_eval_records_parallel(not_object_path, workers=2, chunk_size=40)
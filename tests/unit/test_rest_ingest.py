@@ -0,0 +1,346 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from evals.contracts import EvalRecord, EvalThresholds
+from evals.http_pool import HttpResponse
+from evals.ingest_sql import EvalIngestContext, plan_sample_dedupe, scoped_run_id
+from evals.rest_ingest import RestIngestError, ingest_eval_run_rest, send_with_retry
+from evals.runner import build_eval_report
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / 'scripts/evals/generate_eval_ingest_sql.py'
+
+
+class _StubPostgrestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fail_sample_posts: list[int], fail_after_insert: list[int]) -> None:
+        super().__init__(('127.0.0.1', 0), _StubPostgrestHandler)
+        # Status codes returned (in order) for the first sample POSTs before succeeding.
+        self.fail_sample_posts = fail_sample_posts
+        # Statuses returned for sample POSTs whose rows were stored anyway (e.g. a 504).
+        self.fail_after_insert = fail_after_insert
+        # Stored ai_eval_samples rows; on_conflict=dedupe_key inserts skip stored keys.
+        self.samples: list[dict[str, Any]] = []
+        self.requests: list[tuple[str, str, Any]] = []
+        self.client_ports: set[int] = set()
+        self.lock = threading.Lock()
+
+
+class _StubPostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: _StubPostgrestServer
+
+    def _handle(self) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.lock:
+            self.server.client_ports.add(self.client_address[1])
+            status = 201 if self.command == 'POST' else 204
+            if self.path == '/rest/v1/ai_eval_samples' and self.server.fail_sample_posts:
+                status = self.server.fail_sample_posts.pop(0)
+            else:
+                self.server.requests.append((self.command, self.path, json.loads(body)))
+                if self.path.startswith('/rest/v1/ai_eval_samples'):
+                    self._store_samples(json.loads(body))
+                    if self.server.fail_after_insert:
+                        status = self.server.fail_after_insert.pop(0)
+        assert self.headers['Authorization'] == 'Bearer service-key'
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _store_samples(self, rows: list[dict[str, Any]]) -> None:
+        if 'on_conflict=dedupe_key' not in self.path:
+            self.server.samples.extend(rows)
+            return
+        stored_keys = {sample['dedupe_key'] for sample in self.server.samples}
+        for row in rows:
+            if row['dedupe_key'] not in stored_keys:
+                stored_keys.add(row['dedupe_key'])
+                self.server.samples.append(row)
+
+    def do_HEAD(self) -> None:
+        assert self.path.startswith('/rest/v1/ai_eval_samples?run_id=eq.')
+        assert self.headers['Prefer'] == 'count=exact'
+        with self.server.lock:
+            stored = len(self.server.samples)
+        self.send_response(200)
+        self.send_header('Content-Range', f'*/{stored}')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        assert self.path.startswith('/rest/v1/ai_eval_samples?')
+        query = parse_qs(urlsplit(self.path).query)
+        assert query['order'] == ['dedupe_key.asc']
+        with self.server.lock:
+            rows = sorted(
+                (sample for sample in self.server.samples if sample.get('dedupe_key')),
+                key=lambda sample: sample['dedupe_key'],
+            )
+        for condition in query['dedupe_key']:
+            if condition != 'not.is.null':
+                after = condition.removeprefix('gt.')
+                rows = [row for row in rows if row['dedupe_key'] > after]
+        selected = []
+        for row in rows[: int(query['limit'][0])]:
+            projected = {}
+            for column in query['select'][0].split(','):
+                # SiteCraft reads fallback_used as 'fallback_used:metadata->fallbackUsed'.
+                alias, _, source = column.partition(':')
+                field, _, key = (source or alias).partition('->')
+                projected[alias] = row[field].get(key) if key else row[field]
+            selected.append(projected)
+        body = json.dumps(selected).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = _handle
+    do_PATCH = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+@contextmanager
+def _stub_server(
+    fail_sample_posts: list[int] | None = None, fail_after_insert: list[int] | None = None
+) -> Iterator[_StubPostgrestServer]:
+    server = _StubPostgrestServer(list(fail_sample_posts or []), list(fail_after_insert or []))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _records(count: int) -> list[EvalRecord]:
+    return [
+        EvalRecord(
+            record_id=f'rec-{index}',
+            schema_valid=True,
+            patch_apply_success=True,
+            edited_after_generate=False,
+            published_within_7d=False,
+            safety_html_tailwind_compliant=True,
+            latency_ms=1000 + index,
+            selected_provider="o'brien",
+            request_id='36f7ebca-5661-4c0f-b215-175f9627b99e',
+        )
+        for index in range(count)
+    ]
+
+
+def test_ingest_eval_run_rest_posts_batches_over_pooled_connections() -> None:
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+    completed = []
+    with _stub_server(fail_sample_posts=[503]) as server:
+        result = ingest_eval_run_rest(
+            f'http://127.0.0.1:{server.server_address[1]}',
+            'service-key',
+            _records(95),
+            EvalThresholds(),
+            EvalIngestContext(schema_variant='v2'),
+            run_id=run_id,
+            batch_size=10,
+            concurrency=3,
+            backoff_seconds=0,
+            on_batch=completed.append,
+        )
+
+    methods_and_paths = [(method, path) for method, path, _ in server.requests]
+    assert methods_and_paths[0] == ('POST', '/rest/v1/ai_eval_runs')
+    assert methods_and_paths[-1] == ('PATCH', f'/rest/v1/ai_eval_runs?run_id=eq.{run_id}')
+    assert server.requests[0][2]['status'] == 'running'
+    assert server.requests[-1][2]['status'] == result.status
+    assert server.requests[-1][2]['finished_at']
+
+    samples = [row for _, path, body in server.requests if path.endswith('samples') for row in body]
+    assert len(samples) == 95
+    assert sorted(row['latency_ms'] for row in samples) == list(range(1000, 1095))
+    assert samples[0]['run_id'] == run_id
+    assert samples[0]['selected_provider'] == "o'brien"
+    assert samples[0]['metadata'] == {'recordId': samples[0]['metadata']['recordId']}
+
+    assert len(completed) == len(result.batches) == 10
+    assert result.rows == 95
+    summary = result.as_dict()
+    assert summary['retries'] == 1
+    assert [batch['index'] for batch in summary['batches']] == list(range(10))
+    assert all(batch['rows_per_second'] > 0 for batch in summary['batches'])
+    assert result.connections_opened <= 3
+    assert len(server.client_ports) <= 3
+
+
+def test_ingest_eval_run_rest_aborts_run_on_non_transient_error() -> None:
+    with (
+        _stub_server(fail_sample_posts=[400]) as server,
+        pytest.raises(RestIngestError, match='HTTP 400'),
+    ):
+        ingest_eval_run_rest(
+            f'http://127.0.0.1:{server.server_address[1]}',
+            'service-key',
+            _records(5),
+            EvalThresholds(),
+            EvalIngestContext(),
+            batch_size=10,
+            backoff_seconds=0,
+        )
+
+    method, path, body = server.requests[-1]
+    assert method == 'PATCH' and path.startswith('/rest/v1/ai_eval_runs?id=eq.')
+    assert body == {'status': 'failed'}
+
+
+def test_ingest_eval_run_rest_aborts_when_a_retried_batch_was_stored_twice() -> None:
+    with (
+        _stub_server(fail_after_insert=[504]) as server,
+        pytest.raises(RestIngestError, match='holds 15 rows .* expected 10$'),
+    ):
+        ingest_eval_run_rest(
+            f'http://127.0.0.1:{server.server_address[1]}',
+            'service-key',
+            _records(10),
+            EvalThresholds(),
+            EvalIngestContext(schema_variant='v2'),
+            batch_size=5,
+            concurrency=1,
+            backoff_seconds=0,
+        )
+
+    method, path, body = server.requests[-1]
+    assert method == 'PATCH' and path.startswith('/rest/v1/ai_eval_runs?run_id=eq.')
+    assert body == {'status': 'aborted'}
+
+
+def test_send_with_retry_waits_for_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _ThrottlingPool:
+        def __init__(self) -> None:
+            self.responses = [
+                HttpResponse(status=429, headers={'retry-after': '2'}, body=b''),
+                HttpResponse(status=201, headers={}, body=b''),
+            ]
+
+        def request(self, *args: Any, **kwargs: Any) -> HttpResponse:
+            return self.responses.pop(0)
+
+    sleeps: list[float] = []
+    monkeypatch.setattr('evals.rest_ingest.time.sleep', sleeps.append)
+    response, attempts = send_with_retry(
+        _ThrottlingPool(),  # type: ignore[arg-type]
+        'POST',
+        '/rest/v1/ai_eval_samples',
+        b'[]',
+        {},
+        backoff_seconds=0.01,
+    )
+
+    assert (response.status, attempts) == (201, 2)
+    assert sleeps == [2.0]
+
+
+def test_ingest_eval_run_rest_dedupe_merges_overlapping_inputs() -> None:
+    run_id = '2e315354-3b92-4c70-9c69-2c45f97f3363'
+    records = _records(12)
+    first_window, second_window = records[:8] * 2, records[4:]
+    thresholds = EvalThresholds(
+        edit_after_generate_rate=0.0, publish_conversion_proxy=0.0, p95_latency_ms_max=1008
+    )
+
+    def ingest(server: _StubPostgrestServer, window: list[EvalRecord]) -> str:
+        return ingest_eval_run_rest(
+            f'http://127.0.0.1:{server.server_address[1]}',
+            'service-key',
+            window,
+            thresholds,
+            EvalIngestContext(schema_variant='v2'),
+            batch_size=3,
+            backoff_seconds=0,
+            dedupe=plan_sample_dedupe(window, run_id),
+        ).status
+
+    with _stub_server() as server:
+        assert ingest(server, first_window) == 'passed'
+        assert len(server.samples) == 8
+        # The second window overlaps rec-4..rec-7; only rec-8..rec-11 are new.
+        assert ingest(server, second_window) == 'failed'
+
+    assert len(server.samples) == 12
+    final_patch = server.requests[-1][2]
+    merged_report = build_eval_report(records, thresholds)
+    assert final_patch['status'] == 'failed'
+    assert final_patch['metadata']['recordCount'] == 12
+    assert final_patch['metadata']['metrics'] == merged_report['metrics']
+    assert final_patch['metadata']['gates'] == merged_report['gates']
+
+
+def test_generate_cli_merges_overlapping_windows_without_duplicates(tmp_path: Path) -> None:
+    def window(start: int, stop: int) -> Path:
+        path = tmp_path / f'window-{start}-{stop}.jsonl'
+        path.write_text(
+            ''.join(
+                json.dumps(
+                    {
+                        'record_id': f'rec-{index}',
+                        'request_id': f'00000000-0000-4000-8000-{index:012d}',
+                        'schema_valid': True,
+                        'patch_apply_success': True,
+                        'safety_html_tailwind_compliant': True,
+                        'latency_ms': 900 + index,
+                    }
+                )
+                + '\n'
+                for index in range(start, stop)
+            )
+        )
+        return path
+
+    with _stub_server() as server:
+        env = {
+            **os.environ,
+            'SUPABASE_URL': f'http://127.0.0.1:{server.server_address[1]}',
+            'SUPABASE_SERVICE_ROLE_KEY': 'service-key',
+        }
+        for input_path in (window(0, 30), window(20, 50)):
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    str(SCRIPT_PATH),
+                    '--mode',
+                    'rest',
+                    '--input',
+                    str(input_path),
+                    '--report-output',
+                    str(tmp_path / 'report.json'),
+                    '--ingest-stats-output',
+                    str(tmp_path / 'stats.json'),
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            assert completed.returncode == 0, completed.stderr
+
+    run_id = scoped_run_id('default', 'offline')
+    assert {sample['run_id'] for sample in server.samples} == {run_id}
+    record_ids = Counter(sample['metadata']['recordId'] for sample in server.samples)
+    assert len(record_ids) == 50
+    assert max(record_ids.values()) == 1
+    assert server.requests[-1][2]['metadata']['recordCount'] == 50
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from evals.rolling_export import RollingDataset
+
+SOURCES = ['generation', 'generation_cached']
+
+
+def _row(row_id: str, created_at: str) -> dict:
+    return {'id': row_id, 'created_at': created_at}
+
+
+def _ids(path: Path) -> list[str]:
+    return [json.loads(line)['id'] for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_rolling_export_appends_only_rows_past_the_watermark(tmp_path: Path) -> None:
+    state_dir = tmp_path / 'state'
+    output = tmp_path / 'records.jsonl'
+    dataset = RollingDataset(state_dir)
+    first = dataset.append(
+        SOURCES,
+        [
+            _row('b', '2026-02-15T10:00:00+00:00'),
+            _row('a', '2026-02-15T09:00:00+00:00'),
+        ],
+        dict,
+    )
+    assert first is not None and first.rows == 2
+    # A later export overlapping the watermark: 'b' is repeated, 'c' shares its timestamp.
+    (state_dir / 'segments' / 'orphan.jsonl').write_text('{}\n', encoding='utf-8')
+    dataset = RollingDataset(state_dir)
+    assert not (state_dir / 'segments' / 'orphan.jsonl').exists()
+    second = dataset.append(
+        SOURCES,
+        [
+            _row('d', '2026-02-16T08:00:00+00:00'),
+            _row('c', '2026-02-15T10:00:00+00:00'),
+            _row('b', '2026-02-15T10:00:00+00:00'),
+        ],
+        dict,
+    )
+    assert second is not None and second.rows == 2
+    assert dataset.watermark(reversed(SOURCES)).created_at == '2026-02-16T08:00:00+00:00'
+    assert dataset.append(SOURCES, [_row('d', '2026-02-16T08:00:00+00:00')], dict) is None
+
+    assert dataset.write_combined(SOURCES, output) == 4
+    assert _ids(output) == ['d', 'c', 'b', 'a']
+
+    assert dataset.compact(SOURCES, '2026-02-16T00:00:00+00:00') == 1
+    reloaded = RollingDataset(state_dir)
+    assert [segment.rows for segment in reloaded.segments] == [2]
+    assert len(list((state_dir / 'segments').iterdir())) == 1
+    assert reloaded.write_combined(SOURCES, output) == 2
+    assert _ids(output) == ['d', 'c']
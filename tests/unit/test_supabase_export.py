@@ -1,9 +1,161 @@
+import json
+import re
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from evals.contracts import EvalRecord
+from evals.http_pool import parse_retry_after
+from evals.instrumentation import profiling, span
+from evals.rest_ingest import RestIngestError
 from evals.supabase_export import (
+    AdaptiveConcurrencyLimiter,
+    ExportStats,
     build_eval_export_url,
+    fetch_training_example_rows,
+    iter_training_example_pages,
+    iter_training_example_rows,
     row_to_eval_record_payload,
+    rows_to_eval_batch,
+    split_export_window,
+)
+from evals.synthetic import SyntheticEvalConfig, iter_synthetic_training_rows
+
+_KEYSET_FILTER = re.compile(
+    r'\(created_at\.lt\."(?P<created_at>[^"]+)",'
+    r'and\(created_at\.eq\."(?P=created_at)",id\.lt\."(?P<id>[^"]+)"\)\)'
 )
 
 
+class _StubExportServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rows: list[dict[str, Any]], latency_seconds: float) -> None:
+        super().__init__(('127.0.0.1', 0), _StubExportHandler)
+        self.rows = rows
+        self.latency_seconds = latency_seconds
+        self.queries: list[dict[str, list[str]]] = []
+        self.client_ports: set[int] = set()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Responses cut off part-way through the body (then the connection is dropped).
+        self.truncate_responses = 0
+        self.gzip_responses = 0
+        # Throttling: 429 beyond this many concurrent requests, and 503s for the next N.
+        self.max_concurrent: int | None = None
+        self.unavailable_responses = 0
+        self.retry_after = '0'
+        self.throttled = 0
+        self.request_times: list[float] = []
+        # Requests for the window starting at this bound fail with a non-retryable 400.
+        self.failing_since: str | None = None
+
+
+class _StubExportHandler(BaseHTTPRequestHandler):
+    """Serves ``ai_training_examples`` with the PostgREST filters the exporter sends."""
+
+    protocol_version = 'HTTP/1.1'
+    server: _StubExportServer
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlsplit(self.path).query)
+        with self.server.lock:
+            self.server.queries.append(query)
+            self.server.request_times.append(time.monotonic())
+            self.server.client_ports.add(self.client_address[1])
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+            status = None
+            if self.server.unavailable_responses > 0:
+                self.server.unavailable_responses -= 1
+                status = 503
+            elif self.server.max_concurrent and self.server.in_flight > self.server.max_concurrent:
+                status = 429
+            elif f'gte.{self.server.failing_since}' in query.get('created_at', []):
+                status = 400
+        time.sleep(self.server.latency_seconds)
+        if status is not None:
+            with self.server.lock:
+                self.server.in_flight -= 1
+                self.server.throttled += 1
+            self.send_response(status)
+            self.send_header('Retry-After', self.server.retry_after)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        assert query['order'] == ['created_at.desc,id.desc']
+
+        def key(row: dict[str, Any]) -> tuple[datetime, str]:
+            return datetime.fromisoformat(row['created_at']), row['id']
+
+        rows = self.server.rows
+        for condition in query['created_at']:
+            operator, value = condition.split('.', 1)
+            bound = datetime.fromisoformat(value)
+            if operator == 'gte':
+                rows = [row for row in rows if key(row)[0] >= bound]
+            else:
+                assert operator == 'lt'
+                rows = [row for row in rows if key(row)[0] < bound]
+        if 'or' in query:
+            cursor = _KEYSET_FILTER.fullmatch(query['or'][0])
+            assert cursor is not None
+            after = (datetime.fromisoformat(cursor['created_at']), cursor['id'])
+            rows = [row for row in rows if key(row) < after]
+        rows = sorted(rows, key=key, reverse=True)
+        body = json.dumps(rows[: int(query['limit'][0])]).encode('utf-8')
+        # A truncated response stops after the first half of the JSON, flushed to the wire.
+        cut = len(body) // 2
+        compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compress:
+            encoder = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+            head = encoder.compress(body[:cut]) + encoder.flush(zlib.Z_SYNC_FLUSH)
+            body = head + encoder.compress(body[cut:]) + encoder.flush()
+            cut = len(head)
+        with self.server.lock:
+            self.server.in_flight -= 1
+            self.server.gzip_responses += compress
+            truncate = self.server.truncate_responses > 0
+            self.server.truncate_responses -= truncate
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if truncate:
+            self.wfile.write(body[:cut])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+@contextmanager
+def _stub_export_server(
+    rows: list[dict[str, Any]], latency_seconds: float = 0.0
+) -> Iterator[_StubExportServer]:
+    server = _StubExportServer(rows, latency_seconds)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 def test_build_eval_export_url_contains_filters() -> None:
     url = build_eval_export_url(
         supabase_url='https://xyzcompany.supabase.co',
@@ -15,6 +167,8 @@ def test_build_eval_export_url_contains_filters() -> None:
     assert 'source=in.(generation,generation_cached)' in url
     assert 'limit=123' in url
     assert 'created_at=gte.2026-02-14T00:00:00%2B00:00' in url
+    selected = parse_qs(urlsplit(url).query)['select'][0].split(',')
+    assert {'tenant_id', 'route_id', 'model_id', 'model_version_id'} <= set(selected)
 
 
 def test_row_to_eval_record_payload_uses_metadata_fallbacks() -> None:
@@ -44,3 +198,347 @@ def test_row_to_eval_record_payload_uses_metadata_fallbacks() -> None:
     assert payload['fallback_used'] is True
     assert payload['latency_ms'] == 2100
     assert payload['patch_apply_success'] is False
+
+
+def test_rows_to_eval_batch_matches_the_payload_round_trip() -> None:
+    rows = list(iter_synthetic_training_rows(2_000, SyntheticEvalConfig(seed=11)))
+    odd_flags = ['yes', ' FALSE ', 'maybe', 1, None, '0', '']
+    odd_latencies = ['1234.9', ' 77 ', 'n/a', 12.7, True, -5, '']
+    for index, row in enumerate(rows[::5]):
+        metadata = row['metadata']
+        metadata['schemaValid'] = odd_flags[index % len(odd_flags)]
+        metadata['fallbackUsed'] = odd_flags[(index + 1) % len(odd_flags)]
+        metadata['latencyMs'] = odd_latencies[index % len(odd_latencies)]
+        metadata['tenantId'] = [None, 42, ''][index % 3]
+        row['fallback_used'] = [None, 'true', 0][index % 3]
+        row['latency_ms'] = [None, '', '9.5'][index % 3]
+        row['route_id'] = ['', 'route-row', None][index % 3]
+        row['selected_provider'] = [None, 7, 'custom'][index % 3]
+    for row in rows[::13]:
+        row['metadata'] = ['not', 'an', 'object']
+    rows[0].pop('id')
+    rows[1].pop('id')
+    rows[1]['request_id'] = None
+    rows[2]['request_id'] = 123
+
+    expected = [
+        EvalRecord.from_dict(json.loads(json.dumps(row_to_eval_record_payload(row))))
+        for row in rows
+    ]
+    batch = rows_to_eval_batch(rows)
+
+    assert list(batch) == expected
+    assert batch.tenant_id.values.count('42') == 1
+    assert batch.record_ids[1] == 'unknown'
+
+
+def test_rows_to_eval_batch_reads_out_of_range_latencies_as_missing() -> None:
+    rows = [
+        {'id': 'huge', 'latency_ms': 1e20, 'metadata': {'latencyMs': 40}},
+        {'id': 'wide', 'latency_ms': 1 << 64, 'metadata': {}},
+        {'id': 'inf', 'latency_ms': None, 'metadata': {'latencyMs': float('inf')}},
+        {'id': 'text', 'latency_ms': '-1e30', 'metadata': {}},
+        {'id': 'ok', 'latency_ms': 1500, 'metadata': {}},
+    ]
+
+    batch = rows_to_eval_batch(rows)
+
+    assert [record.latency_ms for record in batch] == [40, None, None, None, 1500]
+    assert list(batch) == [EvalRecord.from_dict(row_to_eval_record_payload(row)) for row in rows]
+
+
+def test_iter_training_example_pages_walks_the_window_with_keyset_cursors() -> None:
+    # Three rows per timestamp, so page boundaries fall inside runs of equal created_at.
+    rows = [
+        {
+            'id': f'{index:04d}',
+            'created_at': f'2026-02-14T{index // 3:02d}:00:00.5+00:00',
+            'metadata': {},
+        }
+        for index in range(47)
+    ]
+    with _stub_export_server(rows) as server:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        pages = list(
+            iter_training_example_pages(
+                base_url, 'service-key', '2026-02-14T00:00:00+00:00', page_size=10
+            )
+        )
+        assert [len(page) for page in pages] == [10, 10, 10, 10, 7]
+        exported = [row['id'] for page in pages for row in page]
+        assert exported == [f'{index:04d}' for index in reversed(range(47))]
+        assert 'or' not in server.queries[0]
+        assert len(server.client_ports) == 1
+
+        server.queries.clear()
+        limited = fetch_training_example_rows(
+            base_url, 'service-key', '2026-02-14T10:00:00+00:00', limit=12, page_size=5
+        )
+        assert [row['id'] for row in limited] == exported[:12]
+        assert [query['limit'] for query in server.queries] == [['5'], ['5'], ['2']]
+
+
+def test_profiled_export_records_fetch_rows_and_bytes_under_the_consumer() -> None:
+    rows = [
+        {'id': f'{index:04d}', 'created_at': f'2026-02-14T{index:02d}:00:00+00:00'}
+        for index in range(20)
+    ]
+    stats = ExportStats()
+    with _stub_export_server(rows, latency_seconds=0.01) as server, profiling() as profiler:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        with span('consume') as stage:
+            for _ in iter_training_example_rows(
+                base_url, 'service-key', '2026-02-14T00:00:00+00:00', page_size=8, stats=stats
+            ):
+                stage.add_rows(1)
+
+    assert profiler is not None
+    stages = {stage['name']: stage for stage in profiler.as_dict()['stages']}
+    fetch = stages['supabase_export.fetch']
+    assert fetch['depth'] == stages['consume']['depth'] + 1
+    assert fetch['rows'] == 20
+    assert fetch['bytes'] == stats.bytes > 0
+    # Three requests of at least 10ms each, all spent inside the exporter.
+    assert 0.03 <= fetch['seconds'] <= stages['consume']['seconds']
+    assert stats.as_dict()['fetch_seconds'] == round(fetch['seconds'], 6)
+
+
+def test_failing_shard_stops_the_other_shards() -> None:
+    rows = [
+        {
+            'id': f'{index:04d}',
+            'created_at': f'2026-02-{8 + index // 24:02d}T{index % 24:02d}:30:00+00:00',
+            'metadata': {},
+        }
+        for index in range(3 * 24)
+    ]
+    window = ('2026-02-08T00:00:00+00:00', '2026-02-11T00:00:00+00:00')
+    with _stub_export_server(rows, latency_seconds=0.05) as server:
+        # The oldest shard fails at once; the other two would need 12 slow pages each.
+        server.failing_since = window[0]
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        started = time.monotonic()
+        with pytest.raises(RestIngestError, match='400'):
+            list(
+                iter_training_example_rows(
+                    base_url,
+                    'service-key',
+                    window[0],
+                    page_size=2,
+                    until_iso=window[1],
+                    shards=3,
+                    workers=3,
+                )
+            )
+        assert time.monotonic() - started < 0.5
+        requests_at_error = len(server.queries)
+        time.sleep(0.3)
+        assert len(server.queries) == requests_at_error
+        assert requests_at_error < 10
+
+
+def test_closing_a_sharded_export_early_stops_its_shards() -> None:
+    rows = [
+        {
+            'id': f'{index:04d}',
+            'created_at': f'2026-02-{8 + index // 24:02d}T{index % 24:02d}:30:00+00:00',
+            'metadata': {},
+        }
+        for index in range(3 * 24)
+    ]
+    window = ('2026-02-08T00:00:00+00:00', '2026-02-11T00:00:00+00:00')
+    with _stub_export_server(rows, latency_seconds=0.02) as server:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        # Six shards of six pages each, two at a time: the first row is ready after one shard.
+        pages = iter_training_example_pages(
+            base_url,
+            'service-key',
+            window[0],
+            page_size=2,
+            until_iso=window[1],
+            shards=6,
+            workers=2,
+        )
+        next(pages)
+        pages.close()
+        time.sleep(0.1)
+        requests_at_close = len(server.queries)
+        time.sleep(0.2)
+        assert len(server.queries) == requests_at_close
+        assert requests_at_close < 24
+
+
+def test_sharded_export_fetches_concurrently_and_matches_serial_order() -> None:
+    # A week of rows, with a burst of same-timestamp rows straddling page boundaries.
+    rows = [
+        {
+            'id': f'{index:04d}',
+            'created_at': f'2026-02-{8 + index // 24:02d}T{index % 24:02d}:30:00+00:00',
+            'metadata': {},
+        }
+        for index in range(7 * 24)
+    ]
+    rows += [
+        {'id': f'b{index:03d}', 'created_at': '2026-02-10T12:00:00+00:00', 'metadata': {}}
+        for index in range(25)
+    ]
+    window = ('2026-02-08T00:00:00+00:00', '2026-02-15T00:00:00+00:00')
+    with _stub_export_server(rows, latency_seconds=0.01) as server:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        serial = [
+            row['id']
+            for page in iter_training_example_pages(
+                base_url, 'service-key', window[0], page_size=10, until_iso=window[1]
+            )
+            for row in page
+        ]
+        server.max_in_flight = 0
+        server.client_ports.clear()
+        sharded = [
+            row['id']
+            for page in iter_training_example_pages(
+                base_url,
+                'service-key',
+                window[0],
+                page_size=10,
+                until_iso=window[1],
+                shards=14,
+                workers=4,
+            )
+            for row in page
+        ]
+        assert server.max_in_flight > 1
+        assert len(server.client_ports) <= 4
+
+        limited = fetch_training_example_rows(base_url, 'service-key', window[0], limit=30)
+
+        # A limit pages serially from the newest rows instead of filling every shard.
+        server.queries.clear()
+        server.max_in_flight = 0
+        newest = [
+            row['id']
+            for page in iter_training_example_pages(
+                base_url,
+                'service-key',
+                window[0],
+                page_size=5,
+                until_iso=window[1],
+                limit=12,
+                shards=14,
+                workers=4,
+            )
+            for row in page
+        ]
+        assert [query['limit'] for query in server.queries] == [['5'], ['5'], ['2']]
+        assert server.max_in_flight == 1
+
+    assert newest == serial[:12]
+    assert len(serial) == len(rows)
+    assert sharded == serial
+    assert [row['id'] for row in limited] == serial[:30]
+    assert split_export_window(*window, shards=2) == [
+        ('2026-02-11T12:00:00+00:00', window[1]),
+        (window[0], '2026-02-11T12:00:00+00:00'),
+    ]
+
+
+def test_streamed_export_resumes_after_a_body_is_cut_off() -> None:
+    rows = [
+        {'id': f'{index:04d}', 'created_at': f'2026-02-14T{index:02d}:00:00+00:00', 'metadata': {}}
+        for index in range(24)
+    ]
+    with _stub_export_server(rows) as server:
+        server.truncate_responses = 1
+        exported = [
+            row['id']
+            for row in iter_training_example_rows(
+                f'http://127.0.0.1:{server.server_address[1]}',
+                'service-key',
+                '2026-02-14T00:00:00+00:00',
+                page_size=10,
+                backoff_seconds=0,
+            )
+        ]
+    assert exported == [f'{index:04d}' for index in reversed(range(24))]
+    assert server.gzip_responses == len(server.queries)
+    # The retry continues from the last row parsed before the cut, not from the page start.
+    assert 'or' in server.queries[1]
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates() -> None:
+    assert parse_retry_after('2') == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('86400') == 300.0
+
+
+def test_adaptive_limiter_halves_once_per_round_and_grows_additively() -> None:
+    limiter = AdaptiveConcurrencyLimiter(8)
+    tokens = [limiter.acquire() for _ in range(8)]
+    # Every in-flight request is throttled, but only the first halves the limit.
+    for token in tokens:
+        limiter.release(token, congested=True)
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.release(limiter.acquire(), congested=False)
+    assert limiter.limit == pytest.approx(4.9, abs=0.05)
+    assert limiter.lowest_limit == 4
+    assert limiter.peak_in_flight == 8
+
+
+def test_export_adapts_concurrency_to_a_throttling_server() -> None:
+    rows = [
+        {
+            'id': f'{index:04d}',
+            'created_at': f'2026-02-{8 + index // 24:02d}T{index % 24:02d}:30:00+00:00',
+            'metadata': {},
+        }
+        for index in range(7 * 24)
+    ]
+    window = ('2026-02-08T00:00:00+00:00', '2026-02-15T00:00:00+00:00')
+    with _stub_export_server(rows, latency_seconds=0.02) as server:
+        server.max_concurrent = 2
+        stats = ExportStats()
+        exported = [
+            row['id']
+            for row in iter_training_example_rows(
+                f'http://127.0.0.1:{server.server_address[1]}',
+                'service-key',
+                window[0],
+                page_size=10,
+                until_iso=window[1],
+                shards=16,
+                workers=8,
+                max_retries=8,
+                backoff_seconds=0.01,
+                stats=stats,
+            )
+        ]
+
+    assert exported == [f'{index:04d}' for index in reversed(range(len(rows)))]
+    assert server.throttled > 0
+    report = stats.as_dict()
+    assert report['rows'] == len(rows)
+    assert report['throttled'] == server.throttled
+    assert report['requests'] == len(server.queries)
+    assert report['lowest_concurrency_limit'] <= 4
+    assert report['rows_per_second'] > 0
+
+
+def test_export_waits_for_retry_after_before_retrying() -> None:
+    rows = [
+        {'id': f'{index:04d}', 'created_at': f'2026-02-14T{index:02d}:00:00+00:00', 'metadata': {}}
+        for index in range(5)
+    ]
+    with _stub_export_server(rows) as server:
+        server.unavailable_responses = 1
+        server.retry_after = '0.3'
+        exported = fetch_training_example_rows(
+            f'http://127.0.0.1:{server.server_address[1]}',
+            'service-key',
+            '2026-02-14T00:00:00+00:00',
+            limit=10,
+        )
+    assert [row['id'] for row in exported] == ['0004', '0003', '0002', '0001', '0000']
+    assert server.request_times[1] - server.request_times[0] >= 0.3